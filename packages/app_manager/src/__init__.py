@@ -1,9 +1,14 @@
 from .app import ManagerApp
+from .pool import DevicePool, DevicePoolOptions, DevicePoolResult, PooledDevice
 from .proto.generated.types import *
 from .operations.types import *
 from .utils import update_logger
 
 __all__ = [
     'ManagerApp',
+    'DevicePool',
+    'DevicePoolOptions',
+    'DevicePoolResult',
+    'PooledDevice',
     'update_logger',
 ]
@@ -30,6 +30,13 @@ class ManagerApp:
     def is_supported(self):
         return self._sdk.is_supported()
 
+    def session(self):
+        """
+        Run several operations back to back without preparing the device
+        before each of them, see `SDK.session`.
+        """
+        return self._sdk.session()
+
     async def get_device_info(self):
         return await self._sdk.run_operation(lambda: operations.get_device_info(self._sdk))
 
@@ -43,11 +43,13 @@ async def get_logs(
 
     await sdk.check_app_compatibility(APP_VERSION)
 
-    on_status, force_status_update = create_status_listener({
+    status_listener = create_status_listener({
         'enums': GetLogsStatus,
         'onEvent': on_event,
         'logger': logger,
     })
+    on_status = status_listener['onStatus']
+    force_status_update = status_listener['forceStatusUpdate']
 
     # ASCII decoder for log data
     def decode_ascii(data: bytes) -> str:
@@ -22,11 +22,13 @@ async def train_card(
 
     helper = OperationHelper(sdk, 'trainCard', 'trainCard')
 
-    on_status, force_status_update = create_status_listener({
+    status_listener = create_status_listener({
         'enums': TrainCardStatus,
         'onEvent': params.onEvent,
         'logger': logger,
     })
+    on_status = status_listener['onStatus']
+    force_status_update = status_listener['forceStatusUpdate']
 
     await helper.send_query({"initiate": {}})
     result = await helper.wait_for_result(on_status)
@@ -1,6 +1,6 @@
 from typing import Optional
 from packages.core.src.types import ISDK
-from packages.util.utils import create_logger_with_prefix, create_status_listener, string_to_version, uint8array_to_hex
+from packages.util.utils import create_logger_with_prefix, create_status_listener, string_to_version
 from packages.app_manager.src.constants.appId import APP_VERSION
 from packages.app_manager.src.proto.generated.manager import FirmwareUpdateErrorResponse, FirmwareUpdateError
 from packages.app_manager.src.proto.types import UpdateFirmwareStatus
@@ -40,11 +40,12 @@ async def update_firmware(
     version = params.version
     on_event = params.onEvent
 
-    on_status, force_status_update = create_status_listener({
+    status_listener = create_status_listener({
         'enums': UpdateFirmwareStatus,
         'onEvent': on_event,
         'logger': logger,
     })
+    force_status_update = status_listener['forceStatusUpdate']
 
     if not firmware or not version:
         logger.info('Fetching latest firmware version')
@@ -86,11 +87,15 @@ async def update_firmware(
 
     await bootloader_sdk.before_operation()
     await bootloader_sdk.send_bootloader_data(
-        uint8array_to_hex(firmware),
+        firmware,
         params.onProgress,
     )
     await bootloader_sdk.destroy()
 
+    # Versions probed before the update are stale now
+    sdk.invalidate_probe_cache()
+    bootloader_sdk.invalidate_probe_cache()
+
     try:
         await wait_for_reconnection(params.getDevices, params.createConnection)
     except Exception as error:
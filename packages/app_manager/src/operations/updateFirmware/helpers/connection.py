@@ -88,7 +88,7 @@ async def create_bootloader_sdk(
     if not connection:
         raise DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
 
-    return core_sdk.SDK.create(connection, 0)
+    return await core_sdk.SDK.create(connection, 0)
 
 
 async def wait_for_reconnection(
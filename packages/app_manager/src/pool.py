@@ -0,0 +1,285 @@
+import asyncio
+import copy
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    TypedDict,
+    TypeVar,
+    Union,
+)
+
+from packages.interfaces import IDeviceConnection
+from packages.util.utils import create_logger_with_prefix
+from packages.util.utils.assert_utils import assert_condition
+
+from .app import ManagerApp
+from .operations import GetLogsEventHandler, IUpdateFirmwareParams
+from .utils import logger as rootlogger
+
+logger = create_logger_with_prefix(rootlogger, 'DevicePool')
+
+T = TypeVar('T')
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_PER_DEVICE_CONCURRENCY = 1
+
+
+class DeviceTransport(Protocol):
+    """
+    Connection class of a hardware package, e.g. `hw_hid.DeviceConnection`.
+    """
+
+    async def list(self) -> List[Any]:
+        ...
+
+    async def connect(self, device: Any) -> IDeviceConnection:
+        ...
+
+
+class DevicePoolOptions(TypedDict, total=False):
+    max_concurrency: int
+    per_device_concurrency: int
+    create_app: Callable[[IDeviceConnection], Awaitable[ManagerApp]]
+
+
+class PooledDevice:
+    """
+    A device of the pool along with its connection and `ManagerApp`.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        device: Any,
+        connection: IDeviceConnection,
+        app: ManagerApp,
+        per_device_concurrency: int,
+    ):
+        self.key = key
+        self.device = device
+        self.connection = connection
+        self.app = app
+        self.semaphore = asyncio.Semaphore(per_device_concurrency)
+
+
+class DevicePoolResult(TypedDict, Generic[T]):
+    device: PooledDevice
+    result: Optional[T]
+    error: Optional[BaseException]
+
+
+def get_device_key(device: Any) -> str:
+    """
+    Stable identity of a device returned by a transport's `list()`.
+
+    IDevice dicts (hid, serialport) are identified by their path, usb
+    devices (webusb) by their bus and address.
+    """
+    if isinstance(device, dict):
+        return str(device.get('path') or device.get('serial'))
+
+    bus = getattr(device, 'bus', None)
+    address = getattr(device, 'address', None)
+    if bus is not None and address is not None:
+        return f'usb:{bus}:{address}'
+
+    return str(id(device))
+
+
+def get_device_serial(device: Any) -> Optional[str]:
+    """
+    Serial of a device returned by a transport's `list()` or by the
+    `getDevices` of a firmware update, None if it does not expose one.
+    """
+    if isinstance(device, dict):
+        serial = device.get('serial')
+    else:
+        serial = getattr(device, 'serial', None)
+    return serial if isinstance(serial, str) and serial else None
+
+
+def scope_update_firmware_params(
+    params: IUpdateFirmwareParams,
+    serial: str,
+) -> IUpdateFirmwareParams:
+    """
+    Copy of `params` whose `getDevices` only lists the devices with
+    `serial`, so the update reconnects to its own device after it reboots.
+    """
+    get_devices = params.getDevices
+
+    async def get_scoped_devices() -> List[Any]:
+        return [
+            device for device in await get_devices()
+            if get_device_serial(device) == serial
+        ]
+
+    scoped_params = copy.copy(params)
+    scoped_params.getDevices = get_scoped_devices
+    return scoped_params
+
+
+class DevicePool:
+    """
+    Keeps one `ManagerApp` per connected device and runs operations on all
+    of them concurrently.
+
+    At most `max_concurrency` operations are in flight across the pool and
+    at most `per_device_concurrency` on any one device. A failing device
+    does not stop the others, its error is returned in its result.
+    """
+
+    def __init__(
+        self,
+        transports: Sequence[DeviceTransport],
+        options: Optional[DevicePoolOptions] = None,
+    ):
+        assert_condition(len(transports) > 0, 'Invalid transports')
+
+        options = options or {}
+        max_concurrency = options.get('max_concurrency', DEFAULT_MAX_CONCURRENCY)
+        per_device_concurrency = options.get(
+            'per_device_concurrency', DEFAULT_PER_DEVICE_CONCURRENCY
+        )
+        assert_condition(max_concurrency > 0, 'Invalid max_concurrency')
+        assert_condition(per_device_concurrency > 0, 'Invalid per_device_concurrency')
+
+        self.transports = list(transports)
+        self.per_device_concurrency = per_device_concurrency
+        self.create_app = options.get('create_app', ManagerApp.create)
+        self.devices: Dict[str, PooledDevice] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+    async def __aenter__(self) -> 'DevicePool':
+        await self.discover()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.destroy()
+
+    async def discover(self) -> List[PooledDevice]:
+        """
+        Connect to every device listed by the transports which is not in the
+        pool yet. Devices that fail to connect are logged and skipped.
+
+        Returns:
+            List[PooledDevice]: All the devices in the pool
+        """
+        listed = await asyncio.gather(
+            *(transport.list() for transport in self.transports)
+        )
+
+        pending = []
+        for transport, devices in zip(self.transports, listed):
+            for device in devices:
+                key = get_device_key(device)
+                if key not in self.devices:
+                    pending.append(self._add_device(transport, key, device))
+
+        await asyncio.gather(*pending)
+        return list(self.devices.values())
+
+    async def _add_device(self, transport: DeviceTransport, key: str, device: Any) -> None:
+        async with self._semaphore:
+            try:
+                connection = await transport.connect(device)
+                app = await self.create_app(connection)
+            except Exception as error:
+                logger.warn('Failed to connect to device', {'device': key, 'error': error})
+                return
+
+        self.devices[key] = PooledDevice(
+            key, device, connection, app, self.per_device_concurrency
+        )
+
+    async def run(
+        self,
+        operation: Callable[[PooledDevice], Awaitable[T]],
+        devices: Optional[Sequence[PooledDevice]] = None,
+    ) -> List[DevicePoolResult[T]]:
+        """
+        Run `operation` on every device of the pool (or on `devices`).
+
+        Returns:
+            List[DevicePoolResult]: One result per device, in pool order
+        """
+        targets = list(self.devices.values()) if devices is None else list(devices)
+        return list(await asyncio.gather(
+            *(self._run_on_device(operation, device) for device in targets)
+        ))
+
+    async def _run_on_device(
+        self,
+        operation: Callable[[PooledDevice], Awaitable[T]],
+        device: PooledDevice,
+    ) -> DevicePoolResult[T]:
+        async with self._semaphore, device.semaphore:
+            try:
+                result = await operation(device)
+                return {'device': device, 'result': result, 'error': None}
+            except Exception as error:
+                logger.warn('Operation failed', {'device': device.key, 'error': error})
+                return {'device': device, 'result': None, 'error': error}
+
+    async def get_device_info(self) -> List[DevicePoolResult[Any]]:
+        return await self.run(lambda device: device.app.get_device_info())
+
+    async def get_logs(
+        self,
+        on_event: Optional[Callable[[PooledDevice], GetLogsEventHandler]] = None,
+    ) -> List[DevicePoolResult[Any]]:
+        return await self.run(
+            lambda device: device.app.get_logs(on_event(device) if on_event else None)
+        )
+
+    async def update_firmware(
+        self,
+        params: Union[IUpdateFirmwareParams, Callable[[PooledDevice], IUpdateFirmwareParams]],
+    ) -> List[DevicePoolResult[None]]:
+        """
+        Update the firmware of every device. `params` can be a callable to
+        give each device its own params (e.g. its own `onProgress`).
+
+        An update reconnects to its device through `getDevices` once the
+        device reboots in the bootloader and after the update. When every
+        device has a serial, each update only sees the devices with its
+        serial and they all run concurrently. Otherwise the devices cannot
+        be told apart and they are updated one at a time.
+        """
+        targets = list(self.devices.values())
+        serials = [get_device_serial(device.device) for device in targets]
+        lock = asyncio.Lock() if None in serials else None
+
+        async def update(device: PooledDevice) -> None:
+            device_params = params(device) if callable(params) else params
+
+            if lock is None:
+                return await device.app.update_firmware(
+                    scope_update_firmware_params(device_params, get_device_serial(device.device))
+                )
+
+            async with lock:
+                return await device.app.update_firmware(device_params)
+
+        return await self.run(update, targets)
+
+    async def destroy(self) -> None:
+        """
+        Destroy every `ManagerApp` and empty the pool.
+        """
+        devices = list(self.devices.values())
+        self.devices.clear()
+        await asyncio.gather(
+            *(device.app.destroy() for device in devices),
+            return_exceptions=True,
+        )
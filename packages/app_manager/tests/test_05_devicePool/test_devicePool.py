@@ -0,0 +1,167 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from packages.interfaces.__mocks__.connection import MockDeviceConnection
+from packages.app_manager.src import DevicePool
+
+
+class MockTransport:
+    def __init__(self, paths, failing_paths=()):
+        self.paths = list(paths)
+        self.failing_paths = failing_paths
+
+    async def list(self):
+        return [{'path': path, 'serial': path} for path in self.paths]
+
+    async def connect(self, device):
+        if device['path'] in self.failing_paths:
+            raise Exception('Failed to connect')
+        return await MockDeviceConnection.create()
+
+
+class ConcurrencyTracker:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, *args):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return 'done'
+
+
+async def create_app(connection):
+    app = MagicMock()
+    app.connection = connection
+    app.get_device_info = AsyncMock(return_value={'connection': connection})
+    app.destroy = AsyncMock()
+    return app
+
+
+@pytest.mark.asyncio
+async def test_should_discover_devices_of_every_transport():
+    pool = DevicePool(
+        [MockTransport(['a', 'b']), MockTransport(['c'], failing_paths=['c'])],
+        {'create_app': create_app},
+    )
+
+    devices = await pool.discover()
+    assert sorted(device.key for device in devices) == ['a', 'b']
+
+    # Already known devices are not connected again
+    first_connection = pool.devices['a'].connection
+    await pool.discover()
+    assert len(pool) == 2
+    assert pool.devices['a'].connection is first_connection
+
+
+@pytest.mark.asyncio
+async def test_should_fan_out_operations():
+    async with DevicePool([MockTransport(['a', 'b', 'c'])], {'create_app': create_app}) as pool:
+        results = await pool.get_device_info()
+        assert len(results) == 3
+        for result in results:
+            assert result['error'] is None
+            assert result['result'] == {'connection': result['device'].connection}
+
+        apps = [device.app for device in pool.devices.values()]
+
+    assert len(pool) == 0
+    for app in apps:
+        app.destroy.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_should_collect_errors_per_device():
+    pool = DevicePool([MockTransport(['a', 'b'])], {'create_app': create_app})
+    await pool.discover()
+    pool.devices['b'].app.get_device_info.side_effect = Exception('Device error')
+
+    results = {result['device'].key: result for result in await pool.get_device_info()}
+    assert results['a']['error'] is None
+    assert str(results['b']['error']) == 'Device error'
+    assert results['b']['result'] is None
+
+
+@pytest.mark.asyncio
+async def test_should_limit_concurrency():
+    pool = DevicePool(
+        [MockTransport([str(i) for i in range(8)])],
+        {'create_app': create_app, 'max_concurrency': 3},
+    )
+    await pool.discover()
+
+    tracker = ConcurrencyTracker()
+    results = await pool.run(tracker)
+    assert [result['result'] for result in results] == ['done'] * 8
+    assert tracker.max_running == 3
+
+    device = next(iter(pool.devices.values()))
+    tracker = ConcurrencyTracker()
+    await asyncio.gather(*(pool.run(tracker, [device]) for _ in range(4)))
+    assert tracker.max_running == 1
+
+
+def test_should_validate_options():
+    with pytest.raises(Exception):
+        DevicePool([])
+    with pytest.raises(Exception):
+        DevicePool([MockTransport([])], {'max_concurrency': 0})
+
+
+class UpdateFirmwareParams:
+    def __init__(self, get_devices):
+        self.getDevices = get_devices
+        self.createConnection = AsyncMock()
+
+
+class BootloaderDevice:
+    def __init__(self, serial):
+        self.serial = serial
+
+
+async def list_bootloader_devices():
+    return [BootloaderDevice('a'), BootloaderDevice('b'), BootloaderDevice(None)]
+
+
+@pytest.mark.asyncio
+async def test_should_scope_firmware_updates_to_their_device():
+    pool = DevicePool([MockTransport(['a', 'b'])], {'create_app': create_app})
+    await pool.discover()
+
+    tracker = ConcurrencyTracker()
+    seen = {}
+    for key, device in pool.devices.items():
+        async def update_firmware(params, key=key):
+            seen[key] = [device.serial for device in await params.getDevices()]
+            await tracker()
+        device.app.update_firmware = update_firmware
+
+    params = UpdateFirmwareParams(list_bootloader_devices)
+    results = await pool.update_firmware(params)
+
+    assert [result['error'] for result in results] == [None, None]
+    assert seen == {'a': ['a'], 'b': ['b']}
+    assert tracker.max_running == 2
+    # The params given are not modified
+    assert params.getDevices is list_bootloader_devices
+
+
+@pytest.mark.asyncio
+async def test_should_update_devices_without_serial_one_at_a_time():
+    transport = MockTransport(['a', 'b'])
+    transport.list = AsyncMock(return_value=[{'path': 'a'}, {'path': 'b'}])
+    pool = DevicePool([transport], {'create_app': create_app})
+    await pool.discover()
+
+    tracker = ConcurrencyTracker()
+    for device in pool.devices.values():
+        device.app.update_firmware = tracker
+
+    params = UpdateFirmwareParams(list_bootloader_devices)
+    results = await pool.update_firmware(params)
+
+    assert [result['result'] for result in results] == ['done', 'done']
+    assert tracker.max_running == 1
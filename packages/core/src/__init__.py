@@ -1,7 +1,7 @@
 from .sdk import SDK
 from .encoders.types import *
 from .types import *
-from .utils import update_logger
+from .utils import update_logger, set_instrumentation, HistogramInstrumentation
 
 __all__ = [
     # Main SDK class
@@ -9,6 +9,10 @@ __all__ = [
     
     # Logger utility
     "update_logger",
+
+    # Instrumentation
+    "set_instrumentation",
+    "HistogramInstrumentation",
     
     # All encoder types are exported via *
     # All interface types are exported via *
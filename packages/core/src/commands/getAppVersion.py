@@ -27,7 +27,7 @@ class GetAppVersionsParams:
 async def get_app_versions(params: GetAppVersionsParams):
     assert_condition(params.connection, 'Invalid connection')
     assert_condition(params.sequence_number, 'Invalid sequenceNumber')
-    max_tries = params.options.get('maxTries')
+    max_tries = params.options.get('maxTries', 5)
     timeout = params.options.get('timeout')
     version = PacketVersionMap.v3
     msg = Msg(
@@ -51,6 +51,8 @@ v3 = dict_to_namespace({
     'CMD_RESPONSE_TIME': 2000,
     'RECHECK_TIME': 2,
     'IDLE_RECHECK_TIME': 200,
+    # Statuses younger than this are shared instead of requested again
+    'STATUS_CACHE_TIME': 20,
 })
 
 
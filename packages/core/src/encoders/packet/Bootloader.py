@@ -1,6 +1,7 @@
-from typing import TypedDict
+import mmap
+from typing import Iterator, Sequence, TypedDict, Union
 from packages.util.utils.assert_utils import assert_condition
-from packages.util.utils import crc16, hex_to_uint8array, int_to_uint_byte, is_hex, uint8array_to_hex
+from packages.util.utils import crc16, hex_to_uint8array, is_hex, uint8array_to_hex
 from packages.core.src.utils.packetversion import PacketVersionMap
 from packages.core.src.utils.crypto import byte_unstuffing
 from packages.core.src.config.radix import v1 as radix
@@ -9,6 +10,9 @@ from packages.core.src.config.radix import v1 as radix
 START_OF_FRAME = '01'
 END_OF_TRANSMISSION = '04'
 CHUNK_SIZE = 256
+CHUNK_BYTES = CHUNK_SIZE // 2
+START_OF_FRAME_BYTES = bytes.fromhex(START_OF_FRAME)
+END_OF_TRANSMISSION_BYTES = bytes.fromhex(END_OF_TRANSMISSION)
 
 class StmPacket(TypedDict):
     startOfFrame: str
@@ -20,33 +24,73 @@ class StmPacket(TypedDict):
     crc: str
     errorList: str
 
+FirmwareData = Union[str, bytes, bytearray, memoryview, mmap.mmap]
+
+
+class StmXmodemFrames(Sequence[bytes]):
+    """
+    Lazily encoded xmodem frames of the given data, followed by the end of
+    transmission frame.
+
+    Frames are built on access from a view on the data, so a large binary
+    (or an mmap of a firmware file) is never copied as a whole.
+    """
+
+    def __init__(self, data: FirmwareData):
+        assert_condition(data, 'Invalid data')
+
+        if isinstance(data, str):
+            hex_data = data
+            if hex_data.startswith('0x'):
+                hex_data = hex_data[2:]
+            assert_condition(bool(hex_data), 'Data cannot be empty')
+            assert_condition(is_hex(hex_data), f'Invalid hex: {data}')
+            if len(hex_data) % 2 == 1:
+                hex_data += 'f'
+            data = bytes.fromhex(hex_data)
+
+        self._data = memoryview(data).cast('B')
+        assert_condition(len(self._data) > 0, 'Data cannot be empty')
+        self._rounds = (len(self._data) + CHUNK_BYTES - 1) // CHUNK_BYTES
+
+    def __len__(self) -> int:
+        return self._rounds + 1
+
+    def __getitem__(self, index: int) -> bytes:
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('Frame index out of range')
+
+        if index == self._rounds:
+            return END_OF_TRANSMISSION_BYTES
+
+        packet_number = (index + 1) % 255
+        data_chunk = self._data[index * CHUNK_BYTES:(index + 1) * CHUNK_BYTES]
+        if len(data_chunk) < CHUNK_BYTES:
+            data_chunk = bytes(data_chunk) + b'\xff' * (CHUNK_BYTES - len(data_chunk))
+
+        return b''.join((
+            START_OF_FRAME_BYTES,
+            bytes((packet_number, packet_number ^ 255)),
+            data_chunk,
+            crc16(data_chunk).to_bytes(2, 'big'),
+        ))
+
+    def __iter__(self) -> Iterator[bytes]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+def stm_xmodem_encode_frames(data: FirmwareData) -> Iterator[bytes]:
+    """
+    Generator over the xmodem frames of `data`, see `StmXmodemFrames`.
+    """
+    return iter(StmXmodemFrames(data))
+
+
 def stm_xmodem_encode(data: str) -> list[str]:
-    assert_condition(data, 'Invalid data')
-    hex_data = data
-    if hex_data.startswith('0x'):
-        hex_data = hex_data[2:]
-    assert_condition(bool(hex_data), 'Data cannot be empty')
-    assert_condition(is_hex(hex_data), f'Invalid hex: {data}')
-
-    rounds = (len(hex_data) + CHUNK_SIZE - 1) // CHUNK_SIZE
-    packet_list: list[str] = []
-
-    for i in range(1, rounds + 1):
-        current_packet_number = int_to_uint_byte(i % 255, 8)
-        packet_number_xor = int_to_uint_byte(i % 255 ^ 255, 8)
-        data_chunk_slice = hex_data[(i - 1) * CHUNK_SIZE : i * CHUNK_SIZE]
-        data_chunk = data_chunk_slice
-        if len(data_chunk_slice) < CHUNK_SIZE:
-            for _ in range(CHUNK_SIZE - len(data_chunk_slice)):
-                data_chunk += 'f'
-
-        comm_data = START_OF_FRAME + current_packet_number + packet_number_xor + data_chunk
-        crc = int_to_uint_byte(crc16(hex_to_uint8array(data_chunk)), 16)
-        packet = comm_data + crc
-        packet_list.append(packet)
-
-    packet_list.append(END_OF_TRANSMISSION)
-    return packet_list
+    return [frame.hex() for frame in StmXmodemFrames(data)]
 
 def stm_xmodem_decode(param: bytes) -> list[StmPacket]:
     data = uint8array_to_hex(param).upper()
@@ -0,0 +1,52 @@
+import mmap
+import pytest
+
+from packages.core.src.encoders.packet.Bootloader import (
+    StmXmodemFrames,
+    stm_xmodem_encode,
+    stm_xmodem_encode_frames,
+)
+from packages.core.tests.bootloader.__fixtures__.sendBootloaderData import send_bootloader_data_test_cases
+
+
+class TestStmXmodemEncode:
+    def test_should_return_valid_packets(self):
+        for test_case in send_bootloader_data_test_cases["valid"]:
+            assert stm_xmodem_encode(test_case["data"]) == [
+                packet.hex() for packet in test_case["packets"]
+            ]
+
+    def test_should_encode_bytes(self):
+        for test_case in send_bootloader_data_test_cases["valid"]:
+            data = bytes.fromhex(test_case["data"])
+            for param in (data, bytearray(data), memoryview(data)):
+                assert list(stm_xmodem_encode_frames(param)) == test_case["packets"]
+
+    def test_should_encode_mmap(self):
+        test_case = send_bootloader_data_test_cases["valid"][-1]
+        data = bytes.fromhex(test_case["data"])
+
+        with mmap.mmap(-1, len(data)) as mapped:
+            mapped.write(data)
+            frames = StmXmodemFrames(mapped)
+            assert list(frames) == test_case["packets"]
+            del frames
+
+    def test_should_index_frames(self):
+        test_case = send_bootloader_data_test_cases["valid"][-1]
+        frames = StmXmodemFrames(test_case["data"])
+
+        assert len(frames) == len(test_case["packets"])
+        assert frames[-1] == test_case["packets"][-1]
+        for index, packet in enumerate(test_case["packets"]):
+            assert frames[index] == packet
+        with pytest.raises(IndexError):
+            frames[len(frames)]
+
+    def test_should_throw_error_with_invalid_data(self):
+        for test_case in send_bootloader_data_test_cases["invalidArgs"]:
+            with pytest.raises(Exception):
+                stm_xmodem_encode(test_case["data"])
+
+        with pytest.raises(Exception):
+            StmXmodemFrames(b'')
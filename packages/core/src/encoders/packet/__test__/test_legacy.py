@@ -0,0 +1,31 @@
+from packages.core.src.encoders.packet.legacy import xmodem_decode, xmodem_encode
+from packages.core.src.utils.packetversion import PacketVersionMap
+
+
+class TestLegacyPacket:
+    def test_decode_valid_packet(self):
+        # Reply of a device to the sdk version request (command 88)
+        packet = bytes([170, 88, 12, 0, 1, 0, 1, 0, 3, 0, 0, 0, 1, 173, 177])
+
+        (decoded,) = xmodem_decode(packet, PacketVersionMap.v1)
+
+        assert decoded['commandType'] == 88
+        assert decoded['currentPacketNumber'] == 1
+        assert decoded['totalPacket'] == 1
+        assert decoded['dataChunk'] == '000300000001'
+        assert decoded['crc'] == 'adb1'
+        assert decoded['errorList'] == []
+
+    def test_decode_encoded_packets(self):
+        data = 'ab' * 40
+
+        packets = xmodem_encode(data, 12, PacketVersionMap.v1)
+        decoded = [
+            packet
+            for encoded in packets
+            for packet in xmodem_decode(encoded, PacketVersionMap.v1)
+        ]
+
+        assert len(decoded) == len(packets) > 1
+        assert ''.join(packet['dataChunk'] for packet in decoded) == data
+        assert all(packet['errorList'] == [] for packet in decoded)
@@ -0,0 +1,164 @@
+import calendar
+import pytest
+from unittest.mock import patch
+
+from packages.core.src.encoders.packet.packet import (
+    decode_packet,
+    decode_packet_bytes,
+    decode_payload_data,
+    decode_payload_data_bytes,
+    encode_packet,
+    encode_packet_bytes,
+    encode_payload_data,
+    encode_payload_data_bytes,
+    iter_encode_packet,
+    iter_encode_packet_bytes,
+)
+from packages.core.src.encoders.packet.__fixtures__.packet import (
+    decode_packet_test_cases,
+    decode_payload_data_test_cases,
+    encode_packet_test_cases,
+    packet_data_test_cases,
+)
+from packages.core.src.utils.packetversion import PacketVersionMap
+
+
+def _constant_time() -> float:
+    constant_date = packet_data_test_cases["constant_date"]
+    return calendar.timegm(constant_date.timetuple()) + constant_date.microsecond / 1e6
+
+
+class TestPacket:
+    def test_encode_packet(self):
+        with patch(
+            'packages.core.src.encoders.packet.packet.time.time',
+            return_value=_constant_time(),
+        ):
+            for test_case in packet_data_test_cases["valid_encodings"]:
+                packets = encode_packet(
+                    raw_data=test_case.get("raw_data", ''),
+                    proto_data=test_case.get("proto_data", ''),
+                    version=test_case["version"],
+                    sequence_number=test_case["sequence_number"],
+                    packet_type=test_case["packet_type"],
+                )
+                assert packets == test_case["encoded"]
+
+    def test_encode_packet_bytes(self):
+        with patch(
+            'packages.core.src.encoders.packet.packet.time.time',
+            return_value=_constant_time(),
+        ):
+            for test_case in packet_data_test_cases["valid_encodings"]:
+                packets = encode_packet_bytes(
+                    raw_data=bytes.fromhex(test_case.get("raw_data", '')),
+                    proto_data=bytes.fromhex(test_case.get("proto_data", '')),
+                    version=test_case["version"],
+                    sequence_number=test_case["sequence_number"],
+                    packet_type=test_case["packet_type"],
+                )
+                assert packets == test_case["encoded"]
+
+    def test_iter_encode_packet(self):
+        with patch(
+            'packages.core.src.encoders.packet.packet.time.time',
+            return_value=_constant_time(),
+        ) as time_mock:
+            for test_case in packet_data_test_cases["valid_encodings"]:
+                time_mock.reset_mock()
+                packets = iter_encode_packet(
+                    raw_data=test_case.get("raw_data", ''),
+                    proto_data=test_case.get("proto_data", ''),
+                    version=test_case["version"],
+                    sequence_number=test_case["sequence_number"],
+                    packet_type=test_case["packet_type"],
+                )
+                assert next(packets) == test_case["encoded"][0]
+                assert list(packets) == test_case["encoded"][1:]
+                assert time_mock.call_count == 1
+
+    def test_iter_encode_packet_validates_eagerly(self):
+        with pytest.raises(Exception):
+            iter_encode_packet_bytes(b'\x01', b'', PacketVersionMap.v3, 1, 0)
+        with pytest.raises(Exception):
+            iter_encode_packet('0x12s', '', PacketVersionMap.v3, 1, 1)
+
+    def test_encode_packet_invalid(self):
+        for test_case in encode_packet_test_cases["invalid"]:
+            with pytest.raises(Exception):
+                encode_packet(
+                    raw_data=test_case.get("raw_data"),
+                    proto_data=test_case.get("proto_data"),
+                    version=test_case.get("version"),
+                    sequence_number=test_case.get("sequence_number"),
+                    packet_type=test_case.get("packet_type"),
+                )
+
+    def test_encode_packet_sequence_number(self):
+        packets = encode_packet_bytes(b'\x01', b'', PacketVersionMap.v3, -1, 1)
+        assert decode_packet_bytes(packets[0], PacketVersionMap.v3)[0]["sequence_number"] == 0xffff
+
+        with pytest.raises(Exception):
+            encode_packet_bytes(b'\x01', b'', PacketVersionMap.v3, 99999, 1)
+
+    def test_decode_packet(self):
+        for test_case in packet_data_test_cases["valid_encodings"]:
+            packets = decode_packet(b''.join(test_case["encoded"]), test_case["version"])
+            assert packets == test_case["packet_list"]
+
+    def test_decode_packet_bytes(self):
+        for test_case in packet_data_test_cases["valid_encodings"]:
+            data = b''.join(test_case["encoded"])
+            for param in (data, bytearray(data), memoryview(data)):
+                packets = decode_packet_bytes(param, test_case["version"])
+                assert [packet["payload_data"].hex() for packet in packets] == [
+                    packet["payload_data"] for packet in test_case["packet_list"]
+                ]
+                assert all(len(packet["error_list"]) == 0 for packet in packets)
+
+    def test_decode_packet_truncated(self):
+        test_case = packet_data_test_cases["valid_encodings"][-1]
+        data = b''.join(test_case["encoded"])
+        packets = decode_packet_bytes(data[:-1], test_case["version"])
+
+        assert len(packets) == len(test_case["encoded"])
+        assert packets[-1]["error_list"] == ['invalid crc']
+        assert decode_packet_bytes(data[:5], test_case["version"]) == []
+
+    def test_decode_packet_invalid(self):
+        for test_case in decode_packet_test_cases["invalid"]:
+            with pytest.raises(Exception):
+                decode_packet(test_case["payload"], test_case["version"])
+
+    def test_decode_packet_errors(self):
+        for packet in decode_packet_test_cases["error_packets"]:
+            decoded = decode_packet(packet, PacketVersionMap.v3)
+            assert len(decoded) == 1
+            assert len(decoded[0]["error_list"]) > 0
+
+    def test_payload_data(self):
+        for test_case in packet_data_test_cases["valid_encodings"]:
+            raw_data = test_case.get("raw_data", '')
+            proto_data = test_case.get("proto_data", '')
+            payload = encode_payload_data(raw_data, proto_data, test_case["version"])
+            assert payload == test_case["encoded_payload_data"]
+            assert encode_payload_data_bytes(
+                bytes.fromhex(raw_data), bytes.fromhex(proto_data), test_case["version"]
+            ).hex() == payload
+
+            if payload:
+                assert decode_payload_data(payload, test_case["version"]) == {
+                    "protobuf_data": proto_data,
+                    "raw_data": raw_data,
+                }
+                assert decode_payload_data_bytes(
+                    bytes.fromhex(payload), test_case["version"]
+                ) == {
+                    "protobuf_data": bytes.fromhex(proto_data),
+                    "raw_data": bytes.fromhex(raw_data),
+                }
+
+    def test_decode_payload_data_invalid(self):
+        for test_case in decode_payload_data_test_cases["invalid"]:
+            with pytest.raises(Exception):
+                decode_payload_data(test_case["payload"], test_case["version"])
@@ -0,0 +1,69 @@
+from packages.core.src.encoders.packet.packet import decode_packet, encode_packet_bytes
+from packages.core.src.encoders.packet.reassembler import FrameReassembler, get_frame_reassembler
+from packages.core.src.utils.packetversion import PacketVersionMap
+
+
+def _frames(size: int, sequence_number: int = 1):
+    raw_data = bytes((i * 7) & 0xff for i in range(size))
+    return encode_packet_bytes(raw_data, b'', PacketVersionMap.v3, sequence_number, 1)
+
+
+class TestFrameReassembler:
+    def test_whole_frames(self):
+        frames = _frames(200)
+        reassembler = FrameReassembler()
+
+        packets = reassembler.feed(b''.join(frames))
+
+        assert packets == decode_packet(b''.join(frames), PacketVersionMap.v3)
+        assert len(reassembler) == 0
+
+    def test_split_reads(self):
+        data = b''.join(_frames(200))
+        expected = decode_packet(data, PacketVersionMap.v3)
+
+        for fragment_size in [1, 3, 7, 16, 63]:
+            reassembler = FrameReassembler()
+            packets = []
+            for i in range(0, len(data), fragment_size):
+                packets += reassembler.feed(data[i:i + fragment_size])
+            assert packets == expected
+            assert len(reassembler) == 0
+
+    def test_garbage_and_corrupted_frames(self):
+        first, second = _frames(10, 1)[0], _frames(10, 2)[0]
+        corrupted = bytearray(_frames(10, 3)[0])
+        corrupted[-1] ^= 0xff
+
+        reassembler = FrameReassembler()
+        packets = reassembler.feed(b'\x00\x55' + first + bytes(corrupted) + b'\x55\x55\x01' + second)
+
+        assert [packet['sequence_number'] for packet in packets] == [1, 2]
+
+    def test_false_start_of_frame_does_not_stall(self):
+        frame = _frames(4, 5)[0]
+        reassembler = FrameReassembler()
+
+        # A false header claiming a long payload followed by a complete frame
+        false_header = b'\x55\x55' + bytes(12) + b'\xff'
+        packets = reassembler.feed(false_header + frame)
+
+        assert [packet['sequence_number'] for packet in packets] == [5]
+
+    def test_buffer_is_bounded(self):
+        reassembler = FrameReassembler(max_buffer_size=64)
+        reassembler.feed(b'\x55\x55' + bytes(12) + b'\xff' + bytes(200))
+
+        assert len(reassembler) <= 64
+
+        frame = _frames(4, 6)[0]
+        packets = reassembler.feed(frame)
+        assert [packet['sequence_number'] for packet in packets] == [6]
+
+    def test_one_reassembler_per_connection(self):
+        class Connection:
+            pass
+
+        first, second = Connection(), Connection()
+        assert get_frame_reassembler(first) is get_frame_reassembler(first)
+        assert get_frame_reassembler(first) is not get_frame_reassembler(second)
@@ -3,7 +3,7 @@ from packages.core.src import config
 from packages.util.utils.assert_utils import assert_condition
 from packages.util.utils import is_hex, uint8array_to_hex, hex_to_uint8array, int_to_uint_byte, crc16, pad_start
 from packages.core.src.utils.packetversion import PacketVersion, PacketVersionMap
-from packages.core.src.utils.crypto import byte_unstuffing, byte_stuffing
+from packages.core.src.utils.crypto import stuff_bytes, unstuff_bytes
 from packages.interfaces.errors import DeviceCompatibilityError, DeviceCompatibilityErrorType
 
 class LegacyDecodedPacketData(TypedDict):
@@ -52,16 +52,15 @@ def xmodem_encode(
         data_chunk = data[
             (i - 1) * chunk_size : (i - 1) * chunk_size + chunk_size
         ]
-        comm_data = current_packet_number + total_packet + data_chunk
-        crc = int_to_uint_byte(crc16(hex_to_uint8array(comm_data)), 16)
-        stuffed_data = byte_stuffing(hex_to_uint8array(comm_data + crc), version)
+        comm_data = hex_to_uint8array(current_packet_number + total_packet + data_chunk)
+        crc = crc16(comm_data).to_bytes(2, 'big')
+        stuffed_data = stuff_bytes(comm_data + crc, version)
         comm_header = (
             start_of_frame
             + int_to_uint_byte(command_type, usable_config.radix.command_type)
-            + int_to_uint_byte(len(stuffed_data) // 2, usable_config.radix.data_size)
+            + int_to_uint_byte(len(stuffed_data), usable_config.radix.data_size)
         )
-        packet = comm_header + stuffed_data
-        packet_list.append(hex_to_uint8array(packet))
+        packet_list.append(hex_to_uint8array(comm_header) + stuffed_data)
 
     return packet_list
 
@@ -111,7 +110,7 @@ def xmodem_decode(
         stuffed_data = data[offset : offset + data_size * 2]
         data = data[offset + data_size * 2 :]
 
-        un_stuffed_data = byte_unstuffing(hex_to_uint8array(stuffed_data), version)
+        un_stuffed_data = unstuff_bytes(hex_to_uint8array(stuffed_data), version).hex()
         offset = 0
 
         current_packet_number = un_stuffed_data[
@@ -127,7 +126,7 @@ def xmodem_decode(
         data_chunk = un_stuffed_data[
             offset : len(un_stuffed_data) - usable_config.radix.crc // 4
         ]
-        offset += len(un_stuffed_data) - usable_config.radix.crc // 4
+        offset = len(un_stuffed_data) - usable_config.radix.crc // 4
 
         crc = un_stuffed_data[
             offset : offset + usable_config.radix.crc // 4
@@ -195,7 +194,7 @@ def create_ack_packet(
     comm_data = current_packet_number + total_packet + data_chunk
     crc = pad_start(hex(crc16(hex_to_uint8array(comm_data))).replace('0x', ''), 4, '0')
     temp = comm_data + crc
-    stuffed_data = byte_stuffing(hex_to_uint8array(temp), version)
+    stuffed_data = stuff_bytes(hex_to_uint8array(temp), version).hex()
     comm_header = (
         start_of_frame
         + int_to_uint_byte(command_type, usable_config.radix.command_type)
@@ -1,10 +1,11 @@
 import os
+import struct
 import time
-from typing import TypedDict, List, Dict
+from typing import TypedDict, Iterator, List, Dict, Optional, Union
 from enum import Enum
 from packages.core.src import config
 from packages.util.utils.assert_utils import assert_condition
-from packages.util.utils import is_hex, uint8array_to_hex, hex_to_uint8array, int_to_uint_byte, crc16
+from packages.util.utils import is_hex, crc16
 from packages.core.src.utils.packetversion import PacketVersion, PacketVersionMap
 from packages.interfaces.errors import DeviceCompatibilityError, DeviceCompatibilityErrorType
 
@@ -19,6 +20,19 @@ class DecodedPacketData(TypedDict):
     error_list: List[str]
     timestamp: int
 
+class DecodedPacketBytes(TypedDict):
+    start_of_frame: bytes
+    current_packet_number: int
+    total_packet_number: int
+    payload_data: bytes
+    crc: int
+    sequence_number: int
+    packet_type: int
+    error_list: List[str]
+    timestamp: int
+
+ByteData = Union[bytes, bytearray, memoryview]
+
 class ErrorPacketRejectReason(Enum):
     NO_ERROR = 0
     CHECKSUM_ERROR = 1
@@ -48,6 +62,84 @@ RejectReasonToMsgMap: Dict[ErrorPacketRejectReason, str] = {
     ErrorPacketRejectReason.INCOMPLETE_PACKET: 'Incomplete packet',
 }
 
+_STRUCT_FORMAT_BY_RADIX = {8: 'B', 16: 'H', 32: 'I'}
+
+
+def _struct_for(*radixes: int) -> struct.Struct:
+    return struct.Struct('>' + ''.join(_STRUCT_FORMAT_BY_RADIX[r] for r in radixes))
+
+
+# Wire layout of a v3 frame (all fields big endian):
+# start_of_frame | crc | current_packet_number | total_packet_number |
+# sequence_number | packet_type | timestamp | payload_length | payload
+_V3_START_OF_FRAME = bytes.fromhex(config.v3.constants.START_OF_FRAME)
+_V3_CHUNK_SIZE = config.v3.constants.CHUNK_SIZE // 2
+_V3_CRC = _struct_for(config.v3.radix.crc)
+_V3_HEADER = _struct_for(
+    config.v3.radix.current_packet_number,
+    config.v3.radix.total_packet,
+    config.v3.radix.sequence_number,
+    config.v3.radix.packet_type,
+    config.v3.radix.timestamp_length,
+    config.v3.radix.payload_length,
+)
+_V3_PACKET_NUMBER = _struct_for(config.v3.radix.current_packet_number)
+_V3_INVARIANT_HEADER = _struct_for(
+    config.v3.radix.total_packet,
+    config.v3.radix.sequence_number,
+    config.v3.radix.packet_type,
+    config.v3.radix.timestamp_length,
+)
+_V3_PAYLOAD_LENGTH = _struct_for(config.v3.radix.payload_length)
+_V3_PAYLOAD_SIZES = _struct_for(config.v3.radix.data_size, config.v3.radix.data_size)
+
+
+def _to_uint(num: int, radix: int) -> int:
+    # Same semantics as `int_to_uint_byte`: negative numbers are stored in
+    # two's complement, anything that does not fit is rejected.
+    value = num if num >= 0 else (1 << radix) + num
+    if value < 0 or value >= (1 << radix):
+        raise ValueError(f'Invalid serialization of data: {num} with radix {radix}')
+    return value
+
+
+def _get_timestamp() -> int:
+    # Match TypeScript behavior: Date.now().toString().slice(0, timestampLength / 4)
+    timestamp_ms = int(time.time() * 1000)  # JavaScript Date.now() equivalent
+    return int(str(timestamp_ms)[:config.v3.radix.timestamp_length // 4])
+
+
+def _assert_v3(version: PacketVersion) -> None:
+    if version != PacketVersionMap.v3:
+        raise DeviceCompatibilityError(
+            DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
+        )
+
+
+def encode_payload_data_bytes(
+    raw_data: ByteData,
+    protobuf_data: ByteData,
+    version: PacketVersion,
+) -> bytes:
+    assert_condition(raw_data is not None, 'Invalid rawData')
+    assert_condition(protobuf_data is not None, 'Invalid protobufData')
+    assert_condition(version, 'Invalid version')
+    _assert_v3(version)
+
+    if len(raw_data) == 0 and len(protobuf_data) == 0:
+        return b''
+
+    radix = config.v3.radix.data_size
+    return b''.join((
+        _V3_PAYLOAD_SIZES.pack(
+            _to_uint(len(protobuf_data), radix),
+            _to_uint(len(raw_data), radix),
+        ),
+        protobuf_data,
+        raw_data,
+    ))
+
+
 def encode_payload_data(
     raw_data: str,
     protobuf_data: str,
@@ -59,36 +151,110 @@ def encode_payload_data(
     assert_condition(is_hex(raw_data), 'Invalid hex in rawData')
     assert_condition(is_hex(protobuf_data), 'Invalid hex in protobufData')
 
-    if version != PacketVersionMap.v3:
-        raise DeviceCompatibilityError(
-            DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-        )
+    _assert_v3(version)
 
-    if len(raw_data) == 0 and len(protobuf_data) == 0:
-        return ''
+    return encode_payload_data_bytes(
+        bytes.fromhex(raw_data),
+        bytes.fromhex(protobuf_data),
+        version,
+    ).hex()
 
-    usable_config = config.v3
 
-    serialized_raw_data_length = int_to_uint_byte(
-        len(raw_data) // 2,
-        usable_config.radix.data_size,
-    )
-    serialized_protobuf_data_length = int_to_uint_byte(
-        len(protobuf_data) // 2,
-        usable_config.radix.data_size,
+def iter_encode_packet_bytes(
+    raw_data: ByteData = b'',
+    proto_data: ByteData = b'',
+    version: PacketVersion = PacketVersionMap.v3,
+    sequence_number: int = 0,
+    packet_type: int = 0,
+) -> Iterator[bytes]:
+    """
+    Encode raw and protobuf payloads into v3 frames without going through
+    hex strings, yielding the frames one at a time.
+
+    Arguments are validated when this is called, not when the first frame
+    is requested. The header fields that are the same for every frame
+    (including the timestamp) are serialized once.
+
+    Args:
+        raw_data: Raw payload bytes
+        proto_data: Protobuf payload bytes
+        version: Packet version, only v3 is supported
+        sequence_number: Sequence number of the command (-1 for status requests)
+        packet_type: Packet type of the frames
+
+    Returns:
+        Iterator[bytes]: Encoded frames, ready to be written to the connection
+    """
+    assert_condition(raw_data is not None, 'Invalid data')
+    assert_condition(proto_data is not None, 'Invalid data')
+    assert_condition(version, 'Invalid version')
+    assert_condition(sequence_number is not None, 'Invalid sequenceNumber')
+    assert_condition(packet_type is not None, 'Invalid packetType')
+    assert_condition(packet_type > 0, 'Packet type cannot be negative')
+
+    _assert_v3(version)
+
+    radix = config.v3.radix
+    serialized_data = memoryview(
+        encode_payload_data_bytes(raw_data, proto_data, version)
     )
+    rounds = max(1, (len(serialized_data) + _V3_CHUNK_SIZE - 1) // _V3_CHUNK_SIZE)
 
-    return (
-        serialized_protobuf_data_length + serialized_raw_data_length + protobuf_data + raw_data
+    invariant_header = _V3_INVARIANT_HEADER.pack(
+        _to_uint(rounds, radix.total_packet),
+        _to_uint(sequence_number, radix.sequence_number),
+        _to_uint(packet_type, radix.packet_type),
+        _to_uint(_get_timestamp(), radix.timestamp_length),
     )
 
-def encode_packet(
+    return _iter_frames(serialized_data, rounds, invariant_header)
+
+
+def _iter_frames(
+    serialized_data: memoryview,
+    rounds: int,
+    invariant_header: bytes,
+) -> Iterator[bytes]:
+    for i in range(1, rounds + 1):
+        offset = (i - 1) * _V3_CHUNK_SIZE
+        data_chunk = serialized_data[offset:offset + _V3_CHUNK_SIZE]
+
+        comm_data = b''.join((
+            _V3_PACKET_NUMBER.pack(i),
+            invariant_header,
+            _V3_PAYLOAD_LENGTH.pack(len(data_chunk)),
+            data_chunk,
+        ))
+
+        yield b''.join((_V3_START_OF_FRAME, _V3_CRC.pack(crc16(comm_data)), comm_data))
+
+
+def encode_packet_bytes(
+    raw_data: ByteData = b'',
+    proto_data: ByteData = b'',
+    version: PacketVersion = PacketVersionMap.v3,
+    sequence_number: int = 0,
+    packet_type: int = 0,
+) -> List[bytes]:
+    """
+    Same as `iter_encode_packet_bytes`, returning all the frames at once.
+    """
+    return list(iter_encode_packet_bytes(
+        raw_data,
+        proto_data,
+        version,
+        sequence_number,
+        packet_type,
+    ))
+
+
+def iter_encode_packet(
     raw_data: str = '',
     proto_data: str = '',
     version: PacketVersion = PacketVersionMap.v3,
     sequence_number: int = 0,
     packet_type: int = 0,
-) -> List[bytes]:
+) -> Iterator[bytes]:
     assert_condition(raw_data or proto_data, 'Invalid data')
     assert_condition(version, 'Invalid version')
     assert_condition(sequence_number is not None, 'Invalid sequenceNumber')
@@ -101,215 +267,172 @@ def encode_packet(
 
     assert_condition(packet_type > 0, 'Packet type cannot be negative')
 
-    if version != PacketVersionMap.v3:
-        raise DeviceCompatibilityError(
-            DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-        )
+    _assert_v3(version)
 
-    usable_config = config.v3
+    assert_condition(raw_data is not None, 'Invalid rawData')
+    assert_condition(proto_data is not None, 'Invalid protobufData')
 
-    serialized_sequence_number = int_to_uint_byte(
+    return iter_encode_packet_bytes(
+        bytes.fromhex(raw_data),
+        bytes.fromhex(proto_data),
+        version,
         sequence_number,
-        usable_config.radix.sequence_number,
-    )
-    serialized_packet_type = int_to_uint_byte(
         packet_type,
-        usable_config.radix.packet_type,
     )
 
-    chunk_size = usable_config.constants.CHUNK_SIZE
-    start_of_frame = usable_config.constants.START_OF_FRAME
 
-    serialized_data = encode_payload_data(
+def encode_packet(
+    raw_data: str = '',
+    proto_data: str = '',
+    version: PacketVersion = PacketVersionMap.v3,
+    sequence_number: int = 0,
+    packet_type: int = 0,
+) -> List[bytes]:
+    return list(iter_encode_packet(
         raw_data,
         proto_data,
         version,
-    )
+        sequence_number,
+        packet_type,
+    ))
 
-    rounds = (len(serialized_data) + chunk_size - 1) // chunk_size
-    has_no_data = len(serialized_data) == 0
-    if has_no_data:
-        rounds = 1
 
-    packet_list: List[bytes] = []
+V3_START_OF_FRAME = _V3_START_OF_FRAME
+V3_FRAME_HEADER_SIZE = len(_V3_START_OF_FRAME) + _V3_CRC.size + _V3_HEADER.size
 
-    for i in range(1, rounds + 1):
-        current_packet_number = int_to_uint_byte(
-            i,
-            usable_config.radix.current_packet_number,
-        )
-        total_packet_number = int_to_uint_byte(
-            rounds,
-            usable_config.radix.total_packet,
-        )
-        data_chunk = serialized_data[
-            (i - 1) * chunk_size : (i - 1) * chunk_size + chunk_size
-        ]
-        payload = data_chunk
-        payload_length = int_to_uint_byte(
-            len(data_chunk) // 2,
-            usable_config.radix.payload_length,
-        )
-        # Match TypeScript behavior: Date.now().toString().slice(0, timestampLength / 4)
-        timestamp_ms = int(time.time() * 1000)  # JavaScript Date.now() equivalent
-        timestamp_str = str(timestamp_ms)[:usable_config.radix.timestamp_length // 4]
-        serialized_timestamp = int_to_uint_byte(
-            int(timestamp_str),
-            usable_config.radix.timestamp_length,
-        )
 
-        comm_data = (
-            current_packet_number
-            + total_packet_number
-            + serialized_sequence_number
-            + serialized_packet_type
-            + serialized_timestamp
-            + payload_length
-            + payload
-        )
-        crc = int_to_uint_byte(
-            crc16(hex_to_uint8array(comm_data)),
-            usable_config.radix.crc,
-        )
-        packet = start_of_frame + crc + comm_data
-        packet_list.append(hex_to_uint8array(packet))
+def get_frame_length(data: ByteData, offset: int = 0) -> Optional[int]:
+    """
+    Length of the v3 frame starting at `offset`, start of frame included.
 
-    return packet_list
+    Returns:
+        Optional[int]: None when the frame header is not complete yet
+    """
+    if offset + V3_FRAME_HEADER_SIZE > len(data):
+        return None
+    payload_length = data[offset + V3_FRAME_HEADER_SIZE - 1]
+    return V3_FRAME_HEADER_SIZE + payload_length
 
-def decode_packet(
-    param: bytes,
-    version: PacketVersion,
-) -> List[DecodedPacketData]:
-    if version != PacketVersionMap.v3:
-        raise DeviceCompatibilityError(
-            DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-        )
 
-    usable_config = config.v3
-    start_of_frame = usable_config.constants.START_OF_FRAME
+def decode_frame(data: ByteData, offset: int = 0) -> DecodedPacketBytes:
+    """
+    Decode the v3 frame starting at `offset`. The frame header must be
+    complete, a short payload is reported as an invalid crc.
+    """
+    crc_offset = offset + len(_V3_START_OF_FRAME)
+    comm_offset = crc_offset + _V3_CRC.size
+    payload_offset = comm_offset + _V3_HEADER.size
 
-    data = uint8array_to_hex(param).lower()
-    packet_list: List[DecodedPacketData] = []
-    offset = data.find(start_of_frame)
+    (crc,) = _V3_CRC.unpack_from(data, crc_offset)
+    (
+        current_packet_number,
+        total_packet_number,
+        sequence_number,
+        packet_type,
+        timestamp,
+        payload_length,
+    ) = _V3_HEADER.unpack_from(data, comm_offset)
+
+    with memoryview(data) as view:
+        payload_end = min(payload_offset + payload_length, len(view))
+        actual_crc = crc16(view[comm_offset:payload_end])
+        payload_data = bytes(view[payload_offset:payload_end])
+
+    error_list = []
+    if current_packet_number > total_packet_number:
+        error_list.append('current_packet_number is greater than total_packet_number')
+    if actual_crc != crc:
+        error_list.append('invalid crc')
+
+    return DecodedPacketBytes(
+        start_of_frame=_V3_START_OF_FRAME,
+        current_packet_number=current_packet_number,
+        total_packet_number=total_packet_number,
+        crc=crc,
+        payload_data=payload_data,
+        error_list=error_list,
+        sequence_number=sequence_number,
+        packet_type=packet_type,
+        timestamp=timestamp,
+    )
 
-    while len(data) > 0:
-        offset = data.find(start_of_frame)
-        if offset == -1:
-            return packet_list
 
-        start_of_frame = data[offset : offset + len(start_of_frame)]
-        offset += len(start_of_frame)
+def to_decoded_packet_data(packet: DecodedPacketBytes) -> DecodedPacketData:
+    return DecodedPacketData(
+        start_of_frame=packet['start_of_frame'].hex(),
+        current_packet_number=packet['current_packet_number'],
+        total_packet_number=packet['total_packet_number'],
+        crc=f"{packet['crc']:04x}",
+        payload_data=packet['payload_data'].hex(),
+        error_list=packet['error_list'],
+        sequence_number=packet['sequence_number'],
+        packet_type=packet['packet_type'],
+        timestamp=packet['timestamp'],
+    )
 
-        crc = data[offset : offset + usable_config.radix.crc // 4]
-        offset += usable_config.radix.crc // 4
 
-        current_packet_number = int(
-            data[offset : offset + usable_config.radix.current_packet_number // 4],
-            16,
-        )
-        offset += usable_config.radix.current_packet_number // 4
+def decode_packet_bytes(
+    param: ByteData,
+    version: PacketVersion,
+) -> List[DecodedPacketBytes]:
+    """
+    Decode every v3 frame found in the given buffer.
 
-        total_packet_number = int(
-            data[offset : offset + usable_config.radix.total_packet // 4],
-            16,
-        )
-        offset += usable_config.radix.total_packet // 4
+    The buffer is parsed in place; a trailing frame whose header is not
+    complete yet is ignored.
 
-        sequence_number = int(
-            data[offset : offset + usable_config.radix.sequence_number // 4],
-            16,
-        )
-        offset += usable_config.radix.sequence_number // 4
+    Args:
+        param: Bytes received from the device
+        version: Packet version, only v3 is supported
 
-        packet_type = int(
-            data[offset : offset + usable_config.radix.packet_type // 4],
-            16,
-        )
-        offset += usable_config.radix.packet_type // 4
+    Returns:
+        List[DecodedPacketBytes]: Decoded frames along with their validation errors
+    """
+    _assert_v3(version)
+    assert_condition(param is not None, 'Invalid data')
 
-        timestamp = int(
-            data[offset : offset + usable_config.radix.timestamp_length // 4],
-            16,
-        )
-        offset += usable_config.radix.timestamp_length // 4
+    data = param if isinstance(param, (bytes, bytearray)) else bytes(param)
+    packet_list: List[DecodedPacketBytes] = []
 
-        payload_length = int(
-            data[offset : offset + usable_config.radix.payload_length // 4],
-            16,
-        )
-        offset += usable_config.radix.payload_length // 4
-
-        payload_data = ''
-        if payload_length != 0:
-            payload_data = data[offset : offset + payload_length * 2]
-            offset += payload_length * 2
-        data = data[offset:]
-
-        comm_data = (
-            int_to_uint_byte(
-                current_packet_number, usable_config.radix.current_packet_number
-            )
-            + int_to_uint_byte(total_packet_number, usable_config.radix.total_packet)
-            + int_to_uint_byte(sequence_number, usable_config.radix.sequence_number)
-            + int_to_uint_byte(packet_type, usable_config.radix.packet_type)
-            + int_to_uint_byte(timestamp, usable_config.radix.timestamp_length)
-            + int_to_uint_byte(payload_length, usable_config.radix.payload_length)
-            + payload_data
-        )
-        actual_crc = int_to_uint_byte(
-            crc16(hex_to_uint8array(comm_data)),
-            usable_config.radix.crc,
-        )
+    offset = data.find(_V3_START_OF_FRAME)
+    while offset != -1:
+        frame_length = get_frame_length(data, offset)
+        if frame_length is None:
+            break
+
+        packet_list.append(decode_frame(data, offset))
+        offset = data.find(_V3_START_OF_FRAME, offset + frame_length)
 
-        error_list = []
-        if start_of_frame.upper() != start_of_frame.upper():
-            error_list.append('Invalid Start of frame')
-        if current_packet_number > total_packet_number:
-            error_list.append('current_packet_number is greater than total_packet_number')
-        if actual_crc.upper() != crc.upper():
-            error_list.append('invalid crc')
-
-        packet_list.append(
-            DecodedPacketData(
-                start_of_frame=start_of_frame,
-                current_packet_number=current_packet_number,
-                total_packet_number=total_packet_number,
-                crc=crc,
-                payload_data=payload_data,
-                error_list=error_list,
-                sequence_number=sequence_number,
-                packet_type=packet_type,
-                timestamp=timestamp,
-            )
-        )
     return packet_list
 
-def decode_payload_data(payload: str, version: PacketVersion) -> Dict[str, str]:
-    assert_condition(payload, 'Invalid payload')
-    assert_condition(version, 'Invalid version')
-    assert_condition(is_hex(payload), 'Invalid hex in payload')
 
-    if version != PacketVersionMap.v3:
-        raise DeviceCompatibilityError(
-            DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-        )
-
-    usable_config = config.v3
-    payload_offset = 0
+def decode_packet(
+    param: bytes,
+    version: PacketVersion,
+) -> List[DecodedPacketData]:
+    return [
+        to_decoded_packet_data(packet)
+        for packet in decode_packet_bytes(param, version)
+    ]
 
-    data_size_half = usable_config.radix.data_size // 4
 
-    protobuf_data_size = int(payload[payload_offset:payload_offset + data_size_half], 16)
-    payload_offset += data_size_half
+def decode_payload_data_bytes(
+    payload: ByteData,
+    version: PacketVersion,
+) -> Dict[str, bytes]:
+    assert_condition(payload is not None, 'Invalid payload')
+    assert_condition(version, 'Invalid version')
+    _assert_v3(version)
+    assert_condition(len(payload) >= _V3_PAYLOAD_SIZES.size, 'Invalid payload')
 
-    raw_data_size = int(payload[payload_offset:payload_offset + data_size_half], 16)
-    payload_offset += data_size_half
+    view = memoryview(payload)
+    protobuf_data_size, raw_data_size = _V3_PAYLOAD_SIZES.unpack_from(view)
+    payload_offset = _V3_PAYLOAD_SIZES.size
 
-    protobuf_data = payload[payload_offset:payload_offset + protobuf_data_size * 2]
-    payload_offset += protobuf_data_size * 2
+    protobuf_data = bytes(view[payload_offset:payload_offset + protobuf_data_size])
+    payload_offset += protobuf_data_size
 
-    raw_data = payload[payload_offset:payload_offset + raw_data_size * 2]
-    payload_offset += raw_data_size * 2
+    raw_data = bytes(view[payload_offset:payload_offset + raw_data_size])
 
     return {
         "protobuf_data": protobuf_data,
@@ -317,4 +440,16 @@ def decode_payload_data(payload: str, version: PacketVersion) -> Dict[str, str]:
     }
 
 
+def decode_payload_data(payload: str, version: PacketVersion) -> Dict[str, str]:
+    assert_condition(payload, 'Invalid payload')
+    assert_condition(version, 'Invalid version')
+    assert_condition(is_hex(payload), 'Invalid hex in payload')
+
+    _assert_v3(version)
 
+    decoded = decode_payload_data_bytes(bytes.fromhex(payload), version)
+
+    return {
+        "protobuf_data": decoded["protobuf_data"].hex(),
+        "raw_data": decoded["raw_data"].hex(),
+    }
@@ -0,0 +1,141 @@
+import weakref
+from typing import List, Optional
+
+from packages.util.utils.assert_utils import assert_condition
+from packages.core.src.utils.packetversion import PacketVersion, PacketVersionMap
+from packages.interfaces.errors import DeviceCompatibilityError, DeviceCompatibilityErrorType
+from packages.core.src.encoders.packet.packet import (
+    ByteData,
+    DecodedPacketData,
+    V3_START_OF_FRAME,
+    decode_frame,
+    get_frame_length,
+    to_decoded_packet_data,
+)
+
+DEFAULT_MAX_BUFFER_SIZE = 64 * 1024
+
+
+class FrameReassembler:
+    """
+    Rebuilds v3 frames from a stream of arbitrary byte fragments.
+
+    Data received from the device does not always line up with frame
+    boundaries: a frame can be split across reads and a read can hold
+    several frames. Bytes of an incomplete frame are kept until the rest
+    arrives, and a frame that fails the crc check is treated as a false
+    start of frame so that parsing resumes on the next one.
+
+    Only frames with a valid crc are returned.
+    """
+
+    def __init__(
+        self,
+        version: PacketVersion = PacketVersionMap.v3,
+        max_buffer_size: int = DEFAULT_MAX_BUFFER_SIZE,
+    ):
+        if version != PacketVersionMap.v3:
+            raise DeviceCompatibilityError(
+                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
+            )
+        assert_condition(max_buffer_size > 0, 'Invalid maxBufferSize')
+
+        self.version = version
+        self.max_buffer_size = max_buffer_size
+        self._buffer = bytearray()
+        self._offset = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer) - self._offset
+
+    def reset(self) -> None:
+        self._buffer.clear()
+        self._offset = 0
+
+    def feed(self, data: ByteData) -> List[DecodedPacketData]:
+        """
+        Add received bytes and return every frame completed by them.
+
+        Args:
+            data: Bytes as received from the connection
+
+        Returns:
+            List[DecodedPacketData]: Complete frames, in the order received
+        """
+        assert_condition(data is not None, 'Invalid data')
+
+        self._buffer += data
+        self._trim()
+
+        buffer = self._buffer
+        packet_list: List[DecodedPacketData] = []
+
+        while True:
+            start = buffer.find(V3_START_OF_FRAME, self._offset)
+            if start == -1:
+                # Keep the last byte, it can be the first half of a start of frame
+                self._offset = max(self._offset, len(buffer) - len(V3_START_OF_FRAME) + 1)
+                break
+
+            frame_length = get_frame_length(buffer, start)
+            if frame_length is None or start + frame_length > len(buffer):
+                resync = self._find_next_frame(start)
+                if resync is None:
+                    self._offset = start
+                    break
+                self._offset = resync
+                continue
+
+            packet = decode_frame(buffer, start)
+            if 'invalid crc' in packet['error_list']:
+                self._offset = start + 1
+                continue
+
+            packet_list.append(to_decoded_packet_data(packet))
+            self._offset = start + frame_length
+
+        self._compact()
+        return packet_list
+
+    def _find_next_frame(self, start: int) -> Optional[int]:
+        # An incomplete frame may be a false start of frame (garbage or a
+        # partial frame from an earlier read) which would otherwise hold back
+        # the valid frames behind it until enough bytes arrive.
+        buffer = self._buffer
+        candidate = buffer.find(V3_START_OF_FRAME, start + 1)
+        while candidate != -1:
+            frame_length = get_frame_length(buffer, candidate)
+            if frame_length is not None and candidate + frame_length <= len(buffer):
+                if 'invalid crc' not in decode_frame(buffer, candidate)['error_list']:
+                    return candidate
+            candidate = buffer.find(V3_START_OF_FRAME, candidate + 1)
+        return None
+
+    def _trim(self) -> None:
+        overflow = len(self) - self.max_buffer_size
+        if overflow > 0:
+            self._offset += overflow
+
+    def _compact(self) -> None:
+        if self._offset == 0:
+            return
+        if self._offset >= len(self._buffer):
+            self.reset()
+        elif self._offset > len(self._buffer) // 2:
+            del self._buffer[:self._offset]
+            self._offset = 0
+
+
+_reassemblers: 'weakref.WeakKeyDictionary[object, FrameReassembler]' = weakref.WeakKeyDictionary()
+
+
+def get_frame_reassembler(connection: object) -> FrameReassembler:
+    """
+    Returns the reassembler attached to the connection, creating it on
+    first use. Partial frames are kept across `wait_for_packet` calls.
+    """
+    reassembler = _reassemblers.get(connection)
+    if reassembler is None:
+        reassembler = FrameReassembler()
+        _reassemblers[connection] = reassembler
+    return reassembler
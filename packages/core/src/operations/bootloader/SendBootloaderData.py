@@ -1,5 +1,7 @@
 import asyncio
-from typing import Optional, Dict, Any, Callable
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Callable, Deque, Sequence
 
 from packages.interfaces.errors import (
     DeviceBootloaderError,
@@ -10,9 +12,10 @@ from packages.interfaces.errors import (
     DeviceConnectionErrorType,
 )
 from packages.interfaces import IDeviceConnection
-from packages.util.utils import hex_to_uint8array, uint8array_to_hex, assert_condition
+from packages.util.utils import uint8array_to_hex, assert_condition
 from packages.core.src.utils.logger import logger
-from packages.core.src.encoders.packet.Bootloader import stm_xmodem_encode
+from packages.core.src.encoders.packet.Bootloader import FirmwareData, StmXmodemFrames
+from packages.core.src.operations.helpers.waitfordata import wait_for_data
 
 RECHECK_TIME = 1
 ACK_PACKET = '06'
@@ -57,6 +60,9 @@ ERROR_CODES = [
     },
 ]
 
+ACK_BYTE = int(ACK_PACKET, 16)
+ERROR_BYTES = {int(error['code'], 16): error['error_obj'] for error in ERROR_CODES}
+
 
 async def write_packet(
         connection: IDeviceConnection,
@@ -94,7 +100,7 @@ async def write_packet(
 
                 raw_packet = await connection.receive()
                 if not raw_packet:
-                    await asyncio.sleep(RECHECK_TIME / 1000)
+                    await wait_for_data(connection, RECHECK_TIME)
                     continue
 
                 e_packet_data = uint8array_to_hex(raw_packet)
@@ -110,7 +116,7 @@ async def write_packet(
                     cleanup()
                     return
 
-                await asyncio.sleep(RECHECK_TIME / 1000)
+                await wait_for_data(connection, RECHECK_TIME)
 
             except Exception as error:
                 if hasattr(error, 'code') and error.code in [e.value for e in DeviceConnectionErrorType]:
@@ -200,7 +206,7 @@ async def check_if_in_receiving_mode(
 
                 raw_packet = await connection.receive()
                 if not raw_packet:
-                    await asyncio.sleep(RECHECK_TIME / 1000)
+                    await wait_for_data(connection, RECHECK_TIME)
                     continue
 
                 e_packet_data = uint8array_to_hex(raw_packet)
@@ -210,7 +216,7 @@ async def check_if_in_receiving_mode(
                     cleanup()
                     return
 
-                await asyncio.sleep(RECHECK_TIME / 1000)
+                await wait_for_data(connection, RECHECK_TIME)
 
             except Exception as error:
                 if hasattr(error, 'code') and error.code in [e.value for e in DeviceConnectionErrorType]:
@@ -253,22 +259,212 @@ async def check_if_in_receiving_mode(
         )
 
 
+def _report_throughput(
+    on_throughput: Optional[Callable[[Dict[str, Any]], None]],
+    start_time: float,
+    bytes_sent: int,
+    retransmissions: int,
+) -> None:
+    if not on_throughput:
+        return
+
+    elapsed = time.monotonic() - start_time
+    on_throughput({
+        'bytes_sent': bytes_sent,
+        'elapsed': int(elapsed * 1000),
+        'bytes_per_second': bytes_sent / elapsed if elapsed > 0 else 0,
+        'retransmissions': retransmissions,
+    })
+
+
+async def read_responses(
+        connection: IDeviceConnection,
+        timeout: int,
+) -> Optional[bytes]:
+    """
+    Wait for response bytes from the bootloader.
+
+    Returns:
+        Optional[bytes]: The received bytes, None if nothing arrived in time
+    """
+    deadline = time.monotonic() + timeout / 1000
+
+    while True:
+        if not await connection.is_connected():
+            raise DeviceConnectionError(
+                DeviceConnectionErrorType.CONNECTION_CLOSED
+            )
+
+        raw_packet = await connection.receive()
+        if raw_packet:
+            return bytes(raw_packet)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+
+        await wait_for_data(connection, RECHECK_TIME, timeout=remaining * 1000)
+
+
+async def send_windowed(
+        connection: IDeviceConnection,
+        packets_list: Sequence[bytes],
+        window_size: int,
+        on_progress: Optional[Callable[[int], None]] = None,
+        options: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Sends the xmodem frames keeping up to `window_size` of them unacknowledged.
+
+    The bootloader answers every frame with one byte, in the order the frames
+    were received, and only accepts frames in sequence (or the last accepted
+    frame again). So this is go-back-N: once a frame is not acknowledged
+    (error code or timeout) nothing new is sent, the answers to the frames
+    still in flight are read, and sending resumes in order from the first
+    frame not acknowledged. An acknowledgement settles every frame before it
+    too.
+
+    The frames in flight at a timeout may still be answered, those answers
+    are read before anything is sent again so they are not taken for the
+    answers of the frames sent again. They are waited for up to
+    `first_timeout`, then the frames are considered lost. Bytes that are not
+    an answer to a frame are ignored.
+
+    The first frame and the end of transmission are always sent alone, the
+    bootloader may take longer to answer them.
+    """
+    if options is None:
+        options = {}
+
+    max_tries = options.get('max_tries', 5)
+    first_timeout = options.get('first_timeout', 10000)
+    on_throughput = options.get('on_throughput')
+    total = len(packets_list)
+
+    next_index = 0
+    in_flight: Deque[int] = deque()
+    # Frames in flight at a timeout, their answers are still owed
+    late: Deque[int] = deque()
+    # Number of frames acknowledged, i.e. index of the first one that is not
+    acked = 0
+    is_going_back = False
+    failures = [0] * total
+    first_errors: Dict[int, Exception] = {}
+    bytes_sent = 0
+    retransmissions = 0
+    start_time = time.monotonic()
+
+    def is_exclusive(index: int) -> bool:
+        return index == 0 or index == total - 1
+
+    def go_back(error: Exception) -> None:
+        nonlocal is_going_back
+        is_going_back = True
+        first_errors.setdefault(acked, error)
+        failures[acked] += 1
+        if failures[acked] >= max_tries:
+            raise first_errors[acked]
+
+    while acked < total:
+        while (
+            not is_going_back and
+            next_index < total and
+            len(in_flight) < window_size
+        ):
+            if in_flight and (is_exclusive(next_index) or is_exclusive(in_flight[0])):
+                break
+
+            await connection.send(packets_list[next_index])
+            in_flight.append(next_index)
+            bytes_sent += len(packets_list[next_index])
+            next_index += 1
+
+        if not in_flight or is_exclusive(in_flight[0]):
+            timeout = first_timeout
+        else:
+            timeout = options.get('timeout', 2000)
+
+        responses = await read_responses(connection, timeout)
+
+        if responses is None:
+            if in_flight:
+                logger.warn('Timeout in sending bootloader data')
+                late.extend(in_flight)
+                in_flight.clear()
+                if not is_going_back:
+                    go_back(DeviceCommunicationError(DeviceCommunicationErrorType.WRITE_TIMEOUT))
+            else:
+                logger.warn('Frames sent before the timeout were not answered')
+                late.clear()
+        else:
+            for response in responses:
+                if response != ACK_BYTE and response not in ERROR_BYTES:
+                    continue
+
+                if late:
+                    index = late.popleft()
+                elif in_flight:
+                    index = in_flight.popleft()
+                else:
+                    continue
+
+                if response == ACK_BYTE:
+                    if index >= acked:
+                        acked = index + 1
+                        if on_progress:
+                            on_progress((acked * 100) // total)
+                        _report_throughput(on_throughput, start_time, bytes_sent, retransmissions)
+                elif not is_going_back:
+                    logger.warn('Error in sending bootloader data')
+                    logger.warn(str(ERROR_BYTES[response].value))
+                    go_back(DeviceBootloaderError(ERROR_BYTES[response]))
+
+        if is_going_back and not in_flight and not late:
+            is_going_back = False
+            retransmissions += next_index - acked
+            next_index = acked
+
+
 async def send_bootloader_data(
         connection: IDeviceConnection,
-        data: str,
+        data: FirmwareData,
         on_progress: Optional[Callable[[int], None]] = None,
         options: Optional[Dict[str, Any]] = None
 ) -> None:
+    """
+    Flash `data` through the bootloader. `data` can be a hex string or any
+    bytes-like object (bytes, memoryview, mmap of the firmware file), frames
+    are encoded as they are sent.
+    """
     if options is None:
         options = {}
 
     assert_condition(connection, 'Invalid connection')
 
-    packets_list = stm_xmodem_encode(data)
+    window_size = options.get('window_size', 1)
+    assert_condition(window_size >= 1, 'Invalid windowSize')
+
+    packets_list = StmXmodemFrames(data)
 
     await check_if_in_receiving_mode(connection, options)
 
-    async def process_packet(packet_data: str, index: int) -> None:
+    if window_size > 1:
+        await send_windowed(
+            connection,
+            packets_list,
+            window_size,
+            on_progress,
+            options,
+        )
+        return
+
+    on_throughput = options.get('on_throughput')
+    start_time = time.monotonic()
+    bytes_sent = 0
+    retransmissions = 0
+
+    async def process_packet(packet: bytes, index: int) -> None:
+        nonlocal bytes_sent, retransmissions
         tries = 1
         inner_max_tries = options.get('max_tries', 5)
         first_error = None
@@ -281,15 +477,20 @@ async def send_bootloader_data(
                 else:
                     timeout_option['timeout'] = options.get('timeout')
 
+                if tries > 1:
+                    retransmissions += 1
+                bytes_sent += len(packet)
+
                 error_msg = await write_packet(
                     connection,
-                    hex_to_uint8array(packet_data),
+                    packet,
                     timeout_option
                 )
 
                 if not error_msg:
                     if on_progress:
                         on_progress((index * 100) // len(packets_list))
+                    _report_throughput(on_throughput, start_time, bytes_sent, retransmissions)
                     return
                 else:
                     raise error_msg
@@ -315,5 +516,3 @@ async def send_bootloader_data(
 
     for index, packet in enumerate(packets_list):
         await process_packet(packet, index)
-
-
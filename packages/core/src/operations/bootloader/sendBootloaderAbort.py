@@ -14,6 +14,7 @@ from packages.util.utils.crypto import (
 )
 from packages.core.src import config
 from packages.core.src.operations.helpers.can_retry import can_retry
+from packages.core.src.operations.helpers.waitfordata import wait_for_data
 
 ACK_PACKET = '18'
 
@@ -102,7 +103,7 @@ async def write_packet(
 
                 raw_packet = await connection.receive()
                 if not raw_packet:
-                    await asyncio.sleep(recheck_time / 1000)
+                    await wait_for_data(connection, recheck_time)
                     continue
 
                 e_packet_data = uint8array_to_hex(raw_packet)
@@ -112,7 +113,7 @@ async def write_packet(
                     cleanup()
                     return
 
-                await asyncio.sleep(recheck_time / 1000)
+                await wait_for_data(connection, recheck_time)
 
             except Exception as error:
                 if hasattr(error, 'code') and error.code in [e.value for e in DeviceConnectionErrorType]:
@@ -1,15 +1,23 @@
+from .adaptivepoller import AdaptivePoller, PollMetrics
 from .can_retry import can_retry
 from .getcommandoutput import get_command_output
 from .getstatus import get_status
+from .packetdispatcher import PacketDispatcher, get_packet_dispatcher
 from .sendcommand import send_command
+from .waitfordata import wait_for_data
 from .waitforpacket import wait_for_packet
 from .writecommand import write_command
 
 __all__ = [
+    'AdaptivePoller',
+    'PollMetrics',
     'can_retry',
     'get_command_output',
     'get_status',
+    'PacketDispatcher',
+    'get_packet_dispatcher',
     'send_command',
+    'wait_for_data',
     'wait_for_packet',
     'write_command'
 ]
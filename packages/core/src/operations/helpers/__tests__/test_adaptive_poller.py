@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+from packages.core.src.operations.helpers.adaptivepoller import AdaptivePoller
+
+
+class TestAdaptivePoller:
+    def test_fixed_interval(self):
+        poller = AdaptivePoller({'interval': 20})
+        assert [poller.next_interval(i % 2, True) for i in range(5)] == [20] * 5
+
+    def test_backoff_while_waiting(self):
+        poller = AdaptivePoller({'minInterval': 10, 'maxInterval': 50, 'backoffFactor': 2, 'fastPolls': 2})
+        intervals = [poller.next_interval(1, True) for _ in range(6)]
+        assert intervals == [10, 10, 20, 40, 50, 50]
+        assert poller.metrics['backoffs'] == 4
+
+    def test_repoll_on_flow_status_change(self):
+        poller = AdaptivePoller({'minInterval': 10, 'backoffFactor': 2, 'fastPolls': 0})
+        assert poller.next_interval(1, True) == 20
+        assert poller.next_interval(1, True) == 40
+        assert poller.next_interval(2, True) == 0
+        assert poller.next_interval(2, True) == 20
+        assert poller.metrics['status_changes'] == 1
+
+    def test_not_waiting_polls_fast(self):
+        poller = AdaptivePoller({'minInterval': 10, 'fastPolls': 0, 'backoffFactor': 2})
+        poller.next_interval(1, True)
+        assert poller.next_interval(1, False) == 10
+
+    def test_metrics(self):
+        on_poll_metrics = Mock()
+        poller = AdaptivePoller({'onPollMetrics': on_poll_metrics})
+
+        async def _test():
+            await poller.wait(1, True)
+            await poller.wait(1, True)
+
+        asyncio.run(_test())
+        metrics = poller.finish()
+
+        on_poll_metrics.assert_called_once_with(metrics)
+        assert metrics['polls'] == 2
+        assert metrics['total_wait'] == 40
+        assert metrics['elapsed'] >= 40
+
+    def test_metrics_callback_error(self):
+        on_poll_metrics = Mock(side_effect=ValueError('Invalid metrics'))
+        poller = AdaptivePoller({'onPollMetrics': on_poll_metrics})
+
+        metrics = poller.finish()
+
+        on_poll_metrics.assert_called_once_with(metrics)
+        assert metrics['polls'] == 0
+
+    def test_invalid_options(self):
+        with pytest.raises(Exception):
+            AdaptivePoller({'minInterval': 100, 'maxInterval': 10})
+        with pytest.raises(Exception):
+            AdaptivePoller({'backoffFactor': 0.5})
@@ -0,0 +1,184 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from packages.interfaces import DeviceConnectionError
+from packages.interfaces.__mocks__.connection import MockDeviceConnection
+from packages.core.src.config import v3 as config
+from packages.core.src.encoders.packet.packet import encode_packet_bytes
+from packages.core.src.operations.helpers import waitforpacket
+from packages.core.src.operations.helpers.packetdispatcher import (
+    PacketDispatcher,
+    get_packet_dispatcher,
+)
+from packages.core.src.operations.helpers.waitforpacket import wait_for_packet
+from packages.core.src.utils.packetversion import PacketVersionMap
+
+PACKET_TYPE = config.commands.PACKET_TYPE
+
+
+def create_frame(sequence_number: int, packet_type: int) -> bytes:
+    return encode_packet_bytes(
+        b'',
+        b'',
+        PacketVersionMap.v3,
+        sequence_number,
+        packet_type,
+    )[0]
+
+
+async def create_connection() -> MockDeviceConnection:
+    connection = await MockDeviceConnection.create()
+    await connection.before_operation()
+    return connection
+
+
+class TestPacketDispatcher:
+    def test_should_route_packets_to_concurrent_waiters(self):
+        async def _test():
+            connection = await create_connection()
+            dispatcher = PacketDispatcher(connection)
+
+            first = dispatcher.register(1, [PACKET_TYPE.CMD_ACK])
+            second = dispatcher.register(2, [PACKET_TYPE.CMD_ACK])
+
+            await connection.mock_device_send(
+                create_frame(2, PACKET_TYPE.CMD_ACK) + create_frame(1, PACKET_TYPE.CMD_ACK)
+            )
+
+            assert (await asyncio.wait_for(first.future, 1))['sequence_number'] == 1
+            assert (await asyncio.wait_for(second.future, 1))['sequence_number'] == 2
+            assert dispatcher.waiters == []
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_keep_unclaimed_packets_in_backlog(self):
+        async def _test():
+            connection = await create_connection()
+            dispatcher = PacketDispatcher(connection, backlog_size=2)
+
+            waiter = dispatcher.register(3, [PACKET_TYPE.CMD_ACK])
+            await connection.mock_device_send(b''.join(
+                create_frame(sequence_number, PACKET_TYPE.CMD_OUTPUT)
+                for sequence_number in (1, 2, 3)
+            ) + create_frame(3, PACKET_TYPE.CMD_ACK))
+            await asyncio.wait_for(waiter.future, 1)
+
+            # The oldest packet was dropped from the bounded backlog
+            assert [packet['sequence_number'] for _, packet in dispatcher.backlog] == [2, 3]
+
+            waiter = dispatcher.register(2, [PACKET_TYPE.CMD_OUTPUT])
+            assert waiter.future.done()
+            assert waiter.future.result()['sequence_number'] == 2
+            assert len(dispatcher.backlog) == 1
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_drop_expired_backlog(self):
+        async def _test():
+            connection = await create_connection()
+            dispatcher = PacketDispatcher(connection, backlog_time=10)
+
+            dispatcher.dispatch({
+                'packet_type': PACKET_TYPE.CMD_ACK,
+                'sequence_number': 1,
+                'error_list': [],
+            })
+            await asyncio.sleep(0.02)
+
+            waiter = dispatcher.register(1, [PACKET_TYPE.CMD_ACK])
+            assert not waiter.future.done()
+            dispatcher.unregister(waiter)
+            assert len(dispatcher.backlog) == 0
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_not_keep_unclaimed_status_in_backlog(self):
+        async def _test():
+            connection = await create_connection()
+            dispatcher = PacketDispatcher(connection)
+
+            dispatcher.dispatch({
+                'packet_type': PACKET_TYPE.STATUS,
+                'sequence_number': 1,
+                'error_list': [],
+            })
+            assert len(dispatcher.backlog) == 0
+
+            # A later status request must not be answered with the old status
+            waiter = dispatcher.register(2, [PACKET_TYPE.STATUS])
+            assert not waiter.future.done()
+            dispatcher.unregister(waiter)
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_fail_waiters_when_disconnected(self):
+        async def _test():
+            connection = await create_connection()
+            dispatcher = PacketDispatcher(connection)
+
+            waiter = dispatcher.register(1, [PACKET_TYPE.CMD_ACK])
+            await connection.destroy()
+
+            with pytest.raises(DeviceConnectionError):
+                await asyncio.wait_for(waiter.future, 1)
+
+        asyncio.run(_test())
+
+    def test_should_allow_concurrent_wait_for_packet(self):
+        async def _test():
+            connection = await create_connection()
+
+            tasks = [
+                wait_for_packet(
+                    connection=connection,
+                    sequence_number=sequence_number,
+                    packet_types=[PACKET_TYPE.CMD_ACK],
+                    version=PacketVersionMap.v3,
+                    ack_timeout=500,
+                )
+                for sequence_number in (1, 2)
+            ]
+            await asyncio.sleep(0.01)
+            await connection.mock_device_send(create_frame(2, PACKET_TYPE.CMD_ACK))
+            await connection.mock_device_send(create_frame(1, PACKET_TYPE.CMD_ACK))
+
+            results = [await task.result() for task in tasks]
+            assert [result['sequence_number'] for result in results] == [1, 2]
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_keep_packet_dispatched_at_timeout(self):
+        async def _test():
+            connection = await create_connection()
+            dispatcher = get_packet_dispatcher(connection)
+
+            async def wait_for_timing_out(awaitable, timeout):
+                # The packet comes in just as the wait times out
+                dispatcher.dispatch({
+                    'packet_type': PACKET_TYPE.CMD_ACK,
+                    'sequence_number': 1,
+                    'error_list': [],
+                })
+                awaitable.cancel()
+                raise asyncio.TimeoutError()
+
+            with patch.object(waitforpacket.asyncio, 'wait_for', wait_for_timing_out):
+                task = wait_for_packet(
+                    connection=connection,
+                    sequence_number=1,
+                    packet_types=[PACKET_TYPE.CMD_ACK],
+                    version=PacketVersionMap.v3,
+                    ack_timeout=500,
+                )
+                packet = await task.result()
+
+            assert packet['sequence_number'] == 1
+            await connection.destroy()
+
+        asyncio.run(_test())
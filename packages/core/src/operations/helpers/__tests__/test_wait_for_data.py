@@ -0,0 +1,41 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from packages.core.src.operations.helpers.waitfordata import (
+    MAX_DATA_WAIT_TIME,
+    wait_for_data,
+)
+
+
+class NotifyingConnection:
+    def __init__(self):
+        self.wait_for_data = AsyncMock(return_value=False)
+
+
+class PollingConnection:
+    pass
+
+
+class TestWaitForData:
+    def test_notifying_connection(self):
+        connection = NotifyingConnection()
+        asyncio.run(wait_for_data(connection, 10))
+        connection.wait_for_data.assert_awaited_once_with(MAX_DATA_WAIT_TIME)
+
+    def test_timeout_caps_wait(self):
+        connection = NotifyingConnection()
+        asyncio.run(wait_for_data(connection, 10, timeout=5))
+        connection.wait_for_data.assert_awaited_once_with(5)
+
+        connection = NotifyingConnection()
+        asyncio.run(wait_for_data(connection, 10, timeout=-1))
+        connection.wait_for_data.assert_awaited_once_with(0)
+
+    def test_polling_connection(self):
+        with patch('packages.core.src.operations.helpers.waitfordata.asyncio.sleep') as sleep:
+            asyncio.run(wait_for_data(PollingConnection(), 10))
+            sleep.assert_awaited_once_with(0.01)
+
+            sleep.reset_mock()
+            asyncio.run(wait_for_data(PollingConnection(), 10, timeout=4))
+            sleep.assert_awaited_once_with(0.004)
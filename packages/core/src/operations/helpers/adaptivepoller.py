@@ -0,0 +1,132 @@
+import time
+from typing import Any, Callable, Dict, Optional, TypedDict
+
+from packages.util.utils.assert_utils import assert_condition
+from packages.util.utils.sleep import sleep
+from packages.core.src.utils.logger import logger
+
+DEFAULT_MIN_INTERVAL = 20
+DEFAULT_MAX_INTERVAL = 500
+DEFAULT_BACKOFF_FACTOR = 1.5
+# Number of polls at `minInterval` right after the command was sent
+DEFAULT_FAST_POLLS = 3
+
+ADAPTIVE_OPTIONS = ('minInterval', 'maxInterval', 'backoffFactor', 'fastPolls')
+
+
+class PollMetrics(TypedDict):
+    polls: int
+    status_changes: int
+    backoffs: int
+    total_wait: float
+    elapsed: float
+    last_interval: float
+
+
+class AdaptivePoller:
+    """
+    Decides how long to wait between two status polls of a command.
+
+    Polls are fast (`minInterval`) right after the command was sent, back
+    off exponentially up to `maxInterval` while the device keeps reporting
+    the same flow status for a command it is executing (i.e. it is waiting
+    on the user), and happen again immediately when the flow status
+    changes.
+
+    When only the legacy `interval` option is given, every poll waits
+    exactly `interval` milliseconds as before.
+
+    All times are in milliseconds.
+    """
+
+    def __init__(self, options: Optional[Dict[str, Any]] = None):
+        options = options or {}
+
+        self.adaptive = 'interval' not in options or any(
+            key in options for key in ADAPTIVE_OPTIONS
+        )
+
+        if self.adaptive:
+            self.min_interval = options.get('minInterval', DEFAULT_MIN_INTERVAL)
+            self.max_interval = options.get('maxInterval', DEFAULT_MAX_INTERVAL)
+            self.backoff_factor = options.get('backoffFactor', DEFAULT_BACKOFF_FACTOR)
+            self.fast_polls = options.get('fastPolls', DEFAULT_FAST_POLLS)
+        else:
+            self.min_interval = options['interval']
+            self.max_interval = options['interval']
+            self.backoff_factor = 1
+            self.fast_polls = 0
+
+        assert_condition(self.min_interval >= 0, 'Invalid minInterval')
+        assert_condition(self.max_interval >= self.min_interval, 'Invalid maxInterval')
+        assert_condition(self.backoff_factor >= 1, 'Invalid backoffFactor')
+
+        self.on_poll_metrics: Optional[Callable[[PollMetrics], None]] = options.get('onPollMetrics')
+        self.interval = self.min_interval
+        self.last_flow_status: Optional[int] = None
+        self.started_at = time.monotonic()
+        self.metrics: PollMetrics = {
+            'polls': 0,
+            'status_changes': 0,
+            'backoffs': 0,
+            'total_wait': 0,
+            'elapsed': 0,
+            'last_interval': self.interval,
+        }
+
+    def next_interval(self, flow_status: Optional[int], is_waiting: bool) -> float:
+        """
+        Record a poll which returned a status and get the time to wait
+        before the next one.
+
+        Args:
+            flow_status: Flow status reported by the device
+            is_waiting: True while the device is executing the command
+        """
+        self.metrics['polls'] += 1
+        is_changed = (
+            self.last_flow_status is not None and
+            flow_status != self.last_flow_status
+        )
+        self.last_flow_status = flow_status
+
+        if not self.adaptive:
+            delay = self.interval
+        elif is_changed:
+            self.metrics['status_changes'] += 1
+            self.interval = self.min_interval
+            delay = 0
+        elif not is_waiting:
+            self.interval = self.min_interval
+            delay = self.interval
+        elif self.metrics['polls'] <= self.fast_polls:
+            delay = self.interval
+        else:
+            self.interval = min(self.interval * self.backoff_factor, self.max_interval)
+            self.metrics['backoffs'] += 1
+            delay = self.interval
+
+        self.metrics['total_wait'] += delay
+        self.metrics['last_interval'] = delay
+        return delay
+
+    async def wait(self, flow_status: Optional[int], is_waiting: bool) -> None:
+        await sleep(self.next_interval(flow_status, is_waiting))
+
+    def finish(self) -> PollMetrics:
+        """
+        Stop measuring and report the metrics to `onPollMetrics`. Errors of
+        the callback are logged, they must not replace the result (or the
+        error) of the operation being polled.
+        """
+        self.metrics['elapsed'] = (time.monotonic() - self.started_at) * 1000
+        if self.on_poll_metrics:
+            try:
+                self.on_poll_metrics(self.metrics)
+            except Exception as error:
+                logger.error('Error in `onPollMetrics`')
+                logger.error(str(error))
+        return self.metrics
+
+
+__all__ = ['AdaptivePoller', 'PollMetrics']
@@ -5,6 +5,7 @@ from packages.util.utils.crypto import int_to_uint_byte, assert_condition
 from packages.core.src.utils.packetversion import PacketVersion, PacketVersionMap
 from packages.core.src.config import v3 as config_v3
 from packages.core.src.encoders.packet.packet import decode_payload_data, encode_packet
+from packages.core.src.utils.instrumentation import EventName, record_event, start_timer
 from .writecommand import write_command
 from .can_retry import can_retry
 
@@ -40,12 +41,14 @@ async def get_command_output(
         first_error = None
         is_success = False
 
+        started = start_timer()
         packets_list = encode_packet(
             raw_data=int_to_uint_byte(current_packet, 16),
             version=version,
             sequence_number=sequence_number,
             packet_type=usable_config.commands.PACKET_TYPE.CMD_OUTPUT
         )
+        record_event(EventName.ENCODE, connection, started)
 
         if len(packets_list) > 1:
             raise Exception('Get Command Output exceeded 1 packet limit')
@@ -53,6 +56,7 @@ async def get_command_output(
         packet = packets_list[0]
 
         while tries <= inner_max_tries and not is_success:
+            started = start_timer()
             try:
                 received_packet = await write_command(
                     connection=connection,
@@ -85,6 +89,13 @@ async def get_command_output(
                 if not first_error:
                     first_error = e
 
+                if tries < inner_max_tries:
+                    record_event(EventName.RETRY, connection, started, {
+                        'operation': 'get_command_output',
+                        'tries': tries,
+                        'error': type(e).__name__,
+                    })
+
             tries += 1
 
         if not is_success and first_error:
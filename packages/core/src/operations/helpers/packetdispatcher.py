@@ -0,0 +1,201 @@
+import asyncio
+import time
+import weakref
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from packages.interfaces import IDeviceConnection
+from packages.interfaces.errors import DeviceConnectionError, DeviceConnectionErrorType
+from packages.util.utils.assert_utils import assert_condition
+from packages.core.src.config import v3 as config_v3
+from packages.core.src.encoders.packet.packet import DecodedPacketData
+from packages.core.src.encoders.packet.reassembler import get_frame_reassembler
+from packages.core.src.utils.logger import logger
+from .waitfordata import wait_for_data
+
+DEFAULT_BACKLOG_SIZE = 32
+
+
+class PacketWaiter:
+    """
+    A registered interest in the next packet of one of `packet_types` with
+    `sequence_number`. Status packets match any sequence number and error
+    packets match any waiter with the same sequence number.
+    """
+
+    def __init__(self, sequence_number: int, packet_types: List[int]):
+        self.sequence_number = sequence_number
+        self.packet_types = packet_types
+        self.future: 'asyncio.Future[DecodedPacketData]' = (
+            asyncio.get_running_loop().create_future()
+        )
+
+    def matches(self, packet: DecodedPacketData) -> bool:
+        packet_type = packet['packet_type']
+        commands = config_v3.commands
+
+        if packet_type == commands.PACKET_TYPE.ERROR:
+            return packet['sequence_number'] == self.sequence_number
+
+        if packet_type not in self.packet_types:
+            return False
+
+        return (
+            packet['sequence_number'] == self.sequence_number or
+            packet_type == commands.PACKET_TYPE.STATUS
+        )
+
+
+class PacketDispatcher:
+    """
+    Reads the frames of a connection once and routes each of them to the
+    waiter it belongs to, so that several operations can wait on the same
+    connection without dropping each other's packets.
+
+    The connection is only read while someone is waiting, operations that
+    read the connection directly (legacy, bootloader) are not affected.
+    Frames no one is waiting for are kept in a backlog of `backlog_size`
+    frames for at most `backlog_time` milliseconds, except status frames
+    which match any sequence number and would be stale by the time they
+    are claimed. An error frame that matches no waiter is given to the
+    oldest waiter instead, as before.
+    """
+
+    def __init__(
+        self,
+        connection: IDeviceConnection,
+        backlog_size: int = DEFAULT_BACKLOG_SIZE,
+        backlog_time: Optional[int] = None,
+    ):
+        assert_condition(backlog_size > 0, 'Invalid backlogSize')
+
+        # The dispatcher is stored against the connection, it must not keep
+        # the connection alive
+        self._connection = weakref.ref(connection)
+        self.backlog_time = (
+            backlog_time if backlog_time is not None else config_v3.constants.ACK_TIME
+        )
+        self.reassembler = get_frame_reassembler(connection)
+        self.waiters: List[PacketWaiter] = []
+        self.backlog: Deque[Tuple[float, DecodedPacketData]] = deque(maxlen=backlog_size)
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, sequence_number: int, packet_types: List[int]) -> PacketWaiter:
+        """
+        Wait for a packet. The waiter is resolved with a matching frame from
+        the backlog right away if there is one.
+        """
+        waiter = PacketWaiter(sequence_number, packet_types)
+
+        packet = self._take_from_backlog(waiter)
+        if packet is not None:
+            waiter.future.set_result(packet)
+            return waiter
+
+        self.waiters.append(waiter)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return waiter
+
+    def unregister(self, waiter: PacketWaiter) -> None:
+        if waiter in self.waiters:
+            self.waiters.remove(waiter)
+        if not waiter.future.done():
+            waiter.future.cancel()
+        elif not waiter.future.cancelled():
+            # The waiter may have failed after it stopped waiting (connection
+            # closed while its wait was being cancelled)
+            waiter.future.exception()
+
+    def dispatch(self, packet: DecodedPacketData) -> bool:
+        """
+        Give a decoded frame to the first waiter it matches.
+
+        Returns:
+            bool: False if no one was waiting for it, it went to the backlog
+                or was dropped
+        """
+        if len(packet['error_list']) > 0:
+            return False
+
+        self.waiters = [w for w in self.waiters if not w.future.done()]
+        waiter = next((w for w in self.waiters if w.matches(packet)), None)
+        if (
+            waiter is None and
+            packet['packet_type'] == config_v3.commands.PACKET_TYPE.ERROR and
+            self.waiters
+        ):
+            waiter = self.waiters[0]
+
+        if waiter is None:
+            if packet['packet_type'] != config_v3.commands.PACKET_TYPE.STATUS:
+                self.backlog.append((time.monotonic(), packet))
+            return False
+
+        self.waiters.remove(waiter)
+        waiter.future.set_result(packet)
+        return True
+
+    def _take_from_backlog(self, waiter: PacketWaiter) -> Optional[DecodedPacketData]:
+        oldest = time.monotonic() - self.backlog_time / 1000
+        while self.backlog and self.backlog[0][0] < oldest:
+            self.backlog.popleft()
+
+        for index, (_, packet) in enumerate(self.backlog):
+            if waiter.matches(packet):
+                del self.backlog[index]
+                return packet
+        return None
+
+    def _fail_all(self, error: Exception) -> None:
+        waiters = self.waiters
+        self.waiters = []
+        for waiter in waiters:
+            if not waiter.future.done():
+                waiter.future.set_exception(error)
+
+    async def _run(self) -> None:
+        recheck_time = config_v3.constants.RECHECK_TIME
+
+        while self.waiters:
+            connection = self._connection()
+            try:
+                if connection is None or not await connection.is_connected():
+                    self._fail_all(DeviceConnectionError(
+                        DeviceConnectionErrorType.CONNECTION_CLOSED
+                    ))
+                    return
+
+                raw_packet = await connection.receive()
+                if not raw_packet:
+                    await wait_for_data(connection, recheck_time)
+                    continue
+
+                for packet in self.reassembler.feed(raw_packet):
+                    self.dispatch(packet)
+            except Exception as error:
+                if hasattr(error, 'code') and error.code in [e.value for e in DeviceConnectionErrorType]:
+                    self._fail_all(error)
+                    return
+
+                logger.error('Error while receiving packets on `PacketDispatcher`')
+                logger.error(str(error))
+                await asyncio.sleep(recheck_time / 1000)
+
+
+_dispatchers: 'weakref.WeakKeyDictionary[object, PacketDispatcher]' = weakref.WeakKeyDictionary()
+
+
+def get_packet_dispatcher(connection: IDeviceConnection) -> PacketDispatcher:
+    """
+    Returns the dispatcher attached to the connection, creating it on first
+    use.
+    """
+    dispatcher = _dispatchers.get(connection)
+    if dispatcher is None:
+        dispatcher = PacketDispatcher(connection)
+        _dispatchers[connection] = dispatcher
+    return dispatcher
+
+
+__all__ = ['PacketDispatcher', 'PacketWaiter', 'get_packet_dispatcher']
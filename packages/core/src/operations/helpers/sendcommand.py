@@ -4,7 +4,14 @@ from packages.interfaces import IDeviceConnection
 from packages.util.utils.assert_utils import assert_condition
 from packages.core.src.config import v3 as config_v3
 from packages.core.src.utils.packetversion import PacketVersion, PacketVersionMap
-from packages.core.src.encoders.packet.packet import encode_packet
+from packages.core.src.encoders.packet.packet import iter_encode_packet
+from packages.core.src.utils.instrumentation import (
+    EventName,
+    get_instrumentation,
+    record_event,
+    start_timer,
+    timed_iter,
+)
 from .writecommand import write_command
 from .can_retry import can_retry
 
@@ -30,13 +37,15 @@ async def send_command(
 
     usable_config = config_v3
 
-    packets_list = encode_packet(
+    packets_list = iter_encode_packet(
         raw_data=raw_data or '',
         proto_data=proto_data or '',
         version=version,
         sequence_number=sequence_number,
         packet_type=usable_config.commands.PACKET_TYPE.CMD
     )
+    if get_instrumentation() is not None:
+        packets_list = timed_iter(EventName.ENCODE, connection, packets_list)
 
     first_error: Optional[Exception] = None
 
@@ -47,6 +56,7 @@ async def send_command(
         is_success = False
 
         while tries <= inner_max_tries and not is_success:
+            started = start_timer()
             try:
                 await write_command(
                     connection=connection,
@@ -65,6 +75,13 @@ async def send_command(
                 if not first_error:
                     first_error = e
 
+                if tries < inner_max_tries:
+                    record_event(EventName.RETRY, connection, started, {
+                        'operation': 'send_command',
+                        'tries': tries,
+                        'error': type(e).__name__,
+                    })
+
             tries += 1
 
         if not is_success and first_error:
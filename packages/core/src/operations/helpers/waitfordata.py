@@ -0,0 +1,40 @@
+import asyncio
+from typing import Optional
+
+from packages.interfaces import IDeviceConnection
+
+# How long a single wait on a connection that notifies its waiters lasts
+# when no data arrives. Data ends the wait early, so this is longer than the
+# recheck time, callers still get to recheck the connection state (closed
+# connection, cancelled operation) at least this often.
+MAX_DATA_WAIT_TIME = 100
+
+
+async def wait_for_data(
+    connection: IDeviceConnection,
+    recheck_time: float,
+    timeout: Optional[float] = None,
+) -> None:
+    """
+    Wait until the connection has data to receive.
+
+    Connections notify their waiters as soon as data arrives, the wait
+    lasts at most `max(recheck_time, MAX_DATA_WAIT_TIME)` milliseconds. For
+    connections that do not implement `wait_for_data` this falls back to
+    sleeping for `recheck_time` milliseconds. In both cases the wait never
+    exceeds `timeout` milliseconds when given, e.g. the time left before
+    the caller's deadline.
+    """
+    wait_time = max(recheck_time, MAX_DATA_WAIT_TIME)
+    sleep_time = recheck_time
+    if timeout is not None:
+        wait_time = min(wait_time, max(timeout, 0))
+        sleep_time = min(sleep_time, max(timeout, 0))
+
+    wait = getattr(connection, 'wait_for_data', None)
+    if wait is not None:
+        result = await wait(wait_time)
+        if result is not None:
+            return
+
+    await asyncio.sleep(sleep_time / 1000)
@@ -12,6 +12,7 @@ from packages.interfaces import IDeviceConnection
 from packages.util.utils.assert_utils import assert_condition
 from packages.core.src.utils.packetversion import PacketVersion, PacketVersionMap
 from packages.core.src.encoders.packet.packet import DecodedPacketData
+from packages.core.src.utils.instrumentation import EventName, get_instrumentation, timed
 from .waitforpacket import wait_for_packet
 
 
@@ -54,7 +55,10 @@ async def write_command(
     )
 
     try:
-        send_task = asyncio.create_task(connection.send(packet))
+        sending = connection.send(packet)
+        if get_instrumentation() is not None:
+            sending = timed(EventName.SEND, connection, sending, {'size': len(packet)})
+        send_task = asyncio.create_task(sending)
 
         done, pending = await asyncio.wait(
             [send_task, ack_promise.task],
@@ -13,6 +13,7 @@ from packages.util.utils.assert_utils import assert_condition
 from packages.core.src.utils.packetversion import PacketVersion, PacketVersionMap
 from packages.core.src.encoders.packet.legacy import xmodem_decode, LegacyDecodedPacketData
 from packages.core.src.config import v1 as config_v1
+from packages.core.src.operations.helpers.waitfordata import wait_for_data
 
 DEFAULT_RECEIVE_TIMEOUT = 15000
 
@@ -70,7 +71,7 @@ async def receive_data(
 
                 data = await connection.receive()
                 if not data:
-                    await asyncio.sleep(config_v1.constants.RECHECK_TIME / 1000)
+                    await wait_for_data(connection, config_v1.constants.RECHECK_TIME)
                     continue
 
                 packet_list = xmodem_decode(data, version)
@@ -78,7 +79,7 @@ async def receive_data(
                     if process_packet(packet):
                         return
 
-                await asyncio.sleep(config_v1.constants.RECHECK_TIME / 1000)
+                await wait_for_data(connection, config_v1.constants.RECHECK_TIME)
 
         except Exception as error:
             if not future.done():
@@ -1,4 +1,4 @@
-from .getstatus import get_status
+from .getstatus import get_status, get_last_status
 from .getresult import get_result
 from .sendquery import send_query
 from .waitForResult import wait_for_result
@@ -7,6 +7,7 @@ from .waitforidle import wait_for_idle
 
 __all__ = [
     "get_status",
+    "get_last_status",
     "get_result", 
     "send_query",
     "wait_for_result",
@@ -1,18 +1,61 @@
-from typing import Optional
+import asyncio
+import time
+import weakref
+from typing import Optional, Tuple
 from packages.interfaces import IDeviceConnection
 from packages.util.utils.crypto import hex_to_uint8array
 from packages.core.src.utils.logger import logger
 from packages.core.src.utils.packetversion import PacketVersion
+from packages.core.src.config import v3 as config
 from packages.core.src.operations.helpers.getstatus import get_status as get_status_helper
 from packages.core.src.encoders.proto.generated.core import Status
 
+_last_status: 'weakref.WeakKeyDictionary[object, Tuple[float, Status]]' = weakref.WeakKeyDictionary()
+_in_flight: 'weakref.WeakKeyDictionary[object, asyncio.Task]' = weakref.WeakKeyDictionary()
 
-async def get_status(
+
+def get_last_status(
+    connection: IDeviceConnection,
+    max_age: Optional[int] = None,
+) -> Optional[Status]:
+    """
+    Returns the last status received on the connection if it is not older
+    than `max_age` milliseconds (any age if not given).
+    """
+    try:
+        entry = _last_status.get(connection)
+    except TypeError:
+        return None
+
+    if entry is None:
+        return None
+
+    received_at, status = entry
+    if max_age is not None and (time.monotonic() - received_at) * 1000 > max_age:
+        return None
+    return status
+
+
+def set_last_status(connection: IDeviceConnection, status: Status) -> None:
+    try:
+        _last_status[connection] = (time.monotonic(), status)
+    except TypeError:
+        # Connection can not be weakly referenced
+        pass
+
+
+def clear_last_status(connection: IDeviceConnection) -> None:
+    try:
+        _last_status.pop(connection, None)
+    except TypeError:
+        pass
+
+
+async def _fetch_status(
     connection: IDeviceConnection,
     version: PacketVersion,
-    max_tries: int = 5,
-    timeout: Optional[int] = None,
-    dont_log: bool = False,
+    max_tries: int,
+    timeout: Optional[int],
 ) -> Status:
     result = await get_status_helper(
         connection=connection,
@@ -20,11 +63,72 @@ async def get_status(
         max_tries=max_tries,
         timeout=timeout,
     )
-    
+
     protobuf_data = result["protobuf_data"]
     status = Status.parse(hex_to_uint8array(protobuf_data))
-    
+    set_last_status(connection, status)
+
+    return status
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # The callers that were waiting for it may have been cancelled
+    if not task.cancelled():
+        task.exception()
+
+
+async def _fetch_shared_status(
+    connection: IDeviceConnection,
+    version: PacketVersion,
+    max_tries: int,
+    timeout: Optional[int],
+) -> Status:
+    try:
+        task = _in_flight.get(connection)
+    except TypeError:
+        # Connection can not be weakly referenced, nothing to share
+        return await _fetch_status(connection, version, max_tries, timeout)
+
+    if task is None or task.done():
+        task = asyncio.ensure_future(
+            _fetch_status(connection, version, max_tries, timeout)
+        )
+        task.add_done_callback(_retrieve_exception)
+        _in_flight[connection] = task
+
+    try:
+        # A cancelled caller must not cancel the request of the others
+        return await asyncio.shield(task)
+    finally:
+        if task.done() and _in_flight.get(connection) is task:
+            del _in_flight[connection]
+
+
+async def get_status(
+    connection: IDeviceConnection,
+    version: PacketVersion,
+    max_tries: int = 5,
+    timeout: Optional[int] = None,
+    dont_log: bool = False,
+    max_age: Optional[int] = None,
+) -> Status:
+    """
+    Request the status of the device.
+
+    Concurrent calls on the same connection share one request, the options
+    of the first call are used for it. A status received within the last
+    `max_age` milliseconds (`STATUS_CACHE_TIME` by default, 0 to always
+    request a new one) is returned without a request.
+    """
+    if max_age is None:
+        max_age = config.constants.STATUS_CACHE_TIME
+
+    status = get_last_status(connection, max_age) if max_age > 0 else None
+
+    if status is None:
+        status = await _fetch_shared_status(connection, version, max_tries, timeout)
+
     if not dont_log:
         logger.debug('Received status', status)
-    
+
     return status
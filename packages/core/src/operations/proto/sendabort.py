@@ -10,6 +10,7 @@ from packages.core.src.encoders.proto.generated.core import Status
 from packages.core.src.operations.helpers.writecommand import write_command
 from packages.core.src.operations.helpers.can_retry import can_retry
 from packages.core.src.utils.logger import logger
+from .getstatus import set_last_status
 from .waitforidle import wait_for_idle
 
 
@@ -88,6 +89,8 @@ async def send_abort(
     if not status:
         raise Exception('Did not found status')
 
+    # The status cached before the abort shows the aborted command
+    set_last_status(connection, status)
     await wait_for_idle(connection=connection, version=version)
 
     return status
@@ -6,6 +6,7 @@ from packages.core.src.utils.logger import logger
 from packages.core.src.utils.packetversion import PacketVersion
 from packages.core.src.encoders.proto.generated.core import Msg, Command
 from packages.core.src.operations.helpers.sendcommand import send_command as send_command_helper
+from .getstatus import clear_last_status
 
 
 async def send_query(
@@ -30,6 +31,9 @@ async def send_query(
         bytes(Msg(cmd=Command(applet_id=applet_id)))
     )
 
+    # The device is busy with this query from now on
+    clear_last_status(connection)
+
     return await send_command_helper(
         connection=connection,
         proto_data=msg_data,
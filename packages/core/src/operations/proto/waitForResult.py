@@ -4,10 +4,11 @@ from packages.interfaces.errors.app_error import DeviceAppError, DeviceAppErrorT
 from packages.interfaces.errors.compatibility_error import DeviceCompatibilityError, DeviceCompatibilityErrorType
 from packages.util.utils.assert_utils import assert_condition
 from packages.util.utils.crypto import uint8array_to_hex
-from packages.util.utils.sleep import sleep
 from packages.core.src.utils.logger import logger
 from packages.core.src.utils.packetversion import PacketVersion, PacketVersionMap
 from packages.core.src.encoders.proto.generated.core import CmdState, DeviceIdleState, Status
+from packages.core.src.operations.helpers.adaptivepoller import AdaptivePoller
+from packages.core.src.utils.instrumentation import EventName, record_event, start_timer
 from .getresult import get_result
 
 
@@ -52,46 +53,59 @@ async def wait_for_result(
             DeviceCompatibilityErrorType.INVALID_SDK_OPERATION
         )
 
-    while True:
-        response = await get_result(
-            connection=connection,
-            version=version,
-            applet_id=applet_id,
-            max_tries=options.get('maxTries', 5) if options else 5,
-            sequence_number=sequence_number,
-            timeout=options.get('timeout') if options else None,
-            allow_core_data=allow_core_data,
-        )
+    poller = AdaptivePoller(options)
 
-        if not response['is_status']:
-            resp = response['result']
+    try:
+        while True:
+            started = start_timer()
+            response = await get_result(
+                connection=connection,
+                version=version,
+                applet_id=applet_id,
+                max_tries=options.get('maxTries', 5) if options else 5,
+                sequence_number=sequence_number,
+                timeout=options.get('timeout') if options else None,
+                allow_core_data=allow_core_data,
+            )
 
-            logger.debug('Received result', {
-                'result': uint8array_to_hex(resp),
-                'appletId': applet_id,
-            })
+            if not response['is_status']:
+                resp = response['result']
 
-            return resp
+                logger.debug('Received result', {
+                    'result': uint8array_to_hex(resp),
+                    'appletId': applet_id,
+                })
 
-        status = response['result']
+                return resp
 
-        if (
-            status.device_idle_state == DeviceIdleState.DEVICE_IDLE_STATE_DEVICE or
-            status.current_cmd_seq != sequence_number
-        ):
-            raise DeviceAppError(DeviceAppErrorType.EXECUTING_OTHER_COMMAND)
+            status = response['result']
 
-        if status.cmd_state in [
-            CmdState.CMD_STATE_DONE,
-            CmdState.CMD_STATE_FAILED,
-            CmdState.CMD_STATE_INVALID_CMD,
-        ]:
-            raise Exception(
-                'Command status is done or rejected, but no output is received'
-            )
+            if (
+                status.device_idle_state == DeviceIdleState.DEVICE_IDLE_STATE_DEVICE or
+                status.current_cmd_seq != sequence_number
+            ):
+                raise DeviceAppError(DeviceAppErrorType.EXECUTING_OTHER_COMMAND)
 
-        if status.device_idle_state == DeviceIdleState.DEVICE_IDLE_STATE_USB:
-            if on_status:
-                on_status(status)
+            if status.cmd_state in [
+                CmdState.CMD_STATE_DONE,
+                CmdState.CMD_STATE_FAILED,
+                CmdState.CMD_STATE_INVALID_CMD,
+            ]:
+                raise Exception(
+                    'Command status is done or rejected, but no output is received'
+                )
 
-        await sleep(options.get('interval', 200) if options else 200)
+            if status.device_idle_state == DeviceIdleState.DEVICE_IDLE_STATE_USB:
+                if on_status:
+                    on_status(status)
+
+            await poller.wait(
+                status.flow_status,
+                status.cmd_state == CmdState.CMD_STATE_EXECUTING,
+            )
+            record_event(EventName.POLL, connection, started, {
+                'flow_status': status.flow_status,
+                'interval': poller.metrics['last_interval'],
+            }, applet_id=applet_id)
+    finally:
+        poller.finish()
@@ -3,9 +3,9 @@ from packages.interfaces import IDeviceConnection
 from packages.interfaces.errors.app_error import DeviceAppError, DeviceAppErrorType
 from packages.interfaces.errors.compatibility_error import DeviceCompatibilityError, DeviceCompatibilityErrorType
 from packages.util.utils.assert_utils import assert_condition
-from packages.util.utils.sleep import sleep
 from packages.core.src.utils.packetversion import PacketVersion, PacketVersionMap
 from packages.core.src.encoders.raw import CmdState, DeviceIdleState, RawData, StatusData
+from packages.core.src.operations.helpers.adaptivepoller import AdaptivePoller
 from .get_command_output import get_command_output
 
 
@@ -26,34 +26,42 @@ async def wait_for_command_output(
     if version != PacketVersionMap.v3:
         raise DeviceCompatibilityError(DeviceCompatibilityErrorType.INVALID_SDK_OPERATION)
 
-    while True:
-        response = await get_command_output(
-            connection=connection,
-            version=version,
-            max_tries=options.get('maxTries', 5) if options else 5,
-            sequence_number=sequence_number,
-            timeout=options.get('timeout') if options else None,
-        )
+    poller = AdaptivePoller(options)
 
-        if response.get('isRawData'):
-            resp = response
-            if (
-                expected_command_types and
-                resp['commandType'] not in expected_command_types
-            ):
-                raise DeviceAppError(DeviceAppErrorType.INVALID_MSG_FROM_DEVICE)
-            return resp
+    try:
+        while True:
+            response = await get_command_output(
+                connection=connection,
+                version=version,
+                max_tries=options.get('maxTries', 5) if options else 5,
+                sequence_number=sequence_number,
+                timeout=options.get('timeout') if options else None,
+            )
 
-        status = response
-        if status['currentCmdSeq'] != sequence_number:
-            raise DeviceAppError(DeviceAppErrorType.EXECUTING_OTHER_COMMAND)
-        if status['cmdState'] in [
-            CmdState.CMD_STATE_DONE,
-            CmdState.CMD_STATE_FAILED,
-            CmdState.CMD_STATE_INVALID_CMD,
-        ]:
-            raise Exception('Command status is done or rejected, but no output is received')
-        if status['deviceIdleState'] == DeviceIdleState.USB:
-            if on_status:
-                on_status(status)
-        await sleep(options.get('interval', 200) if options else 200)
+            if response.get('isRawData'):
+                resp = response
+                if (
+                    expected_command_types and
+                    resp['commandType'] not in expected_command_types
+                ):
+                    raise DeviceAppError(DeviceAppErrorType.INVALID_MSG_FROM_DEVICE)
+                return resp
+
+            status = response
+            if status['currentCmdSeq'] != sequence_number:
+                raise DeviceAppError(DeviceAppErrorType.EXECUTING_OTHER_COMMAND)
+            if status['cmdState'] in [
+                CmdState.CMD_STATE_DONE,
+                CmdState.CMD_STATE_FAILED,
+                CmdState.CMD_STATE_INVALID_CMD,
+            ]:
+                raise Exception('Command status is done or rejected, but no output is received')
+            if status['deviceIdleState'] == DeviceIdleState.USB:
+                if on_status:
+                    on_status(status)
+            await poller.wait(
+                status.get('flowStatus'),
+                status['cmdState'] == CmdState.CMD_STATE_EXECUTING,
+            )
+    finally:
+        poller.finish()
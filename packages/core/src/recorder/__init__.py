@@ -0,0 +1,25 @@
+from .format import (
+    RecordEntry,
+    RecordType,
+    Recording,
+    RecordingMetadata,
+    RecordingWriter,
+    parse_recording,
+    read_recording,
+)
+from .recording import RecordingDeviceConnection
+from .replay import ReplayDeviceConnection, ReplayOptions, ReplayStats
+
+__all__ = [
+    'RecordEntry',
+    'RecordType',
+    'Recording',
+    'RecordingDeviceConnection',
+    'RecordingMetadata',
+    'RecordingWriter',
+    'ReplayDeviceConnection',
+    'ReplayOptions',
+    'ReplayStats',
+    'parse_recording',
+    'read_recording',
+]
@@ -0,0 +1,169 @@
+import json
+import time
+from enum import IntEnum
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, TypedDict
+
+from packages.util.utils.assert_utils import assert_condition
+
+MAGIC = b'CYREC'
+FORMAT_VERSION = 1
+
+
+class RecordType(IntEnum):
+    # Data written by the sdk
+    SEND = 1
+    # Data read by the sdk
+    RECEIVE = 2
+    # `before_operation`
+    OPEN = 3
+    # `after_operation`
+    CLOSE = 4
+    # Result of `get_new_sequence_number`, 2 bytes big endian
+    SEQUENCE_NUMBER = 5
+
+
+class RecordingMetadata(TypedDict):
+    connection_type: str
+    # Value of the `DeviceState`
+    device_state: int
+    sequence_number: int
+    # Unix time in seconds
+    recorded_at: float
+    # Free form information given by the user
+    extra: Dict[str, Any]
+
+
+class RecordEntry(TypedDict):
+    type: RecordType
+    # Seconds since the start of the recording, monotonic
+    timestamp: float
+    data: bytes
+
+
+class Recording(TypedDict):
+    metadata: RecordingMetadata
+    records: List[RecordEntry]
+
+
+def _encode_varint(value: int) -> bytes:
+    result = bytearray()
+    while value > 0x7f:
+        result.append((value & 0x7f) | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+
+def _decode_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        assert_condition(offset < len(data), 'Truncated recording')
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+class RecordingWriter:
+    """
+    Writes a recording to a binary stream.
+
+    The stream starts with `MAGIC`, the format version (1 byte) and the
+    metadata as a length prefixed JSON document. Every record follows as
+    its type (1 byte), the time elapsed since the previous record in
+    microseconds, the data length and the data, the numbers as unsigned
+    LEB128 varints. Timestamps come from a monotonic clock.
+    """
+
+    def __init__(self, stream: BinaryIO, metadata: RecordingMetadata):
+        self.stream = stream
+        self.started_at = time.monotonic()
+        self._last_timestamp = 0
+
+        header = json.dumps(metadata).encode()
+        self.stream.write(
+            MAGIC + bytes((FORMAT_VERSION,)) + _encode_varint(len(header)) + header
+        )
+
+    def write(self, record_type: RecordType, data: bytes = b'') -> None:
+        timestamp = int((time.monotonic() - self.started_at) * 1_000_000)
+        delta = max(timestamp - self._last_timestamp, 0)
+        self._last_timestamp += delta
+
+        self.stream.write(
+            bytes((record_type,)) + _encode_varint(delta) + _encode_varint(len(data)) + data
+        )
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.stream.close()
+
+
+def parse_recording(data: bytes) -> Recording:
+    assert_condition(data[:len(MAGIC)] == MAGIC, 'Invalid recording')
+    offset = len(MAGIC)
+
+    assert_condition(len(data) > offset, 'Truncated recording')
+    version = data[offset]
+    assert_condition(version == FORMAT_VERSION, f'Unsupported recording version: {version}')
+    offset += 1
+
+    header_length, offset = _decode_varint(data, offset)
+    assert_condition(offset + header_length <= len(data), 'Truncated recording')
+    metadata: RecordingMetadata = json.loads(data[offset:offset + header_length])
+    offset += header_length
+
+    records: List[RecordEntry] = []
+    timestamp = 0
+    while offset < len(data):
+        record_type = RecordType(data[offset])
+        delta, offset = _decode_varint(data, offset + 1)
+        length, offset = _decode_varint(data, offset)
+        assert_condition(offset + length <= len(data), 'Truncated recording')
+
+        timestamp += delta
+        records.append(RecordEntry(
+            type=record_type,
+            timestamp=timestamp / 1_000_000,
+            data=data[offset:offset + length],
+        ))
+        offset += length
+
+    return Recording(metadata=metadata, records=records)
+
+
+def read_recording(path: str) -> Recording:
+    with open(path, 'rb') as file:
+        return parse_recording(file.read())
+
+
+def create_metadata(
+    connection_type: str,
+    device_state: int,
+    sequence_number: int,
+    extra: Optional[Dict[str, Any]] = None,
+) -> RecordingMetadata:
+    return RecordingMetadata(
+        connection_type=connection_type,
+        device_state=device_state,
+        sequence_number=sequence_number,
+        recorded_at=time.time(),
+        extra=extra or {},
+    )
+
+
+__all__ = [
+    'RecordEntry',
+    'RecordType',
+    'Recording',
+    'RecordingMetadata',
+    'RecordingWriter',
+    'create_metadata',
+    'parse_recording',
+    'read_recording',
+]
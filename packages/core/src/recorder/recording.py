@@ -0,0 +1,124 @@
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from packages.interfaces import IDeviceConnection
+from packages.interfaces.connection import DeviceState, PoolData
+from packages.util.utils.assert_utils import assert_condition
+from .format import RecordType, RecordingWriter, create_metadata
+
+
+class RecordingDeviceConnection:
+    """
+    `IDeviceConnection` wrapper recording the traffic of the wrapped
+    connection to a file, to be replayed with `ReplayDeviceConnection`.
+
+    Records the data sent and read by the sdk, the connection being opened
+    and closed and the sequence numbers handed out, with their time.
+    The wrapper does not expose the identity of the device, so the probe
+    cache is not used and the handshake is always part of the recording.
+
+    Example:
+        connection = await RecordingDeviceConnection.create(
+            await DeviceConnection.create(), 'get_logs.rec'
+        )
+        app = await ManagerApp.create(connection)
+        await app.get_logs()
+        await app.destroy()
+    """
+
+    def __init__(self, connection: IDeviceConnection, writer: RecordingWriter):
+        assert_condition(connection, 'Invalid connection')
+
+        self.connection = connection
+        self.writer = writer
+        self.is_recording = True
+        # Ids of the chunks already recorded by `peek` and not read yet
+        self._peeked_ids: Deque[int] = deque()
+        self._last_peeked_id = -1
+
+    @classmethod
+    async def create(
+        cls,
+        connection: IDeviceConnection,
+        path: str,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> 'RecordingDeviceConnection':
+        metadata = create_metadata(
+            connection_type=await connection.get_connection_type(),
+            device_state=(await connection.get_device_state()).value,
+            sequence_number=await connection.get_sequence_number(),
+            extra=extra,
+        )
+        return cls(connection, RecordingWriter(open(path, 'wb'), metadata))
+
+    def _record(self, record_type: RecordType, data: bytes = b'') -> None:
+        if self.is_recording:
+            self.writer.write(record_type, data)
+
+    def stop_recording(self) -> None:
+        if self.is_recording:
+            self.is_recording = False
+            self.writer.close()
+
+    async def get_connection_type(self) -> str:
+        return await self.connection.get_connection_type()
+
+    async def is_connected(self) -> bool:
+        return await self.connection.is_connected()
+
+    async def before_operation(self) -> None:
+        await self.connection.before_operation()
+        self._record(RecordType.OPEN)
+
+    async def after_operation(self) -> None:
+        await self.connection.after_operation()
+        self._record(RecordType.CLOSE)
+        if self.is_recording:
+            self.writer.flush()
+
+    async def get_sequence_number(self) -> int:
+        return await self.connection.get_sequence_number()
+
+    async def get_new_sequence_number(self) -> int:
+        sequence_number = await self.connection.get_new_sequence_number()
+        self._record(RecordType.SEQUENCE_NUMBER, sequence_number.to_bytes(2, 'big'))
+        return sequence_number
+
+    async def get_device_state(self) -> DeviceState:
+        return await self.connection.get_device_state()
+
+    async def destroy(self) -> None:
+        await self.connection.destroy()
+        self.stop_recording()
+
+    async def send(self, data: bytes) -> None:
+        self._record(RecordType.SEND, bytes(data))
+        await self.connection.send(data)
+
+    async def receive(self) -> Optional[bytes]:
+        data = await self.connection.receive()
+        if data:
+            if self._peeked_ids:
+                self._peeked_ids.popleft()
+            else:
+                self._record(RecordType.RECEIVE, bytes(data))
+        return data
+
+    async def peek(self) -> List[PoolData]:
+        pool = await self.connection.peek()
+        for item in pool:
+            if item['id'] > self._last_peeked_id:
+                self._last_peeked_id = item['id']
+                self._peeked_ids.append(item['id'])
+                self._record(RecordType.RECEIVE, bytes(item['data']))
+        return pool
+
+    async def wait_for_data(self, timeout: Optional[int] = None) -> Optional[bool]:
+        wait = getattr(self.connection, 'wait_for_data', None)
+        if wait is None:
+            # Callers fall back to polling
+            return None
+        return await wait(timeout)
+
+
+__all__ = ['RecordingDeviceConnection']
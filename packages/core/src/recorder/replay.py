@@ -0,0 +1,270 @@
+import asyncio
+from typing import List, Optional, Set, Tuple, TypedDict, Union
+
+from packages.interfaces.connection import DeviceState, PoolData
+from packages.interfaces.errors.communication_error import (
+    DeviceCommunicationError,
+    DeviceCommunicationErrorType,
+)
+from packages.interfaces.errors.connection_error import (
+    DeviceConnectionError,
+    DeviceConnectionErrorType,
+)
+from packages.util.utils.assert_utils import assert_condition
+from packages.util.utils.receive_pool import ReceivePool
+from packages.core.src.encoders.packet.packet import (
+    V3_START_OF_FRAME,
+    decode_frame,
+    get_frame_length,
+)
+from .format import RecordType, Recording, read_recording
+
+
+class ReplayOptions(TypedDict, total=False):
+    # Playback speed relative to the recording, 0 replays as fast as possible
+    speed: float
+    # Fail sends that do not match the recording instead of counting them
+    strict: bool
+
+
+class ReplayStats(TypedDict):
+    sends: int
+    # Sends whose data differ from the recording
+    mismatched_sends: int
+    # Sends after the end of the recording
+    unexpected_sends: int
+    received_chunks: int
+
+
+def get_send_key(data: bytes) -> Union[bytes, Tuple[Tuple[int, int, int, int, bytes], ...]]:
+    """
+    What the data sent is compared on. The header of v3 frames holds the
+    time they were encoded at, which is also covered by their crc, so v3
+    frames are compared on their packet numbers, sequence number, packet
+    type and payload. Any other data (legacy, bootloader) is compared as is.
+    """
+    frames = []
+    offset = 0
+    while offset < len(data):
+        if not data.startswith(V3_START_OF_FRAME, offset):
+            return data
+
+        frame_length = get_frame_length(data, offset)
+        if frame_length is None or offset + frame_length > len(data):
+            return data
+
+        frame = decode_frame(data, offset)
+        if frame['error_list']:
+            return data
+
+        frames.append((
+            frame['current_packet_number'],
+            frame['total_packet_number'],
+            frame['sequence_number'],
+            frame['packet_type'],
+            frame['payload_data'],
+        ))
+        offset += frame_length
+
+    return tuple(frames) if frames else data
+
+
+class ReplayDeviceConnection:
+    """
+    `IDeviceConnection` playing back a recording made with
+    `RecordingDeviceConnection`, to run the sdk against a real session
+    without a device.
+
+    The replay follows the sdk: every send, sequence number, open and
+    close of the connection moves the replay forward to the matching
+    record, and the data read after that record in the recording is
+    delivered with its original delay divided by `speed`. With a speed of
+    0 the data is delivered right away. Delays are measured up to the time
+    the sdk read the data, so they include the sdk time of the recorded
+    session.
+
+    Sends are not checked against the recording unless `strict` is set,
+    they are counted in `stats`. v3 frames are compared without their
+    timestamp and crc (see `get_send_key`).
+    """
+
+    def __init__(self, recording: Recording, options: Optional[ReplayOptions] = None):
+        self.options: ReplayOptions = {'speed': 1.0, 'strict': False, **(options or {})}
+        assert_condition(self.options['speed'] >= 0, 'Invalid speed')
+
+        metadata = recording['metadata']
+        self.recording = recording
+        self.records = recording['records']
+        self.cursor = 0
+        self.connection_type = metadata['connection_type']
+        self.device_state = DeviceState(metadata['device_state'])
+        self.sequence_number = metadata['sequence_number']
+
+        self.is_connection_open = False
+        self.is_destroyed = False
+        self.pool = ReceivePool()
+        self.data_signal = self.pool.data_signal
+        self.stats: ReplayStats = {
+            'sends': 0,
+            'mismatched_sends': 0,
+            'unexpected_sends': 0,
+            'received_chunks': 0,
+        }
+
+        self._last_delivery = 0.0
+        self._handles: Set[asyncio.TimerHandle] = set()
+
+    @classmethod
+    async def create(
+        cls,
+        path: str,
+        options: Optional[ReplayOptions] = None,
+    ) -> 'ReplayDeviceConnection':
+        return cls(read_recording(path), options)
+
+    def is_finished(self) -> bool:
+        return all(
+            record['type'] not in (RecordType.SEND, RecordType.RECEIVE)
+            for record in self.records[self.cursor:]
+        )
+
+    # ************** Playback ****************
+    def _find(self, record_type: RecordType) -> Optional[int]:
+        """
+        Index of the next record of `record_type`. Only sends can skip
+        over other sends.
+        """
+        for index in range(self.cursor, len(self.records)):
+            found_type = self.records[index]['type']
+            if found_type == record_type:
+                return index
+            if found_type == RecordType.SEND:
+                return None
+        return None
+
+    def _advance(self, index: int) -> None:
+        """
+        Moves past the record at `index`, delivering the data read before
+        it right away and the data read after it with its recorded delay.
+        """
+        for record in self.records[self.cursor:index]:
+            if record['type'] == RecordType.RECEIVE:
+                self._deliver(record['data'], 0)
+
+        started_at = self.records[index]['timestamp']
+        self.cursor = index + 1
+
+        while (
+            self.cursor < len(self.records) and
+            self.records[self.cursor]['type'] == RecordType.RECEIVE
+        ):
+            record = self.records[self.cursor]
+            self._deliver(record['data'], record['timestamp'] - started_at)
+            self.cursor += 1
+
+    def _deliver(self, data: bytes, delay: float) -> None:
+        speed = self.options['speed']
+        if speed == 0 or delay <= 0:
+            if not self._handles:
+                self._push(data)
+                return
+            delay = 0
+        else:
+            delay /= speed
+
+        loop = asyncio.get_running_loop()
+        # Keep the data in the recorded order
+        deliver_at = max(loop.time() + delay, self._last_delivery)
+        self._last_delivery = deliver_at
+
+        def deliver() -> None:
+            self._handles.discard(handle)
+            self._push(data)
+
+        handle = loop.call_at(deliver_at, deliver)
+        self._handles.add(handle)
+
+    def _push(self, data: bytes) -> None:
+        self.stats['received_chunks'] += 1
+        self.pool.push(data)
+
+    # ************** Connection ****************
+    async def get_connection_type(self) -> str:
+        return self.connection_type
+
+    async def is_connected(self) -> bool:
+        return not self.is_destroyed and self.is_connection_open
+
+    async def before_operation(self) -> None:
+        if self.is_destroyed:
+            raise DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
+
+        self.is_connection_open = True
+        index = self._find(RecordType.OPEN)
+        if index is not None:
+            self._advance(index)
+
+    async def after_operation(self) -> None:
+        self.is_connection_open = False
+        index = self._find(RecordType.CLOSE)
+        if index is not None:
+            self._advance(index)
+
+    async def get_sequence_number(self) -> int:
+        return self.sequence_number
+
+    async def get_new_sequence_number(self) -> int:
+        index = self._find(RecordType.SEQUENCE_NUMBER)
+        if index is None:
+            # Wrap from 0xffff to 1, 0 is not a valid sequence number
+            self.sequence_number = self.sequence_number % 0xffff + 1
+        else:
+            self.sequence_number = int.from_bytes(self.records[index]['data'], 'big')
+            self._advance(index)
+        return self.sequence_number
+
+    async def get_device_state(self) -> DeviceState:
+        return self.device_state
+
+    async def destroy(self) -> None:
+        self.is_destroyed = True
+        self.is_connection_open = False
+        for handle in self._handles:
+            handle.cancel()
+        self._handles.clear()
+        self.data_signal.notify()
+
+    async def send(self, data: bytes) -> None:
+        if not self.is_connection_open:
+            raise DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
+
+        self.stats['sends'] += 1
+        index = self._find(RecordType.SEND)
+        if index is None:
+            self.stats['unexpected_sends'] += 1
+            self._check_strict('The recording has no more data sent')
+            return
+
+        if get_send_key(self.records[index]['data']) != get_send_key(bytes(data)):
+            self.stats['mismatched_sends'] += 1
+            self._check_strict('The data sent does not match the recording')
+
+        self._advance(index)
+
+    def _check_strict(self, message: str) -> None:
+        if self.options['strict']:
+            error = DeviceCommunicationError(DeviceCommunicationErrorType.WRITE_ERROR)
+            error.message = message
+            raise error
+
+    async def receive(self) -> Optional[bytes]:
+        return self.pool.pop()
+
+    async def peek(self) -> List[PoolData]:
+        return self.pool.peek()
+
+    async def wait_for_data(self, timeout: Optional[int] = None) -> bool:
+        return await self.pool.wait_for_data(timeout)
+
+
+__all__ = ['ReplayDeviceConnection', 'ReplayOptions', 'ReplayStats', 'get_send_key']
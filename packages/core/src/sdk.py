@@ -1,4 +1,5 @@
-from typing import Optional, Dict, Any, Callable, Awaitable, List
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Awaitable, List
 from packages.interfaces import (
     DeviceBootloaderError,
     DeviceBootloaderErrorType,
@@ -10,7 +11,6 @@ from packages.interfaces import (
     IDeviceConnection,
 )
 from packages.util.utils.assert_utils import assert_condition
-from packages.core.src.utils.version_compare import compare_versions
 from packages.core.src.operations import bootloader as bootloader_operations
 from packages.core.src.operations import legacy as legacy_operations
 from packages.core.src.operations import proto as operations
@@ -18,10 +18,19 @@ from packages.core.src import commands
 from packages.core.src.utils.sdk_version import get_packet_version_from_sdk, format_sdk_version
 from packages.core.src.utils.packetversion import PacketVersion, PacketVersionMap
 from packages.core.src.utils.feature_map import FeatureName, is_feature_enabled
-from packages.core.src.types import IFeatureSupport, ISDK
+from packages.core.src.utils.probe_cache import ProbeCache, default_probe_cache
+from packages.core.src.utils.app_versions import AppVersionsIndex, format_app_version
+from packages.core.src.utils.instrumentation import (
+    EventName,
+    applet_scope,
+    record_event,
+    start_timer,
+)
+from packages.core.src.types import IFeatureSupport, ISDK, SDKCapabilities
 from packages.core.src.deprecated import DeprecatedCommunication
 from packages.core.src.encoders.proto.types import DeviceIdleState
 from packages.core.src.encoders.raw.types import DeviceIdleState as RawDeviceIdleState
+from packages.core.src.encoders.packet.Bootloader import FirmwareData
 from packages.core.src.utils.logger import logger
 from packages.core.src.encoders.proto.generated.core import AppVersionResultResponse
 from packages.interfaces.errors.app_error import DeviceAppError, DeviceAppErrorType
@@ -41,6 +50,13 @@ class SDK:
         self.applet_id = applet_id
         self.deprecated = DeprecatedCommunication(self)
         self.app_versions_map: Optional[AppVersionResultResponse] = None
+        self.app_versions_index: Optional[AppVersionsIndex] = None
+        self.probe_cache: Optional[ProbeCache] = None
+        self.probe_key: Optional[str] = None
+        self.capabilities: Optional[SDKCapabilities] = None
+        self.is_proto_operation_allowed = False
+        self.session_depth = 0
+        self.is_device_ready = False
 
     @classmethod
     async def create(
@@ -51,14 +67,30 @@ class SDK:
     ) -> "ISDK":
         max_tries = options.get("max_tries") if options else None
         timeout = options.get("timeout") if options else None
-        
-        sdk_data = await cls.get_sdk_version(connection, max_tries, timeout)
-        return cls(
+        cache = options.get("probe_cache", default_probe_cache) if options else default_probe_cache
+
+        probe_key = await cache.get_key(connection) if cache is not None else None
+        cached = cache.get(probe_key) if cache is not None else None
+
+        if cached:
+            sdk_data = cached
+        else:
+            sdk_data = await cls.get_sdk_version(connection, max_tries, timeout)
+            if cache is not None and sdk_data.get("packetVersion"):
+                cache.set(probe_key, sdk_data["sdkVersion"], sdk_data["packetVersion"])
+
+        sdk = cls(
             connection,
             applet_id,
             sdk_data["sdkVersion"],
             sdk_data.get("packetVersion"),
         )
+        sdk.probe_cache = cache
+        sdk.probe_key = probe_key
+        if cached and cached["appVersions"]:
+            sdk.app_versions_index = cached["appVersions"]
+            sdk.app_versions_map = sdk.app_versions_index.app_versions
+        return sdk
 
     def get_connection(self) -> IDeviceConnection:
         return self.connection
@@ -69,11 +101,29 @@ class SDK:
     def get_packet_version(self) -> Optional[PacketVersion]:
         return self.packet_version
 
-    async def is_supported(self) -> bool:
-        if await self.get_device_state() == DeviceState.BOOTLOADER:
-            return False
+    async def get_capabilities(self) -> SDKCapabilities:
+        """
+        Snapshot of what the connected device supports. Computed once and
+        kept until the connection is prepared for the next operation
+        (`before_operation`) or destroyed.
+        """
+        if self.capabilities is None:
+            device_state = await self.get_device_state()
+            is_in_bootloader = device_state == DeviceState.BOOTLOADER
+            self.capabilities = {
+                "device_state": device_state,
+                "is_in_bootloader": is_in_bootloader,
+                "is_supported": not is_in_bootloader
+                and is_feature_enabled(FeatureName.ProtoCommand, self.get_version()),
+            }
+        return self.capabilities
+
+    def invalidate_capabilities(self) -> None:
+        self.capabilities = None
+        self.is_proto_operation_allowed = False
 
-        return is_feature_enabled(FeatureName.ProtoCommand, self.get_version())
+    async def is_supported(self) -> bool:
+        return (await self.get_capabilities())["is_supported"]
 
     async def get_sequence_number(self) -> int:
         return await self.connection.get_sequence_number()
@@ -82,6 +132,7 @@ class SDK:
         return await self.connection.get_new_sequence_number()
 
     async def before_operation(self) -> None:
+        self.invalidate_capabilities()
         return await self.connection.before_operation()
 
     async def after_operation(self) -> None:
@@ -91,10 +142,21 @@ class SDK:
         self.applet_id = applet_id
 
     async def destroy(self) -> None:
+        self.invalidate_capabilities()
         return await self.connection.destroy()
 
+    def invalidate_probe_cache(self) -> None:
+        """
+        Forget the cached probes of this device, e.g. after its firmware
+        was updated.
+        """
+        self.app_versions_map = None
+        self.app_versions_index = None
+        if self.probe_cache is not None:
+            self.probe_cache.invalidate(self.connection)
+
     async def is_in_bootloader(self) -> bool:
-        return await self.get_device_state() == DeviceState.BOOTLOADER
+        return (await self.get_capabilities())["is_in_bootloader"]
 
     async def get_device_state(self) -> DeviceState:
         return await self.connection.get_device_state()
@@ -105,18 +167,7 @@ class SDK:
         data: bytes,
         options: Optional[Dict[str, Any]] = None,
     ) -> None:
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self.validate_proto_operation()
 
         sequence_number = options.get("sequence_number") if options else None
         if sequence_number is None:
@@ -140,18 +191,7 @@ class SDK:
         )
 
     async def get_result(self, options: Optional[Dict[str, Any]] = None):
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self.validate_proto_operation()
 
         sequence_number = options.get("sequence_number") if options else None
         if sequence_number is None:
@@ -174,18 +214,7 @@ class SDK:
         )
 
     async def wait_for_result(self, params: Optional[Dict[str, Any]] = None):
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self.validate_proto_operation()
 
         sequence_number = params.get("sequence_number") if params else None
         if sequence_number is None:
@@ -208,19 +237,9 @@ class SDK:
         max_tries: Optional[int] = None,
         timeout: Optional[int] = None,
         dont_log: Optional[bool] = None,
+        max_age: Optional[int] = None,
     ):
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self.validate_proto_operation()
 
         # Set defaults for None values
         if max_tries is None:
@@ -234,21 +253,11 @@ class SDK:
             max_tries=max_tries,
             timeout=timeout,
             dont_log=dont_log,
+            max_age=max_age,
         )
 
     async def send_abort(self, options: Optional[Dict[str, Any]] = None):
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self.validate_proto_operation()
 
         sequence_number = options.get("sequence_number") if options else None
         if sequence_number is None:
@@ -274,50 +283,52 @@ class SDK:
         on_status: Optional[Callable[[Any], None]] = None,
         options: Optional[Dict[str, Any]] = None,
     ):
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self.validate_proto_operation()
 
         if not self.app_versions_map:
             result = await commands.get_app_versions(
-                connection=self.connection,
-                options=options,
-                on_status=on_status,
+                commands.GetAppVersionsParams(
+                    connection=self.connection,
+                    sequence_number=await self.get_new_sequence_number(),
+                    on_status=on_status,
+                    options=options,
+                )
             )
             self.app_versions_map = result
+            self.app_versions_index = None
+            if self.probe_cache is not None:
+                self.app_versions_index = self.probe_cache.set_app_versions(self.probe_key, result)
             return result
 
         return self.app_versions_map
 
+    async def get_app_versions_index(
+        self,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> AppVersionsIndex:
+        """
+        Same as `get_app_versions`, indexed by app id.
+        """
+        app_versions = await self.get_app_versions(None, options)
+        if self.app_versions_index is None or self.app_versions_index.app_versions is not app_versions:
+            self.app_versions_index = AppVersionsIndex(app_versions)
+        return self.app_versions_index
+
     async def get_app_version(self, app_id: int):
-        await self.get_app_versions()
-        if not self.app_versions_map or not self.app_versions_map.app_versions:
-            return None
-            
-        for app in self.app_versions_map.app_versions:
-            if app.id == app_id:
-                return app.version
-        return None
+        index = await self.get_app_versions_index()
+        return index.get(app_id)
 
     async def check_feature_support_compatibility(self, features: List[IFeatureSupport]) -> None:
-        app_version_result = await self.get_app_version(self.applet_id)
+        index = await self.get_app_versions_index()
+        app_version_result = index.get(self.applet_id)
 
         if not app_version_result:
             return
 
-        app_version = f"{app_version_result.major}.{app_version_result.minor}.{app_version_result.patch}"
+        app_version = format_app_version(app_version_result)
 
         for feature in features:
-            is_compatible = compare_versions(feature["from_version"], app_version) < 1
+            is_compatible = index.is_compatible(self.applet_id, feature["from_version"])
             if not is_compatible:
                 logger.warn(
                     f"Feature {feature['name']} is supported only from >{feature['from_version']}, "
@@ -332,23 +343,12 @@ class SDK:
         version: Dict[str, str],
         options: Optional[Dict[str, Any]] = None,
     ) -> None:
-        app_versions_result = await self.get_app_versions(None, options)
-        
-        app_version_result = None
-        for app in app_versions_result.app_versions:
-            if app.id == self.applet_id:
-                app_version_result = app.version
-                break
+        index = await self.get_app_versions_index(options)
 
-        if not app_version_result:
+        if not index.get(self.applet_id):
             return
 
-        app_version = f"{app_version_result.major}.{app_version_result.minor}.{app_version_result.patch}"
-
-        is_compatible = compare_versions(version["from"], app_version) < 1
-
-        if version.get("to"):
-            is_compatible = is_compatible and compare_versions(version["to"], app_version) > 0
+        is_compatible = index.is_compatible(self.applet_id, version["from"], version.get("to"))
 
         if not is_compatible:
             raise DeviceCompatibilityError(
@@ -366,7 +366,7 @@ class SDK:
 
     async def send_bootloader_data(
         self,
-        data: str,
+        data: FirmwareData,
         on_progress: Optional[Callable[[int], None]] = None,
         options: Optional[Dict[str, Any]] = None,
     ) -> None:
@@ -383,6 +383,8 @@ class SDK:
         )
 
     async def make_device_ready(self) -> None:
+        started = start_timer()
+
         if await self.is_supported():
             await self.ensure_if_usb_idle()
 
@@ -406,9 +408,70 @@ class SDK:
 
                 await self.deprecated.send_command_abort(await self.get_sequence_number())
 
+        record_event(EventName.MAKE_DEVICE_READY, self.connection, started)
+
+    def needs_device_ready(self) -> bool:
+        """
+        Within a session, the readiness check is only done again when an
+        operation failed or the last status received shows the device is
+        busy.
+        """
+        if not self.is_device_ready:
+            return True
+
+        status = operations.get_last_status(self.connection)
+        return status is not None and status.device_idle_state in [
+            DeviceIdleState.DEVICE_IDLE_STATE_USB,
+            DeviceIdleState.DEVICE_IDLE_STATE_DEVICE,
+        ]
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator["SDK"]:
+        """
+        Run several operations back to back on one prepared connection.
+
+        The connection is prepared and the device is made ready once when
+        the outermost session is entered, `run_operation` calls within it
+        skip both. Not to be confused with the device session of
+        `start_session`.
+
+        Example:
+            async with sdk.session():
+                await app.get_device_info()
+                await app.get_wallets()
+        """
+        if self.session_depth == 0:
+            await self.before_operation()
+            self.is_device_ready = False
+
+        self.session_depth += 1
+        try:
+            yield self
+        finally:
+            self.session_depth -= 1
+            if self.session_depth == 0:
+                self.is_device_ready = False
+                if await self.connection.is_connected():
+                    await self.connection.after_operation()
+
     async def run_operation(self, operation: Callable[[], Awaitable[Any]]) -> Any:
+        with applet_scope(self.applet_id):
+            return await self._run_operation(operation)
+
+    async def _run_operation(self, operation: Callable[[], Awaitable[Any]]) -> Any:
+        if self.session_depth > 0:
+            try:
+                if self.needs_device_ready():
+                    await self.make_device_ready()
+                    self.is_device_ready = True
+
+                return await operation()
+            except Exception as error:
+                self.is_device_ready = False
+                raise error
+
         try:
-            await self.connection.before_operation()
+            await self.before_operation()
             await self.make_device_ready()
 
             result = await operation()
@@ -429,11 +492,14 @@ class SDK:
                 DeviceCommunicationErrorType.IN_BOOTLOADER,
             )
 
-    async def start_session(
-        self,
-        on_status: Optional[Callable[[Any], None]] = None,
-        options: Optional[Dict[str, Any]] = None,
-    ):
+    async def validate_proto_operation(self) -> None:
+        """
+        Checks done before every proto operation. Once they passed, they are
+        skipped until the capabilities are invalidated.
+        """
+        if self.is_proto_operation_allowed:
+            return
+
         await self.validate_not_in_bootloader_mode()
         assert_condition(
             self.packet_version,
@@ -447,6 +513,15 @@ class SDK:
                 DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
             )
 
+        self.is_proto_operation_allowed = True
+
+    async def start_session(
+        self,
+        on_status: Optional[Callable[[Any], None]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ):
+        await self.validate_proto_operation()
+
         return await commands.start_session(
             connection=self.connection,
             get_new_sequence_number=self.get_new_sequence_number,
@@ -460,18 +535,7 @@ class SDK:
         on_status: Optional[Callable[[Any], None]] = None,
         options: Optional[Dict[str, Any]] = None,
     ) -> None:
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self.validate_proto_operation()
 
         return await commands.close_session(
             connection=self.connection,
@@ -0,0 +1,17 @@
+from .connection import SimulatedDeviceConnection
+from .device import (
+    CommandHandler,
+    CommandOutput,
+    SimulatedDevice,
+    SimulatorOptions,
+    SimulatorStats,
+)
+
+__all__ = [
+    'CommandHandler',
+    'CommandOutput',
+    'SimulatedDevice',
+    'SimulatedDeviceConnection',
+    'SimulatorOptions',
+    'SimulatorStats',
+]
@@ -0,0 +1,90 @@
+from typing import List, Optional
+
+from packages.interfaces.connection import ConnectionTypeMap, DeviceState, PoolData
+from packages.interfaces.errors.connection_error import (
+    DeviceConnectionError,
+    DeviceConnectionErrorType,
+)
+from packages.util.utils.receive_pool import ReceivePool
+from .device import SimulatedDevice, SimulatorOptions
+
+
+class SimulatedDeviceConnection:
+    """
+    `IDeviceConnection` backed by a `SimulatedDevice` instead of hardware,
+    for benchmarking and testing the sdk end to end without a device.
+    """
+
+    def __init__(
+        self,
+        options: Optional[SimulatorOptions] = None,
+        connection_type: str = ConnectionTypeMap.SERIAL_PORT.value,
+    ):
+        self.is_connection_open = False
+        self.is_destroyed = False
+        self.sequence_number = 0
+        self.connection_type = connection_type
+        self.pool = ReceivePool()
+        self.data_signal = self.pool.data_signal
+        self.device = SimulatedDevice(self.pool.push, options)
+
+    @classmethod
+    async def create(
+        cls,
+        options: Optional[SimulatorOptions] = None,
+        connection_type: str = ConnectionTypeMap.SERIAL_PORT.value,
+    ) -> 'SimulatedDeviceConnection':
+        return cls(options, connection_type)
+
+    async def get_connection_type(self) -> str:
+        return self.connection_type
+
+    async def is_connected(self) -> bool:
+        return not self.is_destroyed and self.is_connection_open
+
+    async def before_operation(self) -> None:
+        if self.is_destroyed:
+            raise DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
+
+        if not self.is_connection_open:
+            self.is_connection_open = True
+            self.device.enter_receiving_mode()
+
+    async def after_operation(self) -> None:
+        self.is_connection_open = False
+
+    async def get_sequence_number(self) -> int:
+        return self.sequence_number
+
+    async def get_new_sequence_number(self) -> int:
+        # Sequence numbers are 16 bits and 0 is not a valid one, wrap from
+        # 0xffff to 1
+        self.sequence_number = self.sequence_number % 0xffff + 1
+        return self.sequence_number
+
+    async def get_device_state(self) -> DeviceState:
+        return self.device.device_state
+
+    async def destroy(self) -> None:
+        self.is_destroyed = True
+        self.is_connection_open = False
+        self.device.destroy()
+        self.data_signal.notify()
+
+    async def send(self, data: bytes) -> None:
+        if not self.is_connection_open:
+            raise DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
+
+        self.device.receive(bytes(data))
+
+    async def receive(self) -> Optional[bytes]:
+        return self.pool.pop()
+
+    async def peek(self) -> List[PoolData]:
+        return self.pool.peek()
+
+    async def wait_for_data(self, timeout: Optional[int] = None) -> bool:
+        return await self.pool.wait_for_data(timeout)
+
+
+__all__ = ['SimulatedDeviceConnection']
@@ -0,0 +1,487 @@
+import asyncio
+import inspect
+import random
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+    Union,
+)
+
+from packages.interfaces import DeviceState
+from packages.util.utils import crc16
+from packages.util.utils.assert_utils import assert_condition
+from packages.core.src import config
+from packages.core.src.encoders.packet.Bootloader import CHUNK_BYTES
+from packages.core.src.encoders.packet.legacy import xmodem_decode, xmodem_encode
+from packages.core.src.encoders.packet.packet import (
+    ErrorPacketRejectReason,
+    decode_packet_bytes,
+    decode_payload_data_bytes,
+    encode_packet_bytes,
+)
+from packages.core.src.encoders.proto.generated.common import Version
+from packages.core.src.encoders.proto.generated.core import (
+    AppVersion,
+    AppVersionCmd,
+    AppVersionResponse,
+    AppVersionResultResponse,
+    CmdState,
+    Command,
+    DeviceIdleState,
+    Msg,
+    Status,
+)
+from packages.core.src.utils.logger import logger
+from packages.core.src.utils.packetversion import PacketVersionMap
+from packages.core.src.utils.version_compare import parse_version_tuple
+
+# (protobuf data, raw data)
+CommandOutput = Tuple[bytes, bytes]
+CommandHandler = Callable[[bytes, bytes], Union[CommandOutput, Awaitable[CommandOutput]]]
+
+PACKET_TYPE = config.v3.commands.PACKET_TYPE
+LEGACY_START_OF_FRAME = 0xaa
+LEGACY_SDK_VERSION_COMMAND = 88
+
+BOOTLOADER_START_OF_FRAME = 0x01
+BOOTLOADER_END_OF_TRANSMISSION = 0x04
+BOOTLOADER_ABORT = 0x41
+BOOTLOADER_ABORT_ACK = 0x18
+BOOTLOADER_ACK = 0x06
+BOOTLOADER_NACK = 0x15
+BOOTLOADER_RECEIVING_MODE = 0x43
+BOOTLOADER_FRAME_SIZE = 3 + CHUNK_BYTES + 2
+
+
+class SimulatorOptions(TypedDict, total=False):
+    sdk_version: str
+    device_state: DeviceState
+    # Delay (ms) before each response reaches the host, plus up to `jitter` ms
+    latency: float
+    jitter: float
+    # Size of the reads the host gets a v3 frame in, e.g. 64 for HID reports
+    chunk_size: Optional[int]
+    # Probability of losing or corrupting each chunk, in either direction
+    chunk_loss: float
+    crc_corruption: float
+    # Time (ms) a command waits on the user before it is executed
+    confirmation_delay: float
+    abort_disabled: bool
+    # App id to version, returned for the core app version request
+    app_versions: Dict[int, str]
+    # Applet id (0 for core messages) to handler, default is to echo the query
+    command_handlers: Dict[int, CommandHandler]
+    seed: Optional[int]
+
+
+class SimulatorStats(TypedDict):
+    received_chunks: int
+    sent_chunks: int
+    lost_chunks: int
+    corrupted_chunks: int
+    commands: int
+    aborts: int
+    firmware_frames: int
+
+
+DEFAULT_SIMULATOR_OPTIONS: SimulatorOptions = {
+    'sdk_version': '3.0.1',
+    'device_state': DeviceState.MAIN,
+    'latency': 0,
+    'jitter': 0,
+    'chunk_size': None,
+    'chunk_loss': 0,
+    'crc_corruption': 0,
+    'confirmation_delay': 0,
+    'abort_disabled': False,
+    'app_versions': {},
+    'command_handlers': {},
+    'seed': None,
+}
+
+
+class SimulatedCommand:
+    def __init__(self, sequence_number: int, total_packets: int):
+        self.sequence_number = sequence_number
+        self.total_packets = total_packets
+        self.chunks: List[bytes] = []
+        self.state = CmdState.CMD_STATE_RECEIVING
+        self.flow_status = 0
+        self.output: List[bytes] = []
+        self.task: Optional[asyncio.Task] = None
+
+
+class SimulatedDevice:
+    """
+    In-process Cypherock device speaking the protocols the sdk uses: the
+    legacy v1 packets for the sdk version (command 88), v3 frames for proto
+    commands (ACK, STATUS, CMD_OUTPUT, ERROR and ABORT) and the xmodem
+    transfer of the bootloader.
+
+    Responses are handed to `on_output` after `latency` (plus `jitter`)
+    milliseconds, in order. Chunks can be lost or corrupted, in both
+    directions, with a probability drawn from `seed` so runs are
+    reproducible.
+    """
+
+    def __init__(
+        self,
+        on_output: Callable[[bytes], None],
+        options: Optional[SimulatorOptions] = None,
+    ):
+        self.options: SimulatorOptions = {**DEFAULT_SIMULATOR_OPTIONS, **(options or {})}
+        for key in ('chunk_loss', 'crc_corruption'):
+            assert_condition(0 <= self.options[key] <= 1, f'Invalid {key}')
+        assert_condition(
+            parse_version_tuple(self.options['sdk_version']) is not None,
+            'Invalid sdkVersion',
+        )
+
+        self.on_output = on_output
+        self.device_state: DeviceState = self.options['device_state']
+        self.rng = random.Random(self.options['seed'])
+        self.stats: SimulatorStats = {
+            'received_chunks': 0,
+            'sent_chunks': 0,
+            'lost_chunks': 0,
+            'corrupted_chunks': 0,
+            'commands': 0,
+            'aborts': 0,
+            'firmware_frames': 0,
+        }
+
+        self.command: Optional[SimulatedCommand] = None
+        self.idle_state = DeviceIdleState.DEVICE_IDLE_STATE_IDLE
+
+        self.firmware = bytearray()
+        self.installed_firmware: Optional[bytes] = None
+        self.last_firmware_frame: Optional[int] = None
+
+        self._last_delivery = 0.0
+        self._handles: Set[asyncio.TimerHandle] = set()
+
+    def destroy(self) -> None:
+        for handle in self._handles:
+            handle.cancel()
+        self._handles.clear()
+        if self.command and self.command.task:
+            self.command.task.cancel()
+
+    # ************** Link ****************
+    def receive(self, data: bytes) -> None:
+        """
+        Data written by the host.
+        """
+        self.stats['received_chunks'] += 1
+        data = self._apply_faults(data)
+        if data is None:
+            return
+
+        if self.device_state == DeviceState.BOOTLOADER:
+            self._on_bootloader_data(data)
+        elif data[0] == LEGACY_START_OF_FRAME:
+            self._on_legacy_data(data)
+        else:
+            self._on_v3_data(data)
+
+    def send(self, data: bytes, chunk_size: Optional[int] = None) -> None:
+        """
+        Send data to the host, split in reads of `chunk_size` bytes.
+        """
+        chunk_size = chunk_size or len(data)
+        for offset in range(0, len(data), chunk_size):
+            chunk = self._apply_faults(data[offset:offset + chunk_size])
+            if chunk is not None:
+                self.stats['sent_chunks'] += 1
+                self._deliver(chunk)
+
+    def enter_receiving_mode(self) -> None:
+        """
+        The bootloader tells the host it is ready for a firmware.
+        """
+        if self.device_state == DeviceState.BOOTLOADER:
+            self.send(bytes((BOOTLOADER_RECEIVING_MODE,)))
+
+    def _apply_faults(self, data: bytes) -> Optional[bytes]:
+        if self.options['chunk_loss'] and self.rng.random() < self.options['chunk_loss']:
+            self.stats['lost_chunks'] += 1
+            return None
+
+        if self.options['crc_corruption'] and self.rng.random() < self.options['crc_corruption']:
+            self.stats['corrupted_chunks'] += 1
+            corrupted = bytearray(data)
+            # The last byte is part of the crc of every frame
+            corrupted[-1] ^= 0xff
+            return bytes(corrupted)
+
+        return data
+
+    def _deliver(self, data: bytes) -> None:
+        delay = self.options['latency']
+        if self.options['jitter']:
+            delay += self.rng.uniform(0, self.options['jitter'])
+
+        if delay <= 0:
+            self.on_output(data)
+            return
+
+        loop = asyncio.get_running_loop()
+        # Jitter must not reorder the responses
+        deliver_at = max(loop.time() + delay / 1000, self._last_delivery)
+        self._last_delivery = deliver_at
+
+        def deliver() -> None:
+            self._handles.discard(handle)
+            self.on_output(data)
+
+        handle = loop.call_at(deliver_at, deliver)
+        self._handles.add(handle)
+
+    # ************** Legacy v1 ****************
+    def _on_legacy_data(self, data: bytes) -> None:
+        commands = config.v1.commands
+
+        for packet in xmodem_decode(data, PacketVersionMap.v1):
+            if packet['errorList']:
+                self.send(xmodem_encode('00', commands.NACK_PACKET, PacketVersionMap.v1)[0])
+                continue
+
+            self.send(xmodem_encode('00', commands.ACK_PACKET, PacketVersionMap.v1)[0])
+
+            if packet['commandType'] == LEGACY_SDK_VERSION_COMMAND:
+                major, minor, patch = parse_version_tuple(self.options['sdk_version'])
+                version_data = f'{major:04x}{minor:04x}{patch:04x}'
+                for frame in xmodem_encode(
+                    version_data, LEGACY_SDK_VERSION_COMMAND, PacketVersionMap.v1
+                ):
+                    self.send(frame)
+
+    # ************** v3 ****************
+    def _on_v3_data(self, data: bytes) -> None:
+        for packet in decode_packet_bytes(data, PacketVersionMap.v3):
+            sequence_number = packet['sequence_number']
+            packet_type = packet['packet_type']
+
+            if packet['error_list']:
+                self._send_error(sequence_number, ErrorPacketRejectReason.CHECKSUM_ERROR)
+            elif packet_type == PACKET_TYPE.CMD:
+                self._on_command_packet(packet)
+            elif packet_type == PACKET_TYPE.STATUS_REQ:
+                self._send_status(sequence_number)
+            elif packet_type in (PACKET_TYPE.CMD_OUTPUT_REQ, PACKET_TYPE.CMD_OUTPUT):
+                self._on_output_request(packet)
+            elif packet_type == PACKET_TYPE.ABORT:
+                self._on_abort(sequence_number)
+            else:
+                logger.warn(f'Simulator received an unknown packet type: {packet_type}')
+
+    def _send_frame(
+        self,
+        sequence_number: int,
+        packet_type: int,
+        raw_data: bytes = b'',
+        proto_data: bytes = b'',
+    ) -> None:
+        for frame in encode_packet_bytes(
+            raw_data, proto_data, PacketVersionMap.v3, sequence_number, packet_type
+        ):
+            self.send(frame, self.options['chunk_size'])
+
+    def _send_error(self, sequence_number: int, reason: ErrorPacketRejectReason) -> None:
+        self._send_frame(sequence_number, PACKET_TYPE.ERROR, bytes((reason.value,)))
+
+    def get_status(self) -> Status:
+        command = self.command
+        return Status(
+            device_idle_state=self.idle_state,
+            abort_disabled=self.options['abort_disabled'],
+            current_cmd_seq=command.sequence_number if command else 0,
+            cmd_state=command.state if command else CmdState.CMD_STATE_DONE,
+            flow_status=command.flow_status if command else 0,
+        )
+
+    def _send_status(self, sequence_number: int) -> None:
+        self._send_frame(sequence_number, PACKET_TYPE.STATUS, proto_data=bytes(self.get_status()))
+
+    def _on_command_packet(self, packet: Dict[str, Any]) -> None:
+        sequence_number = packet['sequence_number']
+        current_packet = packet['current_packet_number']
+        command = self.command
+
+        if command is None or command.sequence_number != sequence_number:
+            if command is not None and command.state in (
+                CmdState.CMD_STATE_RECEIVING, CmdState.CMD_STATE_EXECUTING
+            ):
+                self._send_error(sequence_number, ErrorPacketRejectReason.BUSY_PREVIOUS_CMD)
+                return
+            if current_packet != 1:
+                self._send_error(sequence_number, ErrorPacketRejectReason.OUT_OF_ORDER_CHUNK)
+                return
+            command = SimulatedCommand(sequence_number, packet['total_packet_number'])
+            self.command = command
+            self.idle_state = DeviceIdleState.DEVICE_IDLE_STATE_USB
+
+        if current_packet == len(command.chunks) + 1 and command.state == CmdState.CMD_STATE_RECEIVING:
+            command.chunks.append(packet['payload_data'])
+        elif current_packet > len(command.chunks):
+            self._send_error(sequence_number, ErrorPacketRejectReason.OUT_OF_ORDER_CHUNK)
+            return
+        # else: the ack of a chunk was lost and the host sent it again
+
+        self._send_frame(sequence_number, PACKET_TYPE.CMD_ACK)
+
+        if len(command.chunks) == command.total_packets and command.state == CmdState.CMD_STATE_RECEIVING:
+            command.state = CmdState.CMD_STATE_EXECUTING
+            command.task = asyncio.ensure_future(self._execute(command))
+
+    async def _execute(self, command: SimulatedCommand) -> None:
+        self.stats['commands'] += 1
+        payload = decode_payload_data_bytes(b''.join(command.chunks), PacketVersionMap.v3)
+
+        try:
+            # Waiting on the user to confirm on the device
+            command.flow_status = 1
+            if self.options['confirmation_delay']:
+                await asyncio.sleep(self.options['confirmation_delay'] / 1000)
+            command.flow_status = 2
+
+            proto_data, raw_data = await self._run_handler(
+                payload['protobuf_data'], payload['raw_data']
+            )
+            command.output = encode_packet_bytes(
+                raw_data, proto_data, PacketVersionMap.v3,
+                command.sequence_number, PACKET_TYPE.CMD_OUTPUT,
+            )
+            command.state = CmdState.CMD_STATE_DONE
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            logger.warn('Simulated command failed')
+            logger.warn(error)
+            command.state = CmdState.CMD_STATE_FAILED
+            self.idle_state = DeviceIdleState.DEVICE_IDLE_STATE_IDLE
+
+    async def _run_handler(self, proto_data: bytes, raw_data: bytes) -> CommandOutput:
+        msg = Msg.parse(proto_data)
+        applet_id = msg.cmd.applet_id if msg.cmd else 0
+
+        handler = self.options['command_handlers'].get(applet_id)
+        if handler is None:
+            handler = self._echo_handler if applet_id else self._core_handler
+
+        result = handler(proto_data, raw_data)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    @staticmethod
+    def _echo_handler(proto_data: bytes, raw_data: bytes) -> CommandOutput:
+        msg = Msg.parse(proto_data)
+        return bytes(Msg(cmd=Command(applet_id=msg.cmd.applet_id))), raw_data
+
+    def _core_handler(self, proto_data: bytes, raw_data: bytes) -> CommandOutput:
+        msg = Msg.parse(proto_data)
+        if not msg.app_version:
+            raise Exception('Core message is not supported by the simulator')
+
+        app_versions = []
+        for app_id, app_version in self.options['app_versions'].items():
+            major, minor, patch = parse_version_tuple(app_version)
+            app_versions.append(AppVersion(
+                id=app_id,
+                version=Version(major=major, minor=minor, patch=patch),
+            ))
+
+        response = Msg(app_version=AppVersionCmd(response=AppVersionResponse(
+            result=AppVersionResultResponse(app_versions=app_versions)
+        )))
+        return bytes(response), b''
+
+    def _on_output_request(self, packet: Dict[str, Any]) -> None:
+        sequence_number = packet['sequence_number']
+        command = self.command
+
+        if (
+            command is None or
+            command.sequence_number != sequence_number or
+            command.state != CmdState.CMD_STATE_DONE
+        ):
+            self._send_status(sequence_number)
+            return
+
+        raw_data = decode_payload_data_bytes(packet['payload_data'], PacketVersionMap.v3)['raw_data']
+        packet_number = int.from_bytes(raw_data, 'big') if raw_data else 1
+        if not 1 <= packet_number <= len(command.output):
+            self._send_error(sequence_number, ErrorPacketRejectReason.OUT_OF_ORDER_CHUNK)
+            return
+
+        self.send(command.output[packet_number - 1], self.options['chunk_size'])
+        if packet_number == len(command.output):
+            self.idle_state = DeviceIdleState.DEVICE_IDLE_STATE_IDLE
+
+    def _on_abort(self, sequence_number: int) -> None:
+        command = self.command
+        if not self.options['abort_disabled']:
+            self.stats['aborts'] += 1
+            if command and command.task:
+                command.task.cancel()
+            self.command = SimulatedCommand(sequence_number, 0)
+            self.command.state = CmdState.CMD_STATE_DONE
+            self.idle_state = DeviceIdleState.DEVICE_IDLE_STATE_IDLE
+        self._send_status(sequence_number)
+
+    # ************** Bootloader ****************
+    def _on_bootloader_data(self, data: bytes) -> None:
+        marker = data[0]
+
+        if marker == BOOTLOADER_ABORT:
+            self.firmware.clear()
+            self.last_firmware_frame = None
+            self.send(bytes((BOOTLOADER_ABORT_ACK,)))
+            self.enter_receiving_mode()
+        elif marker == BOOTLOADER_END_OF_TRANSMISSION and len(data) == 1:
+            self.installed_firmware = bytes(self.firmware)
+            self.firmware.clear()
+            self.last_firmware_frame = None
+            self.send(bytes((BOOTLOADER_ACK,)))
+        elif marker == BOOTLOADER_START_OF_FRAME:
+            self.send(bytes((self._on_firmware_frame(data),)))
+
+    def _on_firmware_frame(self, frame: bytes) -> int:
+        if len(frame) != BOOTLOADER_FRAME_SIZE:
+            return BOOTLOADER_NACK
+
+        packet_number = frame[1]
+        chunk = frame[3:3 + CHUNK_BYTES]
+        crc = int.from_bytes(frame[3 + CHUNK_BYTES:], 'big')
+        if packet_number ^ frame[2] != 0xff or crc16(chunk) != crc:
+            return BOOTLOADER_NACK
+
+        if packet_number == self.last_firmware_frame:
+            # The ack of this frame was lost
+            return BOOTLOADER_ACK
+
+        expected = ((self.last_firmware_frame or 0) + 1) % 255
+        if packet_number != expected:
+            return BOOTLOADER_NACK
+
+        self.stats['firmware_frames'] += 1
+        self.firmware += chunk
+        self.last_firmware_frame = packet_number
+        return BOOTLOADER_ACK
+
+
+__all__ = [
+    'CommandHandler',
+    'CommandOutput',
+    'SimulatedDevice',
+    'SimulatorOptions',
+    'SimulatorStats',
+]
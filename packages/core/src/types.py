@@ -1,9 +1,11 @@
-from typing import Protocol, TypedDict, List, Optional, Callable, Awaitable, Union, Any, Dict
+from typing import Protocol, TypedDict, List, Optional, Callable, Awaitable, AsyncContextManager, Union, Any, Dict
 from packages.interfaces import DeviceState, IDeviceConnection
 from packages.core.src.utils.packetversion import PacketVersion
 from packages.core.src.encoders.raw.types import RawData, StatusData
+from packages.core.src.encoders.packet.Bootloader import FirmwareData
 from packages.core.src.encoders.proto.generated.core import AppVersionResultResponse
 from packages.core.src.encoders.proto.generated.common import Version
+from packages.core.src.utils.app_versions import AppVersionsIndex
 
 
 class IDeprecatedCommunication(Protocol):
@@ -64,6 +66,12 @@ class IFeatureSupport(TypedDict):
     from_version: str
 
 
+class SDKCapabilities(TypedDict):
+    device_state: DeviceState
+    is_in_bootloader: bool
+    is_supported: bool
+
+
 class ISDK(Protocol):
     deprecated: IDeprecatedCommunication
     
@@ -76,6 +84,12 @@ class ISDK(Protocol):
     def get_packet_version(self) -> Optional[PacketVersion]:
         ...
     
+    async def get_capabilities(self) -> SDKCapabilities:
+        ...
+    
+    def invalidate_capabilities(self) -> None:
+        ...
+    
     async def is_supported(self) -> bool:
         ...
     
@@ -97,6 +111,9 @@ class ISDK(Protocol):
     async def destroy(self) -> None:
         ...
     
+    def invalidate_probe_cache(self) -> None:
+        ...
+    
     async def is_in_bootloader(self) -> bool:
         ...
     
@@ -127,6 +144,7 @@ class ISDK(Protocol):
         max_tries: Optional[int] = None,
         timeout: Optional[int] = None,
         dont_log: Optional[bool] = None,
+        max_age: Optional[int] = None,
     ) -> Any:  # Status from proto types
         ...
     
@@ -143,6 +161,12 @@ class ISDK(Protocol):
     ) -> AppVersionResultResponse:
         ...
     
+    async def get_app_versions_index(
+        self,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> AppVersionsIndex:
+        ...
+    
     async def get_app_version(self, app_id: int) -> Optional[Version]:
         ...
     
@@ -167,18 +191,24 @@ class ISDK(Protocol):
     
     async def send_bootloader_data(
         self,
-        data: str,
+        data: FirmwareData,
         on_progress: Optional[Callable[[int], None]] = None,
         options: Optional[Dict[str, Any]] = None,
     ) -> None:
         ...
     
+    def session(self) -> AsyncContextManager["ISDK"]:
+        ...
+    
     async def run_operation(self, operation: Callable[[], Awaitable[Any]]) -> Any:
         ...
     
     async def validate_not_in_bootloader_mode(self) -> None:
         ...
     
+    async def validate_proto_operation(self) -> None:
+        ...
+    
     async def start_session(
         self,
         on_status: Optional[Callable[[Any], None]] = None,
@@ -198,4 +228,5 @@ __all__ = [
     "IDeprecatedCommunication",
     "IFeatureSupport", 
     "ISDK",
+    "SDKCapabilities",
 ]
@@ -10,6 +10,18 @@ from .common_error import assert_or_throw_invalid_result, parse_common_error
 from .feature_map import FeatureName, is_feature_enabled
 from .http import http
 from .version_compare import compare_versions
+from .app_versions import AppVersionsIndex, format_app_version
+from .probe_cache import ProbeCache, ProbeCacheEntry, default_probe_cache
+from .instrumentation import (
+    EventName,
+    HistogramInstrumentation,
+    IInstrumentation,
+    InstrumentationEvent,
+    LatencyHistogram,
+    LatencySummary,
+    set_instrumentation,
+    get_instrumentation,
+)
 
 __all__ = [
     # Crypto utilities
@@ -43,4 +55,23 @@ __all__ = [
     
     # Version comparison
     'compare_versions',
+
+    # App versions
+    'AppVersionsIndex',
+    'format_app_version',
+
+    # SDK probe cache
+    'ProbeCache',
+    'ProbeCacheEntry',
+    'default_probe_cache',
+
+    # Instrumentation
+    'EventName',
+    'HistogramInstrumentation',
+    'IInstrumentation',
+    'InstrumentationEvent',
+    'LatencyHistogram',
+    'LatencySummary',
+    'set_instrumentation',
+    'get_instrumentation',
 ]
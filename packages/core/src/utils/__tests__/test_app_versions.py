@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+
+from packages.interfaces.__mocks__.connection import MockDeviceConnection
+from packages.core.src.sdk import SDK
+from packages.core.src.utils.app_versions import AppVersionsIndex
+from packages.core.src.utils.version_compare import parse_version_tuple
+from packages.core.src.encoders.proto.generated.common import Version
+from packages.core.src.encoders.proto.generated.core import AppVersion, AppVersionResultResponse
+
+
+def _create_app_versions() -> AppVersionResultResponse:
+    return AppVersionResultResponse(app_versions=[
+        AppVersion(id=1, version=Version(major=1, minor=2, patch=3)),
+        AppVersion(id=2, version=Version(major=0, minor=9, patch=0)),
+        AppVersion(id=1, version=Version(major=9, minor=9, patch=9)),
+    ])
+
+
+class TestAppVersions:
+    def test_parse_version_tuple(self):
+        assert parse_version_tuple('1.2.3') == (1, 2, 3)
+        assert parse_version_tuple('v10.0.1') == (10, 0, 1)
+        assert parse_version_tuple('1.0.0-beta.1') is None
+        assert parse_version_tuple('1.0') is None
+
+    def test_index(self):
+        index = AppVersionsIndex(_create_app_versions())
+
+        assert index.get(1).major == 1
+        assert index.get_string(1) == '1.2.3'
+        assert index.get(3) is None
+
+        assert index.is_compatible(1, '1.0.0', '2.0.0') is True
+        assert index.is_compatible(1, '1.2.3') is True
+        assert index.is_compatible(1, '1.2.4') is False
+        assert index.is_compatible(1, '1.0.0', '1.2.3') is False
+        assert index.is_compatible(2, '1.0.0-beta.1') is False
+        assert index.is_compatible(3, '1.0.0') is None
+
+    def test_check_app_compatibility(self):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+            sdk = SDK(connection, 1, '3.0.1', 'v3')
+            sdk.app_versions_map = _create_app_versions()
+
+            await sdk.check_app_compatibility({'from': '1.0.0', 'to': '2.0.0'})
+            with pytest.raises(Exception):
+                await sdk.check_app_compatibility({'from': '2.0.0', 'to': '3.0.0'})
+
+            await sdk.check_feature_support_compatibility(
+                [{'name': 'feature', 'from_version': '1.1.0'}]
+            )
+            with pytest.raises(Exception):
+                await sdk.check_feature_support_compatibility(
+                    [{'name': 'feature', 'from_version': '1.3.0'}]
+                )
+
+            # Apps missing on the device are not checked
+            sdk.configure_applet_id(3)
+            await sdk.check_app_compatibility({'from': '2.0.0'})
+
+        asyncio.run(_test())
@@ -0,0 +1,45 @@
+import pytest
+
+from packages.core.src.utils.crypto import (
+    byte_stuffing,
+    byte_unstuffing,
+    stuff_bytes,
+    unstuff_bytes,
+)
+from packages.core.src.utils.packetversion import PacketVersionMap
+
+
+class TestByteStuffing:
+    def test_stuff_bytes(self):
+        assert stuff_bytes(bytes.fromhex('01aa02a303'), PacketVersionMap.v1) == \
+            bytes.fromhex('01a33a02a33303')
+        assert stuff_bytes(bytes.fromhex('01aa5aa3'), PacketVersionMap.v2) == \
+            bytes.fromhex('01aaa33aa333')
+        assert stuff_bytes(bytes.fromhex('a3a3aa'), PacketVersionMap.v1) == \
+            bytes.fromhex('a333a333a33a')
+
+    def test_unstuff_bytes(self):
+        assert unstuff_bytes(bytes.fromhex('01a33a02a33303'), PacketVersionMap.v1) == \
+            bytes.fromhex('01aa02a303')
+        assert unstuff_bytes(bytes.fromhex('01aaa33aa333'), PacketVersionMap.v2) == \
+            bytes.fromhex('01aa5aa3')
+        # Escape bytes not followed by an escape sequence are kept as is
+        assert unstuff_bytes(bytes.fromhex('a3a33a33a3'), PacketVersionMap.v1) == \
+            bytes.fromhex('a3aa33a3')
+
+    def test_round_trip(self):
+        data = bytes(range(256)) * 2
+        for version in (PacketVersionMap.v1, PacketVersionMap.v2):
+            for param in (data, bytearray(data), memoryview(data)):
+                stuffed = stuff_bytes(param, version)
+                assert unstuff_bytes(stuffed, version) == data
+                assert byte_stuffing(param, version) == stuffed.hex()
+                assert byte_unstuffing(stuffed, version) == data.hex()
+
+    def test_invalid(self):
+        with pytest.raises(Exception):
+            stuff_bytes(b'', PacketVersionMap.v1)
+        with pytest.raises(Exception):
+            unstuff_bytes(b'', PacketVersionMap.v1)
+        with pytest.raises(Exception):
+            byte_stuffing(b'\x01', None)
@@ -0,0 +1,86 @@
+import asyncio
+
+from packages.core.src.sdk import SDK
+from packages.core.src.simulator import SimulatedDeviceConnection
+from packages.core.src.utils.instrumentation import (
+    EventName,
+    HistogramInstrumentation,
+    LatencyHistogram,
+    record_event,
+    set_instrumentation,
+    start_timer,
+)
+
+
+class TestInstrumentation:
+    def setup_method(self, method):
+        self.instrumentation = HistogramInstrumentation()
+
+    def teardown_method(self, method):
+        set_instrumentation(None)
+
+    def test_histogram_percentiles(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.add(float(value))
+
+        summary = histogram.get_summary()
+        assert summary['count'] == 100
+        assert summary['mean'] == 50.5
+        assert summary['min'] == 1
+        assert summary['max'] == 100
+        for percentile in ('p50', 'p95', 'p99'):
+            expected = int(percentile[1:])
+            assert expected <= summary[percentile] <= expected * 1.1
+
+    def test_empty_histogram(self):
+        summary = LatencyHistogram().get_summary()
+        assert summary['count'] == 0
+        assert summary['p99'] == 0
+
+    def test_disabled(self):
+        assert start_timer() is None
+        # No-op without an instrumentation
+        record_event(EventName.SEND, object(), None)
+
+    def test_record_event(self):
+        instrumentation = self.instrumentation
+        set_instrumentation(instrumentation)
+        connection = object()
+        record_event(EventName.SEND, connection, start_timer(), applet_id=3)
+
+        summary = instrumentation.get_summary()
+        assert summary['applets'][3][EventName.SEND]['count'] == 1
+        (device,) = summary['devices'].values()
+        assert device[EventName.SEND]['count'] == 1
+
+        instrumentation.reset()
+        assert instrumentation.get_summary() == {'devices': {}, 'applets': {}}
+
+    def test_operation_events(self):
+        instrumentation = self.instrumentation
+        set_instrumentation(instrumentation)
+
+        async def _test():
+            connection = await SimulatedDeviceConnection.create({'confirmation_delay': 50})
+            sdk = await SDK.create(connection, 3, {'probe_cache': None})
+
+            async def operation():
+                await sdk.send_query(b'\x01' * 64)
+                return await sdk.wait_for_result()
+
+            assert await sdk.run_operation(operation) == b'\x01' * 64
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+        applet = instrumentation.get_summary()['applets'][3]
+        for name in (
+            EventName.ENCODE,
+            EventName.SEND,
+            EventName.ACK,
+            EventName.POLL,
+            EventName.MAKE_DEVICE_READY,
+        ):
+            assert applet[name]['count'] > 0
+        assert EventName.RETRY not in applet
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import tempfile
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from packages.interfaces import DeviceState
+from packages.interfaces.__mocks__.connection import MockDeviceConnection
+from packages.core.src.sdk import SDK
+from packages.core.src.utils.probe_cache import ProbeCache, get_connection_identity
+from packages.core.src.encoders.proto.generated.core import AppVersionResultResponse
+
+
+async def _create_connection(serial: str = 'ABCD') -> MockDeviceConnection:
+    connection = await MockDeviceConnection.create()
+    connection.serial = serial
+    return connection
+
+
+class TestProbeCache:
+    def test_connection_identity(self):
+        connection = MockDeviceConnection()
+        assert get_connection_identity(connection) is None
+
+        connection.port = '/dev/ttyACM0'
+        assert get_connection_identity(connection) == 'path:/dev/ttyACM0'
+
+        connection.serial = 'ABCD'
+        assert get_connection_identity(connection) == 'serial:ABCD'
+
+        connection.device = {'path': '1-1', 'serial': None}
+        assert get_connection_identity(connection) == 'path:1-1'
+
+    def test_get_and_set(self):
+        async def _test():
+            cache = ProbeCache()
+            connection = await _create_connection()
+            key = await cache.get_key(connection)
+
+            assert cache.get(key) is None
+            cache.set(key, '2.1.0', 'v3')
+            assert cache.get(key)['sdkVersion'] == '2.1.0'
+            assert cache.get(key)['packetVersion'] == 'v3'
+
+            # Keyed by device state
+            connection.configure_device(DeviceState.INITIAL, connection.connection_type)
+            assert cache.get(await cache.get_key(connection)) is None
+
+            cache.set(await cache.get_key(connection), '2.1.0', 'v3')
+            assert len(cache) == 2
+            cache.invalidate(connection)
+            assert len(cache) == 0
+
+        asyncio.run(_test())
+
+    def test_ttl(self):
+        cache = ProbeCache(ttl=1000)
+        with patch('packages.core.src.utils.probe_cache.time.time', return_value=100):
+            cache.set('key', '2.1.0', 'v3')
+        with patch('packages.core.src.utils.probe_cache.time.time', return_value=100.5):
+            assert cache.get('key') is not None
+        with patch('packages.core.src.utils.probe_cache.time.time', return_value=101):
+            assert cache.get('key') is None
+
+        with pytest.raises(Exception):
+            ProbeCache(ttl=0)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'probes.json')
+            cache = ProbeCache(path=path)
+            cache.set('key', '2.1.0', 'v3')
+            cache.set_app_versions('key', AppVersionResultResponse())
+
+            loaded = ProbeCache(path=path)
+            assert loaded.get('key')['sdkVersion'] == '2.1.0'
+            assert loaded.get('key')['appVersions'] is not None
+
+            loaded.invalidate()
+            assert len(ProbeCache(path=path)) == 0
+
+    def test_sdk_create_uses_cache(self):
+        async def _test():
+            cache = ProbeCache()
+            connection = await _create_connection()
+            get_sdk_version = AsyncMock(
+                return_value={'sdkVersion': '3.0.1', 'packetVersion': 'v3'}
+            )
+
+            with patch.object(SDK, 'get_sdk_version', get_sdk_version):
+                sdk = await SDK.create(connection, 0, {'probe_cache': cache})
+                assert sdk.get_version() == '3.0.1'
+                sdk = await SDK.create(connection, 0, {'probe_cache': cache})
+                assert sdk.get_packet_version() == 'v3'
+                assert get_sdk_version.await_count == 1
+
+                app_versions = AppVersionResultResponse(app_versions=[])
+                cache.set_app_versions(sdk.probe_key, app_versions)
+                sdk = await SDK.create(connection, 0, {'probe_cache': cache})
+                assert sdk.app_versions_map is app_versions
+                assert await sdk.get_app_versions() is app_versions
+
+                sdk.invalidate_probe_cache()
+                await SDK.create(connection, 0, {'probe_cache': cache})
+                assert get_sdk_version.await_count == 2
+
+                await SDK.create(connection, 0, {'probe_cache': None})
+                assert get_sdk_version.await_count == 3
+
+        asyncio.run(_test())
@@ -0,0 +1,49 @@
+import pytest
+
+from packages.core.src.utils.feature_map import FeatureName, is_feature_enabled
+from packages.core.src.utils.packetversion import PacketVersionMap
+from packages.core.src.utils.sdk_version import (
+    format_sdk_version,
+    get_packet_version_from_sdk,
+    is_valid_version,
+)
+from packages.core.src.utils.version_compare import compare_versions, parse_version
+
+
+class TestSdkVersions:
+    def test_get_packet_version_from_sdk(self):
+        assert get_packet_version_from_sdk('0.0.1') == PacketVersionMap.v1
+        assert get_packet_version_from_sdk('0.9.9') == PacketVersionMap.v1
+        assert get_packet_version_from_sdk('1.0.0') == PacketVersionMap.v2
+        assert get_packet_version_from_sdk('2.0.0') == PacketVersionMap.v3
+        assert get_packet_version_from_sdk('3.0.1') == PacketVersionMap.v3
+        assert get_packet_version_from_sdk('0.0.0') is None
+        assert get_packet_version_from_sdk('4.0.0') is None
+
+        with pytest.raises(Exception):
+            get_packet_version_from_sdk('invalid')
+
+    def test_is_feature_enabled(self):
+        assert is_feature_enabled(FeatureName.RawCommand, '2.0.0')
+        assert is_feature_enabled(FeatureName.RawCommand, '2.9.9')
+        assert not is_feature_enabled(FeatureName.RawCommand, '3.0.0')
+        assert is_feature_enabled(FeatureName.ProtoCommand, '3.0.0')
+        assert not is_feature_enabled(FeatureName.ProtoCommand, '1.0.0')
+        assert not is_feature_enabled(FeatureName.ProtoCommand, 'invalid')
+        assert not is_feature_enabled(FeatureName.ProtoCommand, None)
+
+    def test_compare_versions(self):
+        assert compare_versions('1.0.0', '1.0.1') == -1
+        assert compare_versions('1.10.0', '1.9.0') == 1
+        assert compare_versions('1.0.0', '1.0.0') == 0
+        assert compare_versions('1.0.0-beta', '1.0.0') == -1
+        assert compare_versions('invalid', '1.0.0') == 0
+        assert parse_version('1.2.3') is parse_version('1.2.3')
+
+    def test_format_sdk_version(self):
+        assert format_sdk_version('000300000001') == '3.0.1'
+        assert is_valid_version('3.0.1')
+        assert not is_valid_version('invalid')
+
+        with pytest.raises(Exception):
+            format_sdk_version('0003')
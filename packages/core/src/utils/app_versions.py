@@ -0,0 +1,78 @@
+from typing import Dict, Optional, Tuple
+
+from packages.core.src.encoders.proto.generated.common import Version
+from packages.core.src.encoders.proto.generated.core import AppVersionResultResponse
+from packages.core.src.utils.version_compare import compare_versions, parse_version_tuple
+
+VersionTuple = Tuple[int, int, int]
+
+
+def format_app_version(app_version: Version) -> str:
+    return f"{app_version.major}.{app_version.minor}.{app_version.patch}"
+
+
+class AppVersionsIndex:
+    """
+    App versions of a device indexed by app id, with the version of every
+    app parsed once so that compatibility checks do not walk the version
+    list or parse version strings again.
+    """
+
+    def __init__(self, app_versions: AppVersionResultResponse):
+        self.app_versions = app_versions
+        self.versions: Dict[int, Optional[Version]] = {}
+        self.tuples: Dict[int, VersionTuple] = {}
+
+        for app in app_versions.app_versions or []:
+            # Same as the linear search this replaces: the first entry wins
+            if app.id in self.versions:
+                continue
+            self.versions[app.id] = app.version
+            if not app.version:
+                continue
+            self.tuples[app.id] = (
+                app.version.major,
+                app.version.minor,
+                app.version.patch,
+            )
+
+    def get(self, app_id: int) -> Optional[Version]:
+        return self.versions.get(app_id)
+
+    def get_string(self, app_id: int) -> Optional[str]:
+        app_version = self.versions.get(app_id)
+        return format_app_version(app_version) if app_version else None
+
+    def is_compatible(
+        self,
+        app_id: int,
+        from_version: str,
+        to_version: Optional[str] = None,
+    ) -> Optional[bool]:
+        """
+        Check `from_version <= app version < to_version`.
+
+        Returns:
+            Optional[bool]: None if the device does not have the app
+        """
+        app_tuple = self.tuples.get(app_id)
+        if app_tuple is None:
+            return None
+
+        if not _is_before_or_equal(from_version, app_tuple):
+            return False
+
+        if to_version and _is_before_or_equal(to_version, app_tuple):
+            return False
+
+        return True
+
+
+def _is_before_or_equal(version: str, app_tuple: VersionTuple) -> bool:
+    version_tuple = parse_version_tuple(version)
+    if version_tuple is not None:
+        return version_tuple <= app_tuple
+    return compare_versions(version, "{}.{}.{}".format(*app_tuple)) < 1
+
+
+__all__ = ["AppVersionsIndex", "format_app_version"]
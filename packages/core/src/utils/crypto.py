@@ -1,40 +1,60 @@
+from typing import Union
 from packages.util.utils.assert_utils import assert_condition
 from packages.util.utils.crypto import uint8array_to_hex
 from packages.core.src.config import v1, v2
 from packages.core.src.utils.packetversion import PacketVersion, PacketVersionMap
 
+ByteData = Union[bytes, bytearray, memoryview]
+
+_ESCAPE_BYTE = b'\xa3'
+_ESCAPED_ESCAPE_BYTE = b'\xa3\x33'
+_ESCAPED_STUFFING_BYTE = b'\xa3\x3a'
 
-def byte_unstuffing(input_buff: bytes, version: PacketVersion) -> str:
-    assert_condition(input_buff, 'Invalid inputBuff')
-    assert_condition(version, 'Invalid version')
-    assert_condition(len(input_buff) > 0, 'Byte unstuffing failed: 0 size')
 
+def _get_stuffing_byte(version: PacketVersion) -> bytes:
     usable_config = v1
     if version == PacketVersionMap.v2:
         usable_config = v2
 
-    size = len(input_buff)
-    output_data = []
+    return bytes([usable_config.constants.STUFFING_BYTE])
 
-    i = 0
-    while i < size:
-        if input_buff[i] == 0xa3 and i < size - 1:
-            if input_buff[i + 1] == 0x3a:
-                output_data.append(usable_config.constants.STUFFING_BYTE)
-                i += 1
-            elif input_buff[i + 1] == 0x33:
-                output_data.append(0xa3)
-                i += 1
-            else:
-                output_data.append(input_buff[i])
-        else:
-            output_data.append(input_buff[i])
-        i += 1
 
-    return uint8array_to_hex(bytes(output_data))
+def unstuff_bytes(input_buff: ByteData, version: PacketVersion) -> bytes:
+    """
+    Reverse `stuff_bytes`.
 
+    Args:
+        input_buff: Stuffed bytes
+        version: Packet version (v1 or v2)
 
-def byte_stuffing(input_buff: bytes, version: PacketVersion) -> str:
+    Returns:
+        bytes: Unstuffed bytes
+    """
+    assert_condition(input_buff, 'Invalid inputBuff')
+    assert_condition(version, 'Invalid version')
+    assert_condition(len(input_buff) > 0, 'Byte unstuffing failed: 0 size')
+
+    # The second byte of an escape sequence is never the escape byte itself,
+    # so replacing each sequence in turn gives the same result as a single
+    # left to right scan.
+    return (
+        bytes(input_buff)
+        .replace(_ESCAPED_STUFFING_BYTE, _get_stuffing_byte(version))
+        .replace(_ESCAPED_ESCAPE_BYTE, _ESCAPE_BYTE)
+    )
+
+
+def stuff_bytes(input_buff: ByteData, version: PacketVersion) -> bytes:
+    """
+    Escape the stuffing byte and the escape byte (0xa3) in `input_buff`.
+
+    Args:
+        input_buff: Bytes to stuff
+        version: Packet version (v1 or v2)
+
+    Returns:
+        bytes: Stuffed bytes
+    """
     assert_condition(input_buff, 'Invalid inputBuff')
     assert_condition(version, 'Invalid version')
     assert_condition(
@@ -42,19 +62,18 @@ def byte_stuffing(input_buff: bytes, version: PacketVersion) -> str:
         f'Byte stuffing failed: {len(input_buff)} size'
     )
 
-    usable_config = v1
-    if version == PacketVersionMap.v2:
-        usable_config = v2
+    # Escape bytes have to be handled first, otherwise the escape byte
+    # inserted for the stuffing byte would be escaped again.
+    return (
+        bytes(input_buff)
+        .replace(_ESCAPE_BYTE, _ESCAPED_ESCAPE_BYTE)
+        .replace(_get_stuffing_byte(version), _ESCAPED_STUFFING_BYTE)
+    )
+
+
+def byte_unstuffing(input_buff: bytes, version: PacketVersion) -> str:
+    return uint8array_to_hex(unstuff_bytes(input_buff, version))
+
 
-    output_data = []
-    for byte in input_buff:
-        if byte == usable_config.constants.STUFFING_BYTE:
-            output_data.append(0xa3)
-            output_data.append(0x3a)
-        elif byte == 0xa3:
-            output_data.append(0xa3)
-            output_data.append(0x33)
-        else:
-            output_data.append(byte)
-
-    return uint8array_to_hex(bytes(output_data))
\ No newline at end of file
+def byte_stuffing(input_buff: bytes, version: PacketVersion) -> str:
+    return uint8array_to_hex(stuff_bytes(input_buff, version))
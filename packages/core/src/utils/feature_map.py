@@ -1,7 +1,7 @@
 from enum import Enum
-from typing import Dict, Optional, TypedDict
-from packaging import version
-from packaging.version import InvalidVersion
+from typing import Dict, Optional, Tuple, TypedDict
+from packaging.version import InvalidVersion, Version
+from packages.core.src.utils.version_compare import parse_version
 
 
 class FeatureName(Enum):
@@ -21,6 +21,16 @@ FeatureMap: Dict[FeatureName, FeatureConfig] = {
 }
 
 
+# Parsed once, `is_feature_enabled` runs before every device operation
+_FEATURE_RANGES: Dict[FeatureName, Tuple[Version, Optional[Version]]] = {
+    name: (
+        parse_version(config["from_version"]),
+        parse_version(config["to_version"]) if config.get("to_version") else None,
+    )
+    for name, config in FeatureMap.items()
+}
+
+
 def is_feature_enabled(feature_name: FeatureName, sdk_version: str) -> bool:
     """
     Check if a feature is enabled for the given SDK version.
@@ -32,24 +42,23 @@ def is_feature_enabled(feature_name: FeatureName, sdk_version: str) -> bool:
     Returns:
         True if the feature is enabled, False otherwise
     """
-    if feature_name not in FeatureMap:
+    feature_range = _FEATURE_RANGES.get(feature_name)
+    if feature_range is None:
         return False
 
-    feature_config = FeatureMap[feature_name]
-    from_version = feature_config["from_version"]
-    to_version = feature_config.get("to_version")
+    from_version, to_version = feature_range
 
     try:
-        # Check if sdk_version >= from_version (compareVersions(from, sdkVersion) < 1)
-        enabled = version.parse(sdk_version) >= version.parse(from_version)
-
-        # If to_version is specified, check if sdk_version < to_version (compareVersions(to, sdkVersion) > 0)
-        if to_version:
-            enabled = enabled and version.parse(sdk_version) < version.parse(to_version)
-
-        return enabled
+        parsed_sdk_version = parse_version(sdk_version)
     except (InvalidVersion, TypeError, ValueError):
         # If version parsing fails due to invalid version format, return False
         return False
 
+    # Check if sdk_version >= from_version (compareVersions(from, sdkVersion) < 1)
+    enabled = parsed_sdk_version >= from_version
+
+    # If to_version is specified, check if sdk_version < to_version (compareVersions(to, sdkVersion) > 0)
+    if to_version is not None:
+        enabled = enabled and parsed_sdk_version < to_version
 
+    return enabled
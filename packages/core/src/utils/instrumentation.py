@@ -0,0 +1,288 @@
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Awaitable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Protocol,
+    Tuple,
+    TypedDict,
+    TypeVar,
+)
+
+from packages.core.src.utils.probe_cache import get_connection_identity
+
+T = TypeVar('T')
+
+# Smallest latency told apart by the histograms, in milliseconds
+MIN_LATENCY = 0.001
+# Every bucket is 10% wider than the previous one, percentiles are
+# reported within 10% of the actual value whatever the scale
+BUCKET_GROWTH = 1.1
+_LOG_BUCKET_GROWTH = math.log(BUCKET_GROWTH)
+
+
+class EventName:
+    # Encoding of one packet
+    ENCODE = 'encode'
+    # `connection.send` of one packet
+    SEND = 'send'
+    # From waiting for a packet until the device answered it
+    ACK = 'ack'
+    # A failed attempt of `send_command` or `get_command_output` that is retried
+    RETRY = 'retry'
+    # One status poll of `wait_for_result`, including the wait after it
+    POLL = 'poll'
+    MAKE_DEVICE_READY = 'make_device_ready'
+
+
+class InstrumentationEvent(TypedDict):
+    name: str
+    # In milliseconds
+    duration: float
+    device: str
+    applet_id: Optional[int]
+    attributes: Dict[str, Any]
+
+
+class IInstrumentation(Protocol):
+    def record(self, event: InstrumentationEvent) -> None:
+        ...
+
+
+class LatencySummary(TypedDict):
+    count: int
+    mean: float
+    min: float
+    max: float
+    p50: float
+    p95: float
+    p99: float
+
+
+_instrumentation: Optional[IInstrumentation] = None
+
+_current_applet_id: ContextVar[Optional[int]] = ContextVar(
+    'instrumentation_applet_id', default=None
+)
+
+
+def set_instrumentation(instrumentation: Optional[IInstrumentation]) -> None:
+    """
+    Sets the instrumentation receiving the timing events of the sdk, None
+    disables it (the default).
+    """
+    global _instrumentation
+    _instrumentation = instrumentation
+
+
+def get_instrumentation() -> Optional[IInstrumentation]:
+    return _instrumentation
+
+
+@contextmanager
+def applet_scope(applet_id: Optional[int]) -> Iterator[None]:
+    """
+    Attributes the events recorded within to `applet_id`.
+    """
+    token = _current_applet_id.set(applet_id)
+    try:
+        yield
+    finally:
+        _current_applet_id.reset(token)
+
+
+def start_timer() -> Optional[float]:
+    """
+    Start time of an event, None when instrumentation is disabled so the
+    matching `record_event` is a no-op.
+    """
+    if _instrumentation is None:
+        return None
+    return time.perf_counter()
+
+
+def get_device_key(connection: Any) -> str:
+    identity = get_connection_identity(connection)
+    if identity:
+        return identity
+    return f'{type(connection).__name__}:{id(connection):x}'
+
+
+def record_event(
+    name: str,
+    connection: Any,
+    started: Optional[float],
+    attributes: Optional[Dict[str, Any]] = None,
+    applet_id: Optional[int] = None,
+) -> None:
+    instrumentation = _instrumentation
+    if started is None or instrumentation is None:
+        return
+
+    instrumentation.record(InstrumentationEvent(
+        name=name,
+        duration=(time.perf_counter() - started) * 1000,
+        device=get_device_key(connection),
+        applet_id=applet_id if applet_id is not None else _current_applet_id.get(),
+        attributes=attributes or {},
+    ))
+
+
+async def timed(
+    name: str,
+    connection: Any,
+    awaitable: Awaitable[T],
+    attributes: Optional[Dict[str, Any]] = None,
+) -> T:
+    started = start_timer()
+    result = await awaitable
+    record_event(name, connection, started, attributes)
+    return result
+
+
+def timed_iter(
+    name: str,
+    connection: Any,
+    iterable: Iterable[T],
+) -> Iterator[T]:
+    """
+    Records the time taken to produce every item of a lazy iterable.
+    """
+    iterator = iter(iterable)
+    while True:
+        started = start_timer()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        record_event(name, connection, started)
+        yield item
+
+
+class LatencyHistogram:
+    """
+    Histogram of latencies in milliseconds with logarithmic buckets, so
+    memory stays bounded and percentiles keep the same relative precision
+    from microseconds to minutes.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._buckets: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        if value <= MIN_LATENCY:
+            index = 0
+        else:
+            index = math.ceil(math.log(value / MIN_LATENCY) / _LOG_BUCKET_GROWTH)
+
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Upper bound of the bucket holding the given percentile (0-100).
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = max(math.ceil(percentile / 100 * self.count), 1)
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                bound = MIN_LATENCY * BUCKET_GROWTH ** index
+                return min(max(bound, self.min), self.max)
+
+        return self.max
+
+    def get_summary(self) -> LatencySummary:
+        return LatencySummary(
+            count=self.count,
+            mean=self.total / self.count if self.count else 0.0,
+            min=self.min if self.count else 0.0,
+            max=self.max,
+            p50=self.percentile(50),
+            p95=self.percentile(95),
+            p99=self.percentile(99),
+        )
+
+
+class HistogramInstrumentation:
+    """
+    Aggregates the timing events in memory into one latency histogram per
+    event name, by device and by applet.
+
+    Example:
+        instrumentation = HistogramInstrumentation()
+        set_instrumentation(instrumentation)
+        await app.get_wallets()
+        print(instrumentation.get_summary()['applets'])
+    """
+
+    def __init__(self):
+        self.devices: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.applets: Dict[Tuple[Optional[int], str], LatencyHistogram] = {}
+
+    def record(self, event: InstrumentationEvent) -> None:
+        name = event['name']
+        duration = event['duration']
+
+        self._get_histogram(self.devices, (event['device'], name)).add(duration)
+        self._get_histogram(self.applets, (event['applet_id'], name)).add(duration)
+
+    @staticmethod
+    def _get_histogram(histograms: Dict[Any, LatencyHistogram], key: Any) -> LatencyHistogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = LatencyHistogram()
+            histograms[key] = histogram
+        return histogram
+
+    def get_summary(self) -> Dict[str, Dict[Any, Dict[str, LatencySummary]]]:
+        """
+        Summaries by device and by applet, then by event name:
+        `{'devices': {device: {name: summary}}, 'applets': {applet_id: ...}}`.
+        Events outside of an applet operation are under the applet id None.
+        """
+        summary: Dict[str, Dict[Any, Dict[str, LatencySummary]]] = {
+            'devices': {},
+            'applets': {},
+        }
+        for group, histograms in (('devices', self.devices), ('applets', self.applets)):
+            for (key, name), histogram in histograms.items():
+                summary[group].setdefault(key, {})[name] = histogram.get_summary()
+        return summary
+
+    def reset(self) -> None:
+        self.devices.clear()
+        self.applets.clear()
+
+
+__all__ = [
+    'EventName',
+    'HistogramInstrumentation',
+    'IInstrumentation',
+    'InstrumentationEvent',
+    'LatencyHistogram',
+    'LatencySummary',
+    'applet_scope',
+    'get_instrumentation',
+    'record_event',
+    'set_instrumentation',
+    'start_timer',
+    'timed',
+    'timed_iter',
+]
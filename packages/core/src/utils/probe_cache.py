@@ -0,0 +1,214 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, TypedDict
+
+from packages.interfaces import IDeviceConnection
+from packages.util.utils.assert_utils import assert_condition
+from packages.core.src.utils.packetversion import PacketVersion
+from packages.core.src.utils.logger import logger
+from packages.core.src.utils.app_versions import AppVersionsIndex
+from packages.core.src.encoders.proto.generated.core import AppVersionResultResponse
+
+# 5 minutes
+DEFAULT_PROBE_CACHE_TTL = 5 * 60 * 1000
+
+
+class ProbeCacheEntry(TypedDict):
+    sdkVersion: str
+    packetVersion: Optional[PacketVersion]
+    appVersions: Optional[AppVersionsIndex]
+    expiresAt: float
+
+
+def get_connection_identity(connection: Any) -> Optional[str]:
+    """
+    Identity of the physical device behind a connection, stable across
+    reconnects: the device serial if known, otherwise its path.
+
+    Returns None when the connection does not expose either, such
+    connections are never cached.
+    """
+    device = getattr(connection, 'device', None)
+    if isinstance(device, dict):
+        serial = device.get('serial')
+        path = device.get('path')
+    else:
+        serial = getattr(connection, 'serial', None)
+        path = getattr(connection, 'port', None)
+
+    if isinstance(serial, str) and serial:
+        return f'serial:{serial}'
+    if isinstance(path, str) and path:
+        return f'path:{path}'
+
+    usb_device = getattr(connection, 'connection', None)
+    bus = getattr(usb_device, 'bus', None)
+    address = getattr(usb_device, 'address', None)
+    if isinstance(bus, int) and isinstance(address, int):
+        return f'usb:{bus}:{address}'
+
+    return None
+
+
+class ProbeCache:
+    """
+    Caches the result of the probes done on every new connection (sdk
+    version, packet version and app versions) by device identity and
+    device state, so reconnecting to the same device skips the handshake.
+
+    Entries expire after `ttl` milliseconds and have to be invalidated when
+    the firmware of the device changes. When `path` is given entries are
+    persisted to that JSON file and loaded back on creation.
+    """
+
+    def __init__(
+        self,
+        ttl: int = DEFAULT_PROBE_CACHE_TTL,
+        path: Optional[str] = None,
+    ):
+        assert_condition(ttl > 0, 'Invalid ttl')
+
+        self.ttl = ttl
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, ProbeCacheEntry] = {}
+
+        if path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_key(self, connection: IDeviceConnection) -> Optional[str]:
+        identity = get_connection_identity(connection)
+        if identity is None:
+            return None
+
+        device_state = await connection.get_device_state()
+        return f'{identity}|{getattr(device_state, "value", device_state)}'
+
+    def get(self, key: Optional[str]) -> Optional[ProbeCacheEntry]:
+        if key is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if entry['expiresAt'] <= time.time():
+                del self._entries[key]
+                return None
+
+            return entry
+
+    def set(
+        self,
+        key: Optional[str],
+        sdk_version: str,
+        packet_version: Optional[PacketVersion],
+    ) -> None:
+        if key is None:
+            return
+
+        with self._lock:
+            self._entries[key] = {
+                'sdkVersion': sdk_version,
+                'packetVersion': packet_version,
+                'appVersions': None,
+                'expiresAt': time.time() + self.ttl / 1000,
+            }
+        self._save()
+
+    def set_app_versions(
+        self,
+        key: Optional[str],
+        app_versions: AppVersionResultResponse,
+    ) -> Optional[AppVersionsIndex]:
+        """
+        Store the app versions of the device, returns the index built for
+        them or None if the device has no entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key) if key is not None else None
+            if entry is None:
+                return None
+            entry['appVersions'] = AppVersionsIndex(app_versions)
+        self._save()
+        return entry['appVersions']
+
+    def invalidate(self, connection: Optional[Any] = None) -> None:
+        """
+        Drop the entries of the device behind `connection`, in every device
+        state, or every entry if no connection is given.
+        """
+        with self._lock:
+            if connection is None:
+                self._entries.clear()
+            else:
+                identity = get_connection_identity(connection)
+                if identity is None:
+                    return
+                prefix = f'{identity}|'
+                for key in [key for key in self._entries if key.startswith(prefix)]:
+                    del self._entries[key]
+        self._save()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+
+            now = time.time()
+            for key, entry in data.items():
+                if entry['expiresAt'] <= now:
+                    continue
+                app_versions = entry.get('appVersions')
+                self._entries[key] = {
+                    'sdkVersion': entry['sdkVersion'],
+                    'packetVersion': entry.get('packetVersion'),
+                    'appVersions': (
+                        AppVersionsIndex(
+                            AppVersionResultResponse().parse(bytes.fromhex(app_versions))
+                        )
+                        if app_versions is not None else None
+                    ),
+                    'expiresAt': entry['expiresAt'],
+                }
+        except Exception as error:
+            logger.warn('Failed to load probe cache')
+            logger.warn(error)
+            self._entries.clear()
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+
+        with self._lock:
+            data = {
+                key: {
+                    **entry,
+                    'appVersions': (
+                        bytes(entry['appVersions'].app_versions).hex()
+                        if entry['appVersions'] is not None else None
+                    ),
+                }
+                for key, entry in self._entries.items()
+            }
+
+        try:
+            temp_path = f'{self.path}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(temp_path, self.path)
+        except Exception as error:
+            logger.warn('Failed to save probe cache')
+            logger.warn(error)
+
+
+default_probe_cache = ProbeCache()
@@ -1,8 +1,9 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from packaging.version import Version
 from packages.util.utils.assert_utils import assert_condition
 from packages.util.utils.crypto import format_hex, is_hex
-from packaging import version
 from packages.core.src.utils.packetversion import PacketVersion, PacketVersionMap
+from packages.core.src.utils.version_compare import parse_version
 
 SDK_TO_PACKET_VERSION_MAP: List[Dict[str, Any]] = [
     {'from': '0.0.1', 'to': '1.0.0', 'packetVersion': PacketVersionMap.v1},
@@ -11,10 +12,20 @@ SDK_TO_PACKET_VERSION_MAP: List[Dict[str, Any]] = [
     {'from': '3.0.0', 'to': '4.0.0', 'packetVersion': PacketVersionMap.v3},
 ]
 
+# Parsed once, in the same order as SDK_TO_PACKET_VERSION_MAP
+_PACKET_VERSION_RANGES: List[Tuple[Version, Optional[Version], PacketVersion]] = [
+    (
+        parse_version(elem['from']),
+        parse_version(elem['to']) if elem.get('to') else None,
+        elem['packetVersion'],
+    )
+    for elem in SDK_TO_PACKET_VERSION_MAP
+]
+
 
 def is_valid_version(version_string: str) -> bool:
     try:
-        version.parse(version_string)
+        parse_version(version_string)
         return True
     except Exception:
         return False
@@ -24,19 +35,18 @@ def get_packet_version_from_sdk(sdk_version: str) -> Optional[PacketVersion]:
     assert_condition(sdk_version, 'Invalid sdkVersion')
     assert_condition(is_valid_version(sdk_version), 'Invalid sdkVersion')
 
-    for elem in SDK_TO_PACKET_VERSION_MAP:
-        try:
-            # Check if sdk_version >= from_version
-            enabled = version.parse(sdk_version) >= version.parse(elem['from'])
+    parsed_sdk_version = parse_version(sdk_version)
+
+    for from_version, to_version, packet_version in _PACKET_VERSION_RANGES:
+        # Check if sdk_version >= from_version
+        enabled = parsed_sdk_version >= from_version
 
-            # If to_version exists, check if sdk_version < to_version
-            if elem.get('to'):
-                enabled = enabled and version.parse(sdk_version) < version.parse(elem['to'])
+        # If to_version exists, check if sdk_version < to_version
+        if to_version is not None:
+            enabled = enabled and parsed_sdk_version < to_version
 
-            if enabled:
-                return elem['packetVersion']
-        except Exception:
-            continue
+        if enabled:
+            return packet_version
 
     return None
 
@@ -1,5 +1,19 @@
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
 from packaging import version
 
+_RELEASE_VERSION = re.compile(r'^v?(\d+)\.(\d+)\.(\d+)$')
+
+
+@lru_cache(maxsize=256)
+def parse_version(version_string: str) -> version.Version:
+    """
+    Memoized `packaging.version.parse`, raises the same errors for invalid
+    versions (errors are not cached).
+    """
+    return version.parse(version_string)
+
 
 def compare_versions(version1: str, version2: str) -> int:
     """
@@ -13,8 +27,8 @@ def compare_versions(version1: str, version2: str) -> int:
     This mimics the compare-versions JavaScript library behavior.
     """
     try:
-        v1 = version.parse(version1)
-        v2 = version.parse(version2)
+        v1 = parse_version(version1)
+        v2 = parse_version(version2)
         
         if v1 < v2:
             return -1
@@ -27,4 +41,19 @@ def compare_versions(version1: str, version2: str) -> int:
         return 0
 
 
-__all__ = ["compare_versions"] 
\ No newline at end of file
+@lru_cache(maxsize=256)
+def parse_version_tuple(version_string: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Parse a plain `major.minor.patch` version into a tuple which compares
+    the same way as `compare_versions`.
+
+    Returns None for anything else (e.g. pre-releases), such versions have
+    to be compared with `compare_versions`.
+    """
+    match = _RELEASE_VERSION.match(version_string.strip())
+    if not match:
+        return None
+    return (int(match.group(1)), int(match.group(2)), int(match.group(3)))
+
+
+__all__ = ["compare_versions", "parse_version", "parse_version_tuple"] 
\ No newline at end of file
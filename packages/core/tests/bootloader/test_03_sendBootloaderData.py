@@ -96,6 +96,143 @@ class TestSendBootloaderData:
 
         asyncio.run(_test())
 
+    @pytest.mark.parametrize("test_case", send_bootloader_data_test_cases["valid"])
+    def test_should_be_able_to_send_data_with_window(self, setup, test_case):
+        """Test sending bootloader data with several packets in flight"""
+        async def _test():
+            connection, sdk = await setup.__anext__()
+
+            sent_packets = []
+            progress = []
+            throughput = []
+
+            async def on_data(data: bytes):
+                assert data in test_case["packets"]
+                sent_packets.append(data)
+
+            connection.configure_listeners(on_data)
+
+            async def acknowledge():
+                # Answer every packet sent so far in one read, as a device
+                # draining its receive buffer would
+                acknowledged = 0
+                while acknowledged < len(test_case["packets"]):
+                    await asyncio.sleep(0.01)
+                    pending = len(sent_packets) - acknowledged
+                    if pending > 0:
+                        await connection.mock_device_send(bytes([6] * pending))
+                        acknowledged += pending
+
+            # Queue the receiving mode packet
+            await connection.mock_device_send(bytes([67]))
+
+            ack_task = asyncio.create_task(acknowledge())
+            await sdk.send_bootloader_data(test_case["data"], progress.append, {
+                "window_size": 4,
+                "first_timeout": config.defaultTimeout,
+                "timeout": config.defaultTimeout,
+                "on_throughput": throughput.append,
+            })
+            await ack_task
+
+            assert sent_packets == test_case["packets"]
+            assert progress[-1] == 100
+            assert throughput[-1]["bytes_sent"] == sum(len(p) for p in test_case["packets"])
+            assert throughput[-1]["retransmissions"] == 0
+
+        asyncio.run(_test())
+
+    @pytest.mark.parametrize("test_case", send_bootloader_data_test_cases["valid"])
+    def test_should_ignore_stray_bytes_with_window(self, setup, test_case):
+        """Test that bytes which are not an answer to a packet are ignored"""
+        async def _test():
+            connection, sdk = await setup.__anext__()
+
+            sent_packets = []
+
+            async def on_data(data: bytes):
+                sent_packets.append(data)
+                # A receiving mode byte before the ACK
+                await connection.mock_device_send(bytes([67, 6]))
+
+            connection.configure_listeners(on_data)
+
+            # Queue the receiving mode packet
+            await connection.mock_device_send(bytes([67]))
+
+            throughput = []
+            await sdk.send_bootloader_data(test_case["data"], None, {
+                "window_size": 4,
+                "max_tries": 1,
+                "first_timeout": config.defaultTimeout,
+                "timeout": config.defaultTimeout,
+                "on_throughput": throughput.append,
+            })
+
+            assert sent_packets == test_case["packets"]
+            assert throughput[-1]["retransmissions"] == 0
+
+        asyncio.run(_test())
+
+    @pytest.mark.parametrize("test_case", send_bootloader_data_test_cases["valid"])
+    def test_should_retransmit_rejected_packets_with_window(self, setup, test_case):
+        """Test that the packets rejected by the device are sent again"""
+        async def _test():
+            connection, sdk = await setup.__anext__()
+
+            sent_packets = []
+            rejected = set()
+
+            async def on_data(data: bytes):
+                packet_index = test_case["packets"].index(data)
+                sent_packets.append(packet_index)
+                if packet_index not in rejected:
+                    rejected.add(packet_index)
+                    await connection.mock_device_send(bytes([0x0c]))  # FLASH_WRITE_ERROR
+                else:
+                    await connection.mock_device_send(bytes([6]))
+
+            connection.configure_listeners(on_data)
+
+            # Queue the receiving mode packet
+            await connection.mock_device_send(bytes([67]))
+
+            await sdk.send_bootloader_data(test_case["data"], None, {
+                "window_size": 4,
+                "max_tries": 2,
+                "first_timeout": config.defaultTimeout,
+                "timeout": config.defaultTimeout,
+            })
+
+            for index in range(len(test_case["packets"])):
+                assert sent_packets.count(index) == 2
+
+        asyncio.run(_test())
+
+    @pytest.mark.parametrize("test_case", send_bootloader_data_test_cases["valid"])
+    def test_should_return_device_error_with_window(self, setup, test_case):
+        """Test that a packet rejected more than max_tries times fails the upload"""
+        async def _test():
+            connection, sdk = await setup.__anext__()
+
+            async def on_data(data: bytes):
+                await connection.mock_device_send(bytes([0x0c]))  # FLASH_WRITE_ERROR
+
+            connection.configure_listeners(on_data)
+
+            # Queue the receiving mode packet
+            await connection.mock_device_send(bytes([67]))
+
+            with pytest.raises(DeviceBootloaderError):
+                await sdk.send_bootloader_data(test_case["data"], None, {
+                    "window_size": 4,
+                    "max_tries": 2,
+                    "first_timeout": config.defaultTimeout,
+                    "timeout": config.defaultTimeout,
+                })
+
+        asyncio.run(_test())
+
     @pytest.mark.parametrize("test_case", send_bootloader_data_test_cases["valid"])
     def test_should_return_valid_errors_when_device_is_not_in_receiving_mode(self, setup, test_case):
         """Test error when device is not in receiving mode"""
@@ -1,10 +1,14 @@
 import asyncio
 import pytest
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 from packages.interfaces.__mocks__.connection import MockDeviceConnection
 from packages.interfaces.errors.connection_error import DeviceConnectionError
 from packages.core.src.sdk import SDK
+from packages.core.src.encoders.proto.generated.core import DeviceIdleState
+from packages.core.src.operations.proto import getstatus, sendabort, waitforidle
+from packages.core.src.utils.packetversion import PacketVersionMap
 from packages.core.tests.proto.__fixtures__.send_Abort import fixtures, constant_date
 from packages.core.tests.__fixtures__.config import config as test_config
 
@@ -270,3 +274,39 @@ class TestSDKSendAbort:
                 })
         
         asyncio.run(_test())
+
+
+class TestSendAbortStatusCache:
+    """Test the status cached by send_abort"""
+
+    def test_should_cache_status_of_abort(self):
+        busy = SimpleNamespace(
+            current_cmd_seq=2,
+            device_idle_state=DeviceIdleState.DEVICE_IDLE_STATE_USB,
+        )
+        aborted = SimpleNamespace(
+            current_cmd_seq=3,
+            device_idle_state=DeviceIdleState.DEVICE_IDLE_STATE_IDLE,
+        )
+
+        async def _test():
+            connection = await MockDeviceConnection.create()
+            await connection.before_operation()
+            getstatus.set_last_status(connection, busy)
+            get_status = AsyncMock(return_value=busy)
+
+            with patch.object(sendabort, 'write_command', AsyncMock(return_value={'payload_data': ''})), \
+                    patch.object(sendabort, 'decode_payload_data', return_value={'protobuf_data': ''}), \
+                    patch.object(sendabort.Status, 'parse', return_value=aborted, create=True), \
+                    patch.object(waitforidle, 'get_status', get_status):
+                status = await sendabort.send_abort(connection, PacketVersionMap.v3, 3)
+
+            assert status is aborted
+            # The idle status of the abort is used instead of the busy one
+            # cached before it
+            get_status.assert_not_awaited()
+            assert getstatus.get_last_status(connection) is aborted
+
+            await connection.destroy()
+
+        asyncio.run(_test())
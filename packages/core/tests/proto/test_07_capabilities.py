@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from packages.interfaces import DeviceState
+from packages.interfaces.errors import DeviceCommunicationError, DeviceCompatibilityError
+from packages.interfaces.__mocks__.connection import MockDeviceConnection
+from packages.core.src.sdk import SDK
+from packages.core.src.utils.packetversion import PacketVersionMap
+
+
+class TestSDKCapabilities:
+    """Test the capability snapshot used by proto operations"""
+
+    def test_should_compute_capabilities_once(self):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+            sdk = SDK(connection, 1, '3.0.1', PacketVersionMap.v3)
+
+            with patch.object(connection, 'get_device_state', wraps=connection.get_device_state) as get_device_state:
+                assert await sdk.get_capabilities() == {
+                    'device_state': DeviceState.MAIN,
+                    'is_in_bootloader': False,
+                    'is_supported': True,
+                }
+                for _ in range(5):
+                    await sdk.validate_proto_operation()
+                    assert await sdk.is_supported()
+                assert get_device_state.await_count == 1
+
+                await sdk.before_operation()
+                await sdk.validate_proto_operation()
+                assert get_device_state.await_count == 2
+
+        asyncio.run(_test())
+
+    def test_should_refresh_capabilities_before_operation(self):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+            sdk = SDK(connection, 1, '3.0.1', PacketVersionMap.v3)
+            await sdk.validate_proto_operation()
+
+            connection.configure_device(DeviceState.BOOTLOADER, connection.connection_type)
+            await sdk.run_operation(AsyncMock())
+
+            assert await sdk.is_in_bootloader()
+            with pytest.raises(DeviceCommunicationError):
+                await sdk.validate_proto_operation()
+
+        asyncio.run(_test())
+
+    def test_should_reject_unsupported_sdk(self):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+
+            with pytest.raises(DeviceCompatibilityError):
+                await SDK(connection, 1, '2.0.0', PacketVersionMap.v3).validate_proto_operation()
+            with pytest.raises(DeviceCompatibilityError):
+                await SDK(connection, 1, '3.0.1', None).validate_proto_operation()
+
+        asyncio.run(_test())
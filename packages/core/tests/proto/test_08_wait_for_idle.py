@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from packages.interfaces.errors import DeviceConnectionError
+from packages.interfaces.errors.app_error import DeviceAppError
+from packages.interfaces.__mocks__.connection import MockDeviceConnection
+from packages.core.src.encoders.proto.generated.core import DeviceIdleState
+from packages.core.src.operations.proto import getstatus, waitforidle
+from packages.core.src.utils.packetversion import PacketVersionMap
+
+BUSY = SimpleNamespace(device_idle_state=DeviceIdleState.DEVICE_IDLE_STATE_USB)
+IDLE = SimpleNamespace(device_idle_state=DeviceIdleState.DEVICE_IDLE_STATE_IDLE)
+
+
+class TestWaitForIdle:
+    """Test wait_for_idle"""
+
+    def test_should_return_on_first_idle_status(self):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+            await connection.before_operation()
+            get_status = AsyncMock(return_value=IDLE)
+
+            with patch.object(waitforidle, 'get_status', get_status):
+                await waitforidle.wait_for_idle(connection, PacketVersionMap.v3)
+
+            assert get_status.await_count == 1
+
+        asyncio.run(_test())
+
+    def test_should_poll_once_per_recheck_time(self):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+            await connection.before_operation()
+            get_status = AsyncMock(side_effect=[BUSY, BUSY, IDLE])
+            loop = asyncio.get_running_loop()
+
+            with patch.object(waitforidle, 'get_status', get_status):
+                start = loop.time()
+                await waitforidle.wait_for_idle(connection, PacketVersionMap.v3)
+                elapsed = loop.time() - start
+
+            assert get_status.await_count == 3
+            assert 0.38 <= elapsed < 0.6
+
+        asyncio.run(_test())
+
+    def test_should_throw_error_on_timeout(self):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+            await connection.before_operation()
+            get_status = AsyncMock(return_value=BUSY)
+
+            with patch.object(waitforidle, 'get_status', get_status):
+                with pytest.raises(DeviceAppError):
+                    await waitforidle.wait_for_idle(
+                        connection, PacketVersionMap.v3, timeout=500
+                    )
+
+            assert get_status.await_count == 3
+
+        asyncio.run(_test())
+
+    def test_should_throw_error_when_device_is_disconnected(self):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+            await connection.destroy()
+            get_status = AsyncMock(return_value=IDLE)
+
+            with patch.object(waitforidle, 'get_status', get_status):
+                with pytest.raises(DeviceConnectionError):
+                    await waitforidle.wait_for_idle(connection, PacketVersionMap.v3)
+
+            get_status.assert_not_awaited()
+
+        asyncio.run(_test())
+
+    def test_should_short_circuit_from_last_status(self):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+            await connection.before_operation()
+            get_status = AsyncMock(return_value=BUSY)
+
+            getstatus._last_status[connection] = (0, IDLE)
+            with patch.object(getstatus.time, 'monotonic', return_value=0.1), \
+                    patch.object(waitforidle, 'get_status', get_status):
+                await waitforidle.wait_for_idle(connection, PacketVersionMap.v3)
+            get_status.assert_not_awaited()
+
+            getstatus.clear_last_status(connection)
+            assert getstatus.get_last_status(connection, 200) is None
+
+        asyncio.run(_test())
@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from packages.interfaces.__mocks__.connection import MockDeviceConnection
+from packages.core.src.encoders.proto.generated.core import DeviceIdleState
+from packages.core.src.operations.proto import getstatus
+from packages.core.src.sdk import SDK
+from packages.core.src.utils.packetversion import PacketVersionMap
+
+
+async def create_sdk():
+    connection = await MockDeviceConnection.create()
+    sdk = SDK(connection, 1, '3.0.1', PacketVersionMap.v3)
+    return connection, sdk
+
+
+class TestSDKSession:
+    """Test sdk.session"""
+
+    def test_should_make_device_ready_once(self):
+        async def _test():
+            connection, sdk = await create_sdk()
+            operation = AsyncMock(return_value='result')
+
+            with patch.object(sdk, 'make_device_ready', AsyncMock()) as make_device_ready, \
+                    patch.object(connection, 'before_operation', wraps=connection.before_operation) as before_operation, \
+                    patch.object(connection, 'after_operation', wraps=connection.after_operation) as after_operation:
+                async with sdk.session():
+                    for _ in range(3):
+                        assert await sdk.run_operation(operation) == 'result'
+                    assert await connection.is_connected()
+
+                assert make_device_ready.await_count == 1
+                assert before_operation.await_count == 1
+                assert after_operation.await_count == 1
+                assert operation.await_count == 3
+                assert not await connection.is_connected()
+
+        asyncio.run(_test())
+
+    def test_should_make_device_ready_again_after_error(self):
+        async def _test():
+            connection, sdk = await create_sdk()
+            operation = AsyncMock(side_effect=[Exception('failed'), 'result'])
+
+            with patch.object(sdk, 'make_device_ready', AsyncMock()) as make_device_ready:
+                async with sdk.session():
+                    with pytest.raises(Exception):
+                        await sdk.run_operation(operation)
+                    assert await sdk.run_operation(operation) == 'result'
+
+                assert make_device_ready.await_count == 2
+
+        asyncio.run(_test())
+
+    def test_should_make_device_ready_again_when_device_is_busy(self):
+        async def _test():
+            connection, sdk = await create_sdk()
+
+            async def busy_operation():
+                getstatus._last_status[connection] = (
+                    0, SimpleNamespace(device_idle_state=DeviceIdleState.DEVICE_IDLE_STATE_DEVICE)
+                )
+
+            with patch.object(sdk, 'make_device_ready', AsyncMock()) as make_device_ready:
+                async with sdk.session():
+                    await sdk.run_operation(busy_operation)
+                    await sdk.run_operation(AsyncMock())
+
+                assert make_device_ready.await_count == 2
+
+            getstatus.clear_last_status(connection)
+
+        asyncio.run(_test())
+
+    def test_should_support_nested_sessions(self):
+        async def _test():
+            connection, sdk = await create_sdk()
+
+            with patch.object(sdk, 'make_device_ready', AsyncMock()) as make_device_ready:
+                async with sdk.session():
+                    async with sdk.session():
+                        await sdk.run_operation(AsyncMock())
+                    assert await connection.is_connected()
+                    await sdk.run_operation(AsyncMock())
+
+                assert make_device_ready.await_count == 1
+                assert sdk.session_depth == 0
+                assert not await connection.is_connected()
+
+        asyncio.run(_test())
+
+    def test_should_run_operation_without_session(self):
+        async def _test():
+            connection, sdk = await create_sdk()
+
+            with patch.object(sdk, 'make_device_ready', AsyncMock()) as make_device_ready:
+                await sdk.run_operation(AsyncMock())
+                await sdk.run_operation(AsyncMock())
+
+                assert make_device_ready.await_count == 2
+
+        asyncio.run(_test())
@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from packages.interfaces.__mocks__.connection import MockDeviceConnection
+from packages.core.src.operations.proto import getstatus
+from packages.core.src.utils.packetversion import PacketVersionMap
+
+
+class MockStatusRequest:
+    """Answers every status request with a new status after `delay` seconds"""
+
+    def __init__(self, delay: float = 0.05, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {'protobuf_data': f'{self.calls:02x}'}
+
+
+def parse_status(data):
+    return SimpleNamespace(request=data[0])
+
+
+@pytest.fixture
+def status_request():
+    request = MockStatusRequest()
+    with patch.object(getstatus, 'get_status_helper', request), \
+            patch.object(getstatus.Status, 'parse', parse_status, create=True):
+        yield request
+
+
+class TestGetStatusSingleFlight:
+    """Test coalescing of concurrent get_status calls"""
+
+    def test_should_share_one_request_between_concurrent_calls(self, status_request):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+
+            statuses = await asyncio.gather(*(
+                getstatus.get_status(connection, PacketVersionMap.v3, dont_log=True)
+                for _ in range(5)
+            ))
+
+            assert status_request.calls == 1
+            assert all(status is statuses[0] for status in statuses)
+
+        asyncio.run(_test())
+
+    def test_should_serve_fresh_status_from_cache(self, status_request):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+
+            first = await getstatus.get_status(connection, PacketVersionMap.v3, dont_log=True)
+            second = await getstatus.get_status(
+                connection, PacketVersionMap.v3, dont_log=True, max_age=1000
+            )
+            assert second is first
+            assert status_request.calls == 1
+
+            third = await getstatus.get_status(
+                connection, PacketVersionMap.v3, dont_log=True, max_age=0
+            )
+            assert third.request == 2
+            assert status_request.calls == 2
+
+        asyncio.run(_test())
+
+    def test_should_not_share_requests_between_connections(self, status_request):
+        async def _test():
+            connections = [await MockDeviceConnection.create() for _ in range(2)]
+
+            await asyncio.gather(*(
+                getstatus.get_status(connection, PacketVersionMap.v3, dont_log=True)
+                for connection in connections
+            ))
+
+            assert status_request.calls == 2
+
+        asyncio.run(_test())
+
+    def test_should_raise_error_to_every_caller(self, status_request):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+            status_request.error = Exception('Read timeout')
+
+            results = await asyncio.gather(*(
+                getstatus.get_status(connection, PacketVersionMap.v3, dont_log=True)
+                for _ in range(3)
+            ), return_exceptions=True)
+
+            assert status_request.calls == 1
+            assert all(isinstance(result, Exception) for result in results)
+            assert getstatus.get_last_status(connection) is None
+
+            status_request.error = None
+            status = await getstatus.get_status(connection, PacketVersionMap.v3, dont_log=True)
+            assert status.request == 2
+
+        asyncio.run(_test())
+
+    def test_should_keep_request_when_a_caller_is_cancelled(self, status_request):
+        async def _test():
+            connection = await MockDeviceConnection.create()
+
+            cancelled = asyncio.ensure_future(
+                getstatus.get_status(connection, PacketVersionMap.v3, dont_log=True)
+            )
+            waiting = asyncio.ensure_future(
+                getstatus.get_status(connection, PacketVersionMap.v3, dont_log=True)
+            )
+            await asyncio.sleep(0.01)
+            cancelled.cancel()
+
+            status = await waiting
+            assert status.request == 1
+            assert status_request.calls == 1
+
+        asyncio.run(_test())
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import tempfile
+import time
+import pytest
+from unittest.mock import patch
+
+from packages.interfaces import DeviceState
+from packages.interfaces.errors import DeviceCommunicationError
+from packages.core.src.sdk import SDK
+from packages.core.src.encoders.packet import packet
+from packages.core.src.simulator import SimulatedDeviceConnection
+from packages.core.src.recorder import (
+    RecordType,
+    RecordingDeviceConnection,
+    ReplayDeviceConnection,
+    read_recording,
+)
+
+QUERIES = [b'\x01', bytes(range(256)) * 2]
+
+
+async def run_queries(connection, queries=QUERIES):
+    sdk = await SDK.create(connection, 3, {'probe_cache': None})
+
+    async def operation():
+        results = []
+        for data in queries:
+            await sdk.send_query(data)
+            results.append(await sdk.wait_for_result())
+        return results
+
+    return await sdk.run_operation(operation)
+
+
+async def record_session(path):
+    simulator = await SimulatedDeviceConnection.create({'latency': 2, 'chunk_size': 64})
+    connection = await RecordingDeviceConnection.create(simulator, path, {'name': 'queries'})
+    results = await run_queries(connection)
+    await connection.destroy()
+    return results
+
+
+class TestRecorder:
+    """Test recording a session and replaying it to the sdk"""
+
+    def setup_method(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'session.rec')
+
+    def teardown_method(self):
+        self.directory.cleanup()
+
+    def test_should_record_session(self):
+        assert asyncio.run(record_session(self.path)) == QUERIES
+
+        recording = read_recording(self.path)
+        metadata = recording['metadata']
+        assert metadata['device_state'] == DeviceState.MAIN.value
+        assert metadata['extra'] == {'name': 'queries'}
+
+        types = [record['type'] for record in recording['records']]
+        assert types[0] == RecordType.OPEN
+        assert types[-1] == RecordType.CLOSE
+        for record_type in (RecordType.SEND, RecordType.RECEIVE, RecordType.SEQUENCE_NUMBER):
+            assert record_type in types
+
+        timestamps = [record['timestamp'] for record in recording['records']]
+        assert timestamps == sorted(timestamps)
+
+    @pytest.mark.parametrize('speed', [0, 1])
+    def test_should_replay_session(self, speed):
+        asyncio.run(record_session(self.path))
+
+        async def _test():
+            connection = await ReplayDeviceConnection.create(
+                self.path, {'speed': speed, 'strict': True}
+            )
+            assert await run_queries(connection) == QUERIES
+            assert connection.is_finished()
+            assert connection.stats['mismatched_sends'] == 0
+            assert connection.stats['unexpected_sends'] == 0
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_replay_session_at_another_time(self):
+        asyncio.run(record_session(self.path))
+        now = time.time
+
+        async def _test():
+            connection = await ReplayDeviceConnection.create(
+                self.path, {'speed': 0, 'strict': True}
+            )
+            # The frames sent carry another timestamp and crc than the
+            # recorded ones
+            with patch.object(packet.time, 'time', lambda: now() + 1000):
+                assert await run_queries(connection) == QUERIES
+            assert connection.stats['mismatched_sends'] == 0
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_skip_zero_when_sequence_number_wraps(self):
+        asyncio.run(record_session(self.path))
+
+        async def _test():
+            connection = await ReplayDeviceConnection.create(self.path)
+            connection.records = []
+            connection.sequence_number = 0xffff
+            assert await connection.get_new_sequence_number() == 1
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_detect_diverging_sends(self):
+        asyncio.run(record_session(self.path))
+
+        async def _test():
+            connection = await ReplayDeviceConnection.create(
+                self.path, {'speed': 0, 'strict': True}
+            )
+            with pytest.raises(DeviceCommunicationError):
+                await run_queries(connection, [b'\x02'])
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_reject_invalid_recording(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'invalid')
+
+        with pytest.raises(AssertionError):
+            read_recording(self.path)
@@ -0,0 +1,172 @@
+import asyncio
+
+from packages.interfaces import DeviceState
+from packages.core.src.sdk import SDK
+from packages.core.src.simulator import SimulatedDeviceConnection
+
+
+async def create_sdk(options=None, applet_id=3):
+    connection = await SimulatedDeviceConnection.create(options)
+    sdk = await SDK.create(connection, applet_id, {'probe_cache': None})
+    await sdk.before_operation()
+    return connection, sdk
+
+
+class TestSimulator:
+    """Test the device simulator against the sdk"""
+
+    def test_should_answer_sdk_version(self):
+        async def _test():
+            connection, sdk = await create_sdk({'sdk_version': '2.7.1'})
+            assert sdk.get_version() == '2.7.1'
+            assert sdk.get_packet_version() == 'v3'
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_run_query(self):
+        async def _test():
+            connection, sdk = await create_sdk({'latency': 1, 'chunk_size': 16})
+
+            for data in (b'\x01', bytes(range(256)) * 4):
+                await sdk.send_query(data)
+                assert await sdk.wait_for_result() == data
+
+            assert connection.device.stats['commands'] == 2
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_skip_zero_when_sequence_number_wraps(self):
+        async def _test():
+            connection, sdk = await create_sdk()
+            connection.sequence_number = 0xfffe
+
+            sequence_numbers = []
+            for _ in range(3):
+                await sdk.send_query(b'\x01')
+                assert await sdk.wait_for_result() == b'\x01'
+                sequence_numbers.append(await connection.get_sequence_number())
+
+            assert sequence_numbers == [0xffff, 1, 2]
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_use_command_handler(self):
+        async def _test():
+            connection, sdk = await create_sdk({
+                'command_handlers': {3: lambda proto, raw: (proto, raw[::-1])},
+            })
+
+            await sdk.send_query(b'\x01\x02')
+            assert await sdk.wait_for_result() == b'\x02\x01'
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_report_user_confirmation(self):
+        async def _test():
+            connection, sdk = await create_sdk({'confirmation_delay': 100})
+            flow_status = []
+
+            await sdk.send_query(b'\x01')
+            await sdk.wait_for_result({'on_status': lambda status: flow_status.append(status.flow_status)})
+            assert 1 in flow_status
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_recover_from_faults(self):
+        async def _test():
+            connection, sdk = await create_sdk({'chunk_loss': 0.1, 'seed': 4})
+
+            for index in range(3):
+                data = bytes([index]) * 200
+                await sdk.send_query(data, {'timeout': 100})
+                assert await sdk.wait_for_result({'options': {'timeout': 100}}) == data
+
+            assert connection.device.stats['lost_chunks'] > 0
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_flash_firmware(self):
+        async def _test():
+            connection, sdk = await create_sdk({'device_state': DeviceState.BOOTLOADER}, applet_id=0)
+            firmware = bytes(range(256)) * 8
+
+            await sdk.send_bootloader_data(firmware, options={'timeout': 2000})
+            assert connection.device.installed_firmware == firmware
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_go_back_after_nack_with_window(self):
+        async def _test():
+            connection, sdk = await create_sdk({'device_state': DeviceState.BOOTLOADER}, applet_id=0)
+            device = connection.device
+            receive = device.receive
+            firmware = bytes(range(256)) * 8
+            sent = []
+
+            def receive_corrupting(data):
+                if data[0] == 0x01:
+                    if data[1] == 3 and 3 not in sent:
+                        # Bad crc, the bootloader answers with a NACK
+                        data = data[:-1] + bytes((data[-1] ^ 0xff,))
+                    sent.append(data[1])
+                receive(data)
+
+            async def receive_available():
+                # Like a serial port, one read returns all the answers received
+                chunks = []
+                while True:
+                    chunk = connection.pool.pop()
+                    if not chunk:
+                        return b''.join(chunks) or None
+                    chunks.append(chunk)
+
+            device.receive = receive_corrupting
+            connection.receive = receive_available
+            await sdk.send_bootloader_data(firmware, options={'timeout': 2000, 'window_size': 4})
+            assert device.installed_firmware == firmware
+
+            # Frames after the rejected one are dropped and sent again in order
+            resumed_at = sent.index(3, sent.index(3) + 1)
+            assert sent[:resumed_at] == list(range(1, sent[resumed_at - 1] + 1))
+            assert sent[resumed_at:] == list(range(3, len(firmware) // 128 + 1))
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_not_credit_late_answers_to_frames_sent_again(self):
+        async def _test(seed):
+            # Answers come after up to 260ms, often after the 100ms timeout
+            connection, sdk = await create_sdk({
+                'device_state': DeviceState.BOOTLOADER,
+                'latency': 2,
+                'jitter': 258,
+                'seed': seed,
+            }, applet_id=0)
+            device = connection.device
+            receive = device.receive
+            firmware = bytes(range(256)) * 8
+            end_of_transmissions = []
+
+            def receive_counting(data):
+                if data == b'\x04':
+                    end_of_transmissions.append(data)
+                receive(data)
+
+            device.receive = receive_counting
+            # Wait for the receiving mode byte, it is delayed too
+            await asyncio.sleep(0.3)
+            await sdk.send_bootloader_data(firmware, options={'timeout': 100, 'window_size': 4})
+
+            assert device.installed_firmware == firmware
+            assert len(end_of_transmissions) == 1
+            await connection.destroy()
+
+        for seed in (3, 5, 21):
+            asyncio.run(_test(seed))
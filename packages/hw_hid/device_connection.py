@@ -110,6 +110,9 @@ class DeviceConnection(IDeviceConnection):
     async def peek(self) -> List[PoolData]:
         return await self.data_listener.peek()
 
+    async def wait_for_data(self, timeout: Optional[int] = None) -> bool:
+        return await self.data_listener.wait_for_data(timeout)
+
     def on_close(self):
         self.is_port_open = False
 
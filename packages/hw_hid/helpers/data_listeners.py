@@ -1,10 +1,10 @@
 import asyncio
 import threading
 import time
-import uuid
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from packages.interfaces import IDevice, PoolData
+from packages.util.utils.receive_pool import ReceivePool
 
 from ..logger import logger
 from .connection import get_available_devices
@@ -18,7 +18,8 @@ class DataListener:
         self.on_error_callback = params.get("on_error")
         self.on_some_device_disconnect_binded = self.on_some_device_disconnect
         self.listening = False
-        self.pool: [PoolData] = []
+        self.pool = ReceivePool(**params.get("pool_options", {}))
+        self.data_signal = self.pool.data_signal
 
         self.read_timeout_id = None
         self.read_promise = None
@@ -43,12 +44,13 @@ class DataListener:
         return self.listening
 
     async def receive(self):
-        if self.pool:
-            return self.pool.pop(0).get("data")
-        return None
+        return self.pool.pop()
 
-    def peek(self):
-        return self.pool.copy()
+    def peek(self) -> List[PoolData]:
+        return self.pool.peek()
+
+    async def wait_for_data(self, timeout: Optional[int] = None) -> bool:
+        return await self.pool.wait_for_data(timeout)
 
     def clear_read_interval(self):
         if self.read_timeout_id:
@@ -65,6 +67,7 @@ class DataListener:
     def stop_listening(self):
         self.clear_read_interval()
         self.listening = False
+        self.data_signal.notify()
 
     def add_all_listeners(self) -> None:
         if not self._monitor_thread or not self._monitor_thread.is_alive():
@@ -111,7 +114,7 @@ class DataListener:
 
     async def on_data(self, data):
         if data and len(data) > 0:
-            self.pool.append({"id": str(uuid.uuid4()), "data": bytearray(data)})
+            self.pool.push(bytearray(data))
 
     async def on_close(self):
         self.stop_listening()
@@ -16,7 +16,8 @@ from .helpers import (
     get_available_devices,
     close_connection,
     open_connection,
-    DataListener
+    DataListener,
+    AsyncDataListener
 )
 
 
@@ -43,7 +44,10 @@ class DeviceConnection:
             self.connection.close()
 
         self.initialized = True
-        self.data_listener = DataListener({"connection": self.connection})
+        if AsyncDataListener.is_supported(self.connection):
+            self.data_listener = AsyncDataListener({"connection": self.connection})
+        else:
+            self.data_listener = DataListener({"connection": self.connection})
 
     async def get_connection_type(self) -> str:
         return ConnectionTypeMap.SERIAL_PORT.value
@@ -130,6 +134,9 @@ class DeviceConnection:
     async def peek(self) -> List[PoolData]:
         return self.data_listener.peek()
 
+    async def wait_for_data(self, timeout: Optional[int] = None) -> bool:
+        return await self.data_listener.wait_for_data(timeout)
+
     async def is_open(self) -> bool:
         """
         Check if the connection is open and ready to communicate.
@@ -145,9 +152,11 @@ class DeviceConnection:
             return
 
         await open_connection(self.connection)
+        self.data_listener.start_listening()
 
     async def close(self) -> None:
         """
         Close the connection.
         """
+        self.data_listener.stop_listening()
         return await close_connection(self.connection)
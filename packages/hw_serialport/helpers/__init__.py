@@ -1,10 +1,12 @@
 from .connection import get_available_devices
 from .dataListeners import DataListener
+from .asyncDataListener import AsyncDataListener
 from .utils import open_connection, close_connection
 
 __all__ = [
     'get_available_devices',
     'DataListener',
+    'AsyncDataListener',
     'open_connection',
     'close_connection'
 ]
@@ -0,0 +1,133 @@
+import asyncio
+import os
+from typing import List, Optional, Dict, Any
+import serial
+from packages.interfaces.connection import PoolData
+from packages.util.utils.receive_pool import ReceivePool
+
+DEFAULT_READ_SIZE = 4096
+
+
+class AsyncDataListener:
+    """
+    Listens for data from a serial port connection on the asyncio event loop.
+
+    Unlike `DataListener` no thread is polling the port: the file descriptor
+    of the port is registered with the event loop through `add_reader` and
+    is read as soon as it becomes readable, into a buffer reused across reads.
+
+    Only available where the event loop supports `add_reader` on a serial
+    port (POSIX), see `is_supported`.
+    """
+    def __init__(self, params: Dict[str, Any]):
+        self.connection: serial.Serial = params.get("connection")
+        self.on_close_callback = params.get("onClose")
+        self.on_error_callback = params.get("onError")
+        self.listening = False
+        self.pool = ReceivePool(**params.get("poolOptions", {}))
+        self.data_signal = self.pool.data_signal
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.fd: Optional[int] = None
+        self._buffer = bytearray(params.get("readSize", DEFAULT_READ_SIZE))
+        self._view = memoryview(self._buffer)
+        self.start_listening()
+
+    @staticmethod
+    def is_supported(connection: serial.Serial) -> bool:
+        return os.name == "posix" and hasattr(connection, "fileno")
+
+    def destroy(self) -> None:
+        self.stop_listening()
+
+    def is_listening(self) -> bool:
+        return self.listening
+
+    async def receive(self) -> Optional[bytearray]:
+        """
+        Get and remove the first data item from the pool.
+        """
+        return self.pool.pop()
+
+    async def wait_for_data(self, timeout: Optional[int] = None) -> bool:
+        """
+        Wait until the pool has data, or for `timeout` milliseconds.
+        """
+        return await self.pool.wait_for_data(timeout)
+
+    def peek(self) -> List[PoolData]:
+        """
+        Get a copy of all data items in the pool without removing them.
+        """
+        return self.pool.peek()
+
+    def start_listening(self) -> None:
+        """
+        Register the port with the running event loop.
+
+        Does nothing if the port is not open yet or if there is no running
+        event loop, `start_listening` has to be called again once the port
+        is opened.
+        """
+        if self.listening or not self.connection or not self.connection.is_open:
+            return
+
+        try:
+            self.loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        self.fd = self.connection.fileno()
+        self.loop.add_reader(self.fd, self._on_readable)
+        self.listening = True
+
+    def stop_listening(self) -> None:
+        """
+        Unregister the port from the event loop. Has to be called before the
+        port is closed.
+        """
+        if self.listening:
+            self.listening = False
+            try:
+                self.loop.remove_reader(self.fd)
+            except (RuntimeError, ValueError, OSError):
+                # Event loop already closed or fd already invalid
+                pass
+            self.fd = None
+            self.loop = None
+        self.data_signal.notify()
+
+    def _on_readable(self) -> None:
+        try:
+            size = os.readv(self.fd, [self._view])
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            self.stop_listening()
+            self._on_serial_port_error(e)
+            self._on_close()
+            return
+
+        if size == 0:
+            # Port went away (device disconnected)
+            self.stop_listening()
+            self._on_close()
+            return
+
+        self._on_data(self._view[:size])
+
+    def _on_data(self, data: memoryview) -> None:
+        """
+        Handle incoming data.
+        """
+        self.pool.push(bytearray(data))
+
+    def _on_close(self) -> None:
+        if self.on_close_callback:
+            self.on_close_callback()
+
+    def _on_serial_port_error(self, error: Exception) -> None:
+        """
+        Handle serial port errors.
+        """
+        if self.on_error_callback:
+            self.on_error_callback(error)
@@ -1,8 +1,8 @@
-import uuid
 import threading
 from typing import List, Optional, Dict, Any
 import serial
 from packages.interfaces.connection import PoolData
+from packages.util.utils.receive_pool import ReceivePool
 
 class DataListener:
     """
@@ -13,9 +13,10 @@ class DataListener:
         self.on_close_callback = params.get("onClose")
         self.on_error_callback = params.get("onError")
         self.listening = False
-        self.pool: List[PoolData] = []
-        self.pool_lock = threading.Lock()
+        self.pool = ReceivePool(**params.get("poolOptions", {}))
+        self.data_signal = self.pool.data_signal
         self.read_thread = None
+        self._stop_event = threading.Event()
         self.start_listening()
 
     def destroy(self) -> None:
@@ -28,31 +29,36 @@ class DataListener:
         """
         Get and remove the first data item from the pool.
         """
-        with self.pool_lock:
-            if not self.pool:
-                return None
-            return self.pool.pop(0).get("data")
+        return self.pool.pop()
+
+    async def wait_for_data(self, timeout: Optional[int] = None) -> bool:
+        """
+        Wait until the pool has data, or for `timeout` milliseconds.
+        """
+        return await self.pool.wait_for_data(timeout)
 
     def peek(self) -> List[PoolData]:
         """
         Get a copy of all data items in the pool without removing them.
         """
-        with self.pool_lock:
-            return self.pool.copy()
+        return self.pool.peek()
 
     def start_listening(self) -> None:
         if self.listening:
             return
 
         self.listening = True
+        self._stop_event.clear()
         self.read_thread = threading.Thread(target=self._read_loop)
         self.read_thread.daemon = True
         self.read_thread.start()
 
     def stop_listening(self) -> None:
         self.listening = False
+        self._stop_event.set()
         if self.read_thread and self.read_thread.is_alive():
             self.read_thread.join(timeout=1.0)
+        self.data_signal.notify()
 
     def _read_loop(self) -> None:
         """Background thread that reads data from the serial port."""
@@ -66,7 +72,7 @@ class DataListener:
                         if data:
                             self._on_data(data)
                     # Small sleep to prevent CPU hogging
-                    threading.Event().wait(0.01)
+                    self._stop_event.wait(0.01)
                 except serial.SerialException as e:
                     if self.on_error_callback:
                         self.on_error_callback(e)
@@ -75,6 +81,9 @@ class DataListener:
             if self.on_error_callback:
                 self.on_error_callback(e)
         finally:
+            # Listening again needs a new thread once the port is reopened
+            self.listening = False
+            self.data_signal.notify()
             if self.on_close_callback:
                 self.on_close_callback()
 
@@ -82,11 +91,7 @@ class DataListener:
         """
         Handle incoming data.
         """
-        with self.pool_lock:
-            self.pool.append({
-                "id": str(uuid.uuid4()),
-                "data": bytearray(data)
-            })
+        self.pool.push(bytearray(data))
 
     def _on_close(self) -> None:
         if self.on_close_callback:
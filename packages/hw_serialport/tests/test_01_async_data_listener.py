@@ -0,0 +1,143 @@
+import asyncio
+import os
+import pytest
+
+from packages.interfaces.connection import DeviceState
+from packages.hw_serialport.device_connection import DeviceConnection
+from packages.hw_serialport.helpers import AsyncDataListener
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason='Needs a pty')
+
+
+class PtyMasterConnection:
+    """Master end of a pty standing in for an open serial port"""
+
+    def __init__(self, fd: int):
+        self.fd = fd
+        self.is_open = True
+
+    def fileno(self) -> int:
+        return self.fd
+
+
+async def receive_all(listener, size: int, timeout: float = 1):
+    chunks = []
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while sum(len(chunk) for chunk in chunks) < size and loop.time() < deadline:
+        chunk = await listener.receive()
+        if chunk:
+            chunks.append(bytes(chunk))
+        else:
+            await listener.wait_for_data(10)
+    return chunks
+
+
+class TestAsyncDataListener:
+    def setup_method(self, method):
+        self.master, self.slave = os.openpty()
+        self.path = os.ttyname(self.slave)
+
+    def teardown_method(self, method):
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def create_connection(self) -> DeviceConnection:
+        return DeviceConnection({
+            'path': self.path,
+            'device_state': DeviceState.MAIN,
+        })
+
+    def test_should_listen_while_port_is_open(self):
+        async def _test():
+            connection = self.create_connection()
+            listener = connection.data_listener
+            assert isinstance(listener, AsyncDataListener)
+            assert not listener.is_listening()
+
+            for _ in range(2):
+                await connection.open()
+                assert listener.is_listening()
+
+                os.write(self.master, b'\x01\x02\x03')
+                assert b''.join(await receive_all(listener, 3)) == b'\x01\x02\x03'
+
+                await connection.close()
+                assert not listener.is_listening()
+
+            # Nothing is read while the port is closed
+            os.write(self.master, b'\x04')
+            await asyncio.sleep(0.05)
+            assert await connection.receive() is None
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_receive_data_split_across_chunks(self):
+        async def _test():
+            connection = self.create_connection()
+            await connection.open()
+            connection.data_listener.destroy()
+            listener = AsyncDataListener({
+                'connection': connection.connection,
+                'readSize': 4,
+            })
+
+            data = bytes(range(10))
+            os.write(self.master, data[:6])
+            await asyncio.sleep(0.02)
+            os.write(self.master, data[6:])
+
+            chunks = await receive_all(listener, len(data))
+            assert b''.join(chunks) == data
+            assert len(chunks) >= 3
+            assert all(len(chunk) <= 4 for chunk in chunks)
+
+            listener.destroy()
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_call_on_close_at_end_of_file(self):
+        async def _test():
+            connection = self.create_connection()
+            await connection.open()
+            listener = connection.data_listener
+            closed = asyncio.Event()
+            errors = []
+            listener.on_close_callback = closed.set
+            listener.on_error_callback = errors.append
+
+            # The port reads the end of file once the other end is gone
+            os.close(self.master)
+            await asyncio.wait_for(closed.wait(), 1)
+
+            assert errors == []
+            assert not listener.is_listening()
+            await connection.destroy()
+
+        asyncio.run(_test())
+
+    def test_should_call_on_error_when_read_fails(self):
+        async def _test():
+            closed = asyncio.Event()
+            errors = []
+            listener = AsyncDataListener({
+                'connection': PtyMasterConnection(self.master),
+                'onClose': closed.set,
+                'onError': errors.append,
+            })
+            assert listener.is_listening()
+
+            # Reading the master end fails once the port is closed
+            os.close(self.slave)
+            await asyncio.wait_for(closed.wait(), 1)
+
+            assert len(errors) == 1
+            assert isinstance(errors[0], OSError)
+            assert not listener.is_listening()
+
+        asyncio.run(_test())
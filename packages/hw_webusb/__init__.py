@@ -1,5 +1,11 @@
 from .device_connection import DeviceConnection
-from .helpers import create_port
+from .helpers import create_port, get_available_devices
 from .logger import logger_service_name, update_logger
 
-__all__ = ["DeviceConnection", "update_logger", "logger_service_name", "create_port"]
+__all__ = [
+    "DeviceConnection",
+    "update_logger",
+    "logger_service_name",
+    "create_port",
+    "get_available_devices",
+]
@@ -11,7 +11,7 @@ from packages.interfaces import (
     PoolData,
 )
 
-from .helpers import DataListener, create_port
+from .helpers import DataListener, create_port, get_available_devices
 from .logger import logger
 
 
@@ -33,6 +33,10 @@ class DeviceConnection(IDeviceConnection):
         data_listener = await DataListener.create(connection)
         return DeviceConnection(connection, data_listener)
 
+    @staticmethod
+    async def list() -> List[usb.core.Device]:
+        return await get_available_devices()
+
     @staticmethod
     async def create() -> "DeviceConnection":
         connection = await create_port()
@@ -75,6 +79,9 @@ class DeviceConnection(IDeviceConnection):
     async def peek(self) -> List[PoolData]:
         return await self.data_listener.peek()
 
+    async def wait_for_data(self, timeout: Optional[int] = None) -> bool:
+        return await self.data_listener.wait_for_data(timeout)
+
     async def close(self) -> None:
         try:
             usb.util.dispose_resources(self.connection)
@@ -1,4 +1,4 @@
-from .connection import create_port
+from .connection import create_port, get_available_devices
 from .data_listeners import DataListener
 
-__all__ = ["create_port", "DataListener"]
+__all__ = ["create_port", "get_available_devices", "DataListener"]
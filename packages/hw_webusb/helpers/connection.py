@@ -1,3 +1,5 @@
+from typing import List
+
 import usb.core
 import usb.util
 from packages.interfaces import DeviceConnectionError, DeviceConnectionErrorType
@@ -6,18 +8,24 @@ from ..logger import logger
 supported_devices = [{"vendorId": 0x3503, "productId": 259}]
 
 
+async def get_available_devices() -> List[usb.core.Device]:
+    devices: List[usb.core.Device] = []
+    for device_filter in supported_devices:
+        found_devices = list(
+            usb.core.find(
+                idVendor=device_filter["vendorId"],
+                idProduct=device_filter["productId"],
+                find_all=True,
+            )
+        )
+        devices.extend(found_devices)
+
+    return devices
+
+
 async def create_port() -> usb.core.Device:
     try:
-        devices = []
-        for device_filter in supported_devices:
-            found_devices = list(
-                usb.core.find(
-                    idVendor=device_filter["vendorId"],
-                    idProduct=device_filter["productId"],
-                    find_all=True,
-                )
-            )
-            devices.extend(found_devices)
+        devices = await get_available_devices()
 
         if not devices:
             logger.error("No supported WebUSB devices found")
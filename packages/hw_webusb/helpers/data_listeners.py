@@ -1,5 +1,4 @@
 import asyncio
-import uuid
 from typing import Any, Dict, List, Optional
 
 import usb.core
@@ -11,6 +10,8 @@ from packages.interfaces import (
     PoolData,
 )
 
+from packages.util.utils.receive_pool import ReceivePool
+
 from ..logger import logger
 
 
@@ -21,7 +22,7 @@ class DataListener:
         self.endpoint_in: int = params["endpoint_in"]
         self.endpoint_out: int = params["endpoint_out"]
         self.listening: bool = True
-        self.pool: List[PoolData] = []
+        self.pool = ReceivePool(**params.get("pool_options", {}))
 
     @staticmethod
     async def create(connection: usb.core.Device) -> "DataListener":
@@ -88,8 +89,9 @@ class DataListener:
         return self.listening
 
     async def receive(self) -> Optional[bytearray]:
-        if self.pool:
-            return self.pool.pop(0).get("data")
+        data = self.pool.pop()
+        if data is not None:
+            return data
         return await self.receive_new()
 
     async def send(self, data: bytearray) -> None:
@@ -106,14 +108,28 @@ class DataListener:
     async def peek(self) -> List[PoolData]:
         new_data = await self.receive_new()
         if new_data:
-            self.pool.append({"id": str(uuid.uuid4()), "data": new_data})
-        return self.pool.copy()
+            self.pool.push(new_data)
+        return self.pool.peek()
+
+    async def wait_for_data(self, timeout: Optional[int] = None) -> bool:
+        """
+        Block on the IN endpoint until data arrives, or for `timeout`
+        milliseconds. Received data is kept in the pool.
+        """
+        if len(self.pool) > 0:
+            return True
+
+        read_timeout = 1000 if timeout is None else max(1, min(int(timeout), 1000))
+        new_data = await self.receive_new(read_timeout)
+        if new_data:
+            self.pool.push(new_data)
+        return len(self.pool) > 0
 
-    async def receive_new(self) -> Optional[bytearray]:
+    async def receive_new(self, timeout: int = 1000) -> Optional[bytearray]:
         try:
             # Use asyncio.to_thread to prevent blocking
             result = await asyncio.to_thread(
-                self._read_usb_data, self.endpoint_in, 6 * 1024, timeout=1000
+                self._read_usb_data, self.endpoint_in, 6 * 1024, timeout=timeout
             )
 
             if not result or len(result) == 0:
@@ -1,4 +1,3 @@
-import uuid
 import inspect
 from typing import List, Optional, Callable, Awaitable, Union
 
@@ -11,13 +10,15 @@ from packages.interfaces.errors.connection_error import (
     DeviceConnectionError,
     DeviceConnectionErrorType
 )
+from packages.util.utils.receive_pool import ReceivePool
 
 class MockDeviceConnection:
     def __init__(self):
         self.is_connection_open = False
         self.is_destroyed = False
         self.sequence_number = 0
-        self.pool: List[PoolData] = []
+        self.pool = ReceivePool()
+        self.data_signal = self.pool.data_signal
         self.device_state = DeviceState.MAIN
         self.connection_type = ConnectionTypeMap.SERIAL_PORT.value
         self.on_data: Optional[Union[Callable[[bytes], Awaitable[None]], Callable[[], Awaitable[None]]]] = None
@@ -61,6 +62,7 @@ class MockDeviceConnection:
     async def destroy(self) -> None:
         self.is_destroyed = True
         self.is_connection_open = False
+        self.data_signal.notify()
 
     async def send(self, data: bytes) -> None:
         if not self.is_connection_open:
@@ -78,15 +80,13 @@ class MockDeviceConnection:
 
 
     async def mock_device_send(self, data: bytes) -> None:
-        packet_data = {"id": str(uuid.uuid4()), "data": data}
-        self.pool.append(packet_data)
+        self.pool.push(data)
 
     async def receive(self) -> Optional[bytes]:
-        if not self.pool:
-            return None
-        packet = self.pool.pop(0)
-        data = packet.get("data")
-        return data
+        return self.pool.pop()
 
     async def peek(self) -> List[PoolData]:
-        return self.pool.copy()
\ No newline at end of file
+        return self.pool.peek()
+
+    async def wait_for_data(self, timeout: Optional[int] = None) -> bool:
+        return await self.pool.wait_for_data(timeout)
\ No newline at end of file
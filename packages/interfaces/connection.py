@@ -20,7 +20,7 @@ class IDevice(TypedDict):
     type: str
 
 class PoolData(TypedDict):
-    id: str
+    id: int
     data: bytes
 
 @runtime_checkable
@@ -55,5 +55,12 @@ class IDeviceConnection(Protocol):
     async def peek(self) -> List[PoolData]:
         ...
 
+    async def wait_for_data(self, timeout: Optional[int] = None) -> bool:
+        """
+        Resolves as soon as there is data to `receive`, or after `timeout`
+        milliseconds. Returns False on timeout.
+        """
+        ...
+
     async def destroy(self) -> None:
         ...
@@ -1,6 +1,6 @@
 import pytest
 from packages.util.utils.crypto import (
-    crc16, is_hex, hex_to_uint8array, uint8array_to_hex,
+    crc16, Crc16, update_crc16, is_hex, hex_to_uint8array, uint8array_to_hex,
     pad_start, int_to_uint_byte, hex_to_ascii
 )
 
@@ -244,4 +244,31 @@ class TestCrypto:
             result = crc16(test_case["uint8"])
             assert result == test_case["result"]
 
+    def test_crc16_matches_bitwise_update(self):
+        def bitwise_crc16(data):
+            crc = 0
+            for byte in data:
+                crc = update_crc16(crc, byte)
+            crc = update_crc16(crc, 0)
+            return update_crc16(crc, 0)
 
+        data = bytes((i * 131 + 7) & 0xff for i in range(1024))
+        for length in [0, 1, 2, 15, 48, 255, 1024]:
+            chunk = data[:length]
+            expected = bitwise_crc16(chunk)
+            assert crc16(chunk) == expected
+            assert crc16(memoryview(chunk)) == expected
+            assert crc16(list(chunk)) == expected
+
+    def test_crc16_incremental(self):
+        data = bytes(range(256)) * 4
+        expected = crc16(data)
+
+        for split in [0, 1, 100, 512, len(data)]:
+            crc = Crc16()
+            crc.update(data[:split])
+            crc.update(memoryview(data)[split:])
+            assert crc.digest() == expected
+
+        assert Crc16(data).digest() == expected
+        assert Crc16().digest() == 0
@@ -0,0 +1,51 @@
+import asyncio
+import threading
+import time
+from packages.util.utils.data_signal import DataSignal
+
+
+class TestDataSignal:
+    def test_wait_times_out(self):
+        async def _test():
+            signal = DataSignal()
+            start = time.monotonic()
+            assert await signal.wait(20) is False
+            assert time.monotonic() - start >= 0.015
+
+        asyncio.run(_test())
+
+    def test_predicate_short_circuits(self):
+        async def _test():
+            signal = DataSignal()
+            assert await signal.wait(1000, lambda: True) is True
+
+        asyncio.run(_test())
+
+    def test_notify_wakes_all_waiters(self):
+        async def _test():
+            signal = DataSignal()
+            waiters = [asyncio.create_task(signal.wait(1000)) for _ in range(3)]
+            await asyncio.sleep(0)
+            signal.notify()
+            assert await asyncio.gather(*waiters) == [True, True, True]
+
+        asyncio.run(_test())
+
+    def test_notify_from_thread(self):
+        async def _test():
+            signal = DataSignal()
+            pool = []
+
+            def producer():
+                time.sleep(0.02)
+                pool.append(b'\x01')
+                signal.notify()
+
+            thread = threading.Thread(target=producer)
+            start = time.monotonic()
+            thread.start()
+            assert await signal.wait(2000, lambda: len(pool) > 0) is True
+            assert time.monotonic() - start < 1
+            thread.join()
+
+        asyncio.run(_test())
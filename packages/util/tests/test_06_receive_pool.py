@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import pytest
+from packages.util.utils.receive_pool import ReceivePool
+
+
+class TestReceivePool:
+    def test_fifo_with_increasing_ids(self):
+        pool = ReceivePool()
+        for chunk in (b'a', b'bc', b'def'):
+            assert pool.push(chunk)
+
+        assert [item['id'] for item in pool.peek()] == [0, 1, 2]
+        assert [pool.pop() for _ in range(4)] == [b'a', b'bc', b'def', None]
+        assert len(pool) == 0
+
+        pool.push(b'g')
+        assert pool.peek() == [{'id': 3, 'data': b'g'}]
+
+    def test_drop_oldest(self):
+        pool = ReceivePool(max_chunks=2)
+        for chunk in (b'1', b'2', b'3'):
+            assert pool.push(chunk)
+
+        assert [item['data'] for item in pool.peek()] == [b'2', b'3']
+        metrics = pool.get_metrics()
+        assert metrics['dropped_chunks'] == 1
+        assert metrics['dropped_bytes'] == 1
+        assert metrics['received_chunks'] == 3
+
+    def test_drop_newest(self):
+        pool = ReceivePool(max_bytes=4, overflow_policy='drop_newest')
+        assert pool.push(b'123')
+        assert not pool.push(b'45')
+        assert pool.push(b'4')
+
+        assert [item['data'] for item in pool.peek()] == [b'123', b'4']
+        assert pool.get_metrics()['dropped_bytes'] == 2
+
+    def test_chunk_larger_than_pool_is_dropped(self):
+        pool = ReceivePool(max_bytes=4)
+        pool.push(b'12')
+        assert not pool.push(b'12345')
+        assert [item['data'] for item in pool.peek()] == [b'12']
+
+    def test_high_water_mark(self):
+        pool = ReceivePool()
+        for _ in range(3):
+            pool.push(b'ab')
+        pool.pop()
+        pool.pop()
+
+        metrics = pool.get_metrics()
+        assert metrics['chunks'] == 1
+        assert metrics['bytes'] == 2
+        assert metrics['high_water_chunks'] == 3
+        assert metrics['high_water_bytes'] == 6
+
+    def test_invalid_options(self):
+        with pytest.raises(Exception):
+            ReceivePool(max_chunks=0)
+        with pytest.raises(Exception):
+            ReceivePool(overflow_policy='block')
+
+    def test_wait_for_data_from_thread(self):
+        async def _test():
+            pool = ReceivePool()
+            assert await pool.wait_for_data(10) is False
+
+            threading.Timer(0.02, pool.push, args=(b'data',)).start()
+            assert await pool.wait_for_data(1000) is True
+            assert pool.pop() == b'data'
+
+        asyncio.run(_test())
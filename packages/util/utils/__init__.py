@@ -1,15 +1,17 @@
 from ..utils.assert_utils import assert_condition
 from ..utils.config import config, get_env_variable
 from ..utils.create_flow_status import create_flow_status
+from ..utils.data_signal import DataSignal
 from ..utils.create_status_listener import create_status_listener, ForceStatusUpdate, OnStatus
 from ..utils.crypto import (
-    crc16, is_hex, format_hex, hex_to_uint8array, uint8array_to_hex,
+    crc16, Crc16, update_crc16, is_hex, format_hex, hex_to_uint8array, uint8array_to_hex,
     pad_start, int_to_uint_byte, hex_to_ascii, sha256, num_to_byte_array
 )
 from ..utils.logger import (
     create_default_console_logger, update_logger_object, create_logger_with_prefix
 )
 from ..utils.queryString import create_query_string, parse_query_string
+from ..utils.receive_pool import ReceivePool, ReceivePoolMetrics, OverflowPolicy
 from ..utils.sleep import sleep
 from ..utils.version import string_to_version
 
@@ -21,7 +23,10 @@ __all__ = [
     'create_status_listener',
     'ForceStatusUpdate',
     'OnStatus',
+    'DataSignal',
     'crc16',
+    'Crc16',
+    'update_crc16',
     'is_hex',
     'format_hex',
     'hex_to_uint8array',
@@ -36,6 +41,9 @@ __all__ = [
     'create_logger_with_prefix',
     'create_query_string',
     'parse_query_string',
+    'ReceivePool',
+    'ReceivePoolMetrics',
+    'OverflowPolicy',
     'sleep',
     'string_to_version'
 ]
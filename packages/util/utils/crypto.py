@@ -1,3 +1,4 @@
+import binascii
 import hashlib
 from typing import List, Union
 import re
@@ -31,12 +32,74 @@ def update_crc16(crc_param: int, byte: int) -> int:
     return crc & 0xffff
 
 
-def crc16(data_buff: bytes) -> int:
+def _build_crc16_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xffff)
+    return table
+
+
+_CRC16_TABLE: List[int] = _build_crc16_table()
+
+
+class Crc16:
     """
-    Calculate CRC16 for a byte array.
+    Incremental CRC-16/XMODEM (poly 0x1021, init 0x0000).
+
+    Produces the same value as feeding the data through `update_crc16`
+    followed by two zero bytes. The byte loop is the 256-entry table
+    lookup implemented in C by `binascii.crc_hqx`.
+
+    Example:
+        crc = Crc16()
+        crc.update(header)
+        crc.update(payload)
+        checksum = crc.digest()
+    """
+
+    __slots__ = ('_crc',)
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview, None] = None):
+        self._crc = 0
+        if data is not None:
+            self.update(data)
+
+    def update(self, data: Union[bytes, bytearray, memoryview]) -> 'Crc16':
+        """
+        Feed more data into the checksum.
+
+        Args:
+            data: Bytes-like object to add
+
+        Returns:
+            Crc16: The same object, to allow chaining
+        """
+        self._crc = binascii.crc_hqx(data, self._crc)
+        return self
+
+    def digest(self) -> int:
+        """
+        Returns:
+            int: CRC16 of all the data fed so far
+        """
+        return self._crc
+
+    def copy(self) -> 'Crc16':
+        crc = Crc16()
+        crc._crc = self._crc
+        return crc
+
+
+def _crc16_table(data_buff: Union[bytes, bytearray, memoryview, List[int]]) -> int:
+    """
+    Calculate CRC16 using the precomputed table, for inputs that are not
+    bytes-like (e.g. a list of ints).
 
     Args:
-        data_buff: Byte array to calculate CRC for
+        data_buff: Data to calculate CRC for
 
     Returns:
         int: CRC16 value
@@ -44,13 +107,27 @@ def crc16(data_buff: bytes) -> int:
     assert_condition(data_buff is not None, 'Data buffer cannot be empty')
 
     crc = 0
-    for i in data_buff:
-        crc = update_crc16(crc, i)
+    table = _CRC16_TABLE
+    for byte in data_buff:
+        crc = ((crc << 8) & 0xff00) ^ table[(crc >> 8) ^ byte]
+    return crc
 
-    crc = update_crc16(crc, 0)
-    crc = update_crc16(crc, 0)
 
-    return crc & 0xffff
+def crc16(data_buff: bytes) -> int:
+    """
+    Calculate CRC16 for a byte array.
+
+    Args:
+        data_buff: Byte array to calculate CRC for
+
+    Returns:
+        int: CRC16 value
+    """
+    assert_condition(data_buff is not None, 'Data buffer cannot be empty')
+
+    if isinstance(data_buff, (bytes, bytearray, memoryview)):
+        return binascii.crc_hqx(data_buff, 0)
+    return _crc16_table(data_buff)
 
 
 def is_hex(maybe_hex: str) -> bool:
@@ -128,6 +205,8 @@ def uint8array_to_hex(data: bytes) -> str:
     """
     assert_condition(data is not None, 'Invalid data')
 
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return data.hex()
     return ''.join(f'{i:02x}' for i in data)
 
 
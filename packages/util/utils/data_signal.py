@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from typing import Callable, List, Optional, Tuple
+
+
+class DataSignal:
+    """
+    Wakes up coroutines waiting for incoming data.
+
+    `notify` can be called from any thread (e.g. a reader thread), waiters
+    are resumed on their own event loop.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def notify(self) -> None:
+        """
+        Wake up every coroutine currently waiting.
+        """
+        with self._lock:
+            waiters, self._waiters = self._waiters, []
+
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # Event loop of the waiter is already closed
+                pass
+
+    async def wait(
+        self,
+        timeout: Optional[float] = None,
+        predicate: Optional[Callable[[], bool]] = None,
+    ) -> bool:
+        """
+        Wait for the next `notify`.
+
+        Args:
+            timeout: Maximum time to wait in milliseconds, waits forever if None
+            predicate: Checked before waiting, returns immediately if it is
+                already satisfied. It is checked under the same lock `notify`
+                takes, so a notification cannot be missed between the check
+                and the wait.
+
+        Returns:
+            bool: False if the wait timed out, True otherwise
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (loop, future)
+
+        with self._lock:
+            if predicate is not None and predicate():
+                return True
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(
+                future,
+                timeout / 1000 if timeout is not None else None,
+            )
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
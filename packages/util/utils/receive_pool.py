@@ -0,0 +1,151 @@
+import itertools
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Literal, Optional, Tuple, TypedDict
+
+from .assert_utils import assert_condition
+from .data_signal import DataSignal
+
+DEFAULT_MAX_CHUNKS = 1024
+DEFAULT_MAX_BYTES = 1024 * 1024
+
+# What to do with a new chunk when the pool is full: drop the oldest chunks
+# to make room for it, or drop the new chunk
+OverflowPolicy = Literal['drop_oldest', 'drop_newest']
+
+
+class ReceivePoolMetrics(TypedDict):
+    chunks: int
+    bytes: int
+    received_chunks: int
+    dropped_chunks: int
+    dropped_bytes: int
+    high_water_chunks: int
+    high_water_bytes: int
+
+
+class ReceivePool:
+    """
+    Chunks received from a device, waiting to be read by the sdk.
+
+    The pool is bounded to `max_chunks` chunks and `max_bytes` bytes, chunks
+    are dropped according to `overflow_policy` when it is full. Chunks get
+    increasing integer ids. `push` can be called from a reader thread,
+    waiters of `wait_for_data` are woken up on their own event loop.
+    """
+
+    def __init__(
+        self,
+        max_chunks: int = DEFAULT_MAX_CHUNKS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        overflow_policy: OverflowPolicy = 'drop_oldest',
+    ):
+        assert_condition(max_chunks > 0, 'Invalid maxChunks')
+        assert_condition(max_bytes > 0, 'Invalid maxBytes')
+        assert_condition(
+            overflow_policy in ('drop_oldest', 'drop_newest'),
+            'Invalid overflowPolicy',
+        )
+
+        self.max_chunks = max_chunks
+        self.max_bytes = max_bytes
+        self.overflow_policy = overflow_policy
+        self.data_signal = DataSignal()
+        self._chunks: Deque[Tuple[int, bytes]] = deque()
+        self._bytes = 0
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._metrics: ReceivePoolMetrics = {
+            'chunks': 0,
+            'bytes': 0,
+            'received_chunks': 0,
+            'dropped_chunks': 0,
+            'dropped_bytes': 0,
+            'high_water_chunks': 0,
+            'high_water_bytes': 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def push(self, data: bytes) -> bool:
+        """
+        Add a received chunk and wake up the waiters.
+
+        Returns:
+            bool: False if the chunk was dropped
+        """
+        size = len(data)
+        metrics = self._metrics
+
+        with self._lock:
+            metrics['received_chunks'] += 1
+
+            is_full = (
+                len(self._chunks) >= self.max_chunks or
+                self._bytes + size > self.max_bytes
+            )
+            if is_full and (self.overflow_policy == 'drop_newest' or size > self.max_bytes):
+                metrics['dropped_chunks'] += 1
+                metrics['dropped_bytes'] += size
+                return False
+
+            while self._chunks and (
+                len(self._chunks) >= self.max_chunks or
+                self._bytes + size > self.max_bytes
+            ):
+                _, dropped = self._chunks.popleft()
+                self._bytes -= len(dropped)
+                metrics['dropped_chunks'] += 1
+                metrics['dropped_bytes'] += len(dropped)
+
+            self._chunks.append((next(self._ids), data))
+            self._bytes += size
+
+            if len(self._chunks) > metrics['high_water_chunks']:
+                metrics['high_water_chunks'] = len(self._chunks)
+            if self._bytes > metrics['high_water_bytes']:
+                metrics['high_water_bytes'] = self._bytes
+
+        self.data_signal.notify()
+        return True
+
+    def pop(self) -> Optional[bytes]:
+        """
+        Remove and return the oldest chunk, None if the pool is empty.
+        """
+        with self._lock:
+            if not self._chunks:
+                return None
+            _, data = self._chunks.popleft()
+            self._bytes -= len(data)
+            return data
+
+    def peek(self) -> List[Dict[str, Any]]:
+        """
+        Every chunk in the pool as `{'id', 'data'}`, without removing them.
+        """
+        with self._lock:
+            return [{'id': chunk_id, 'data': data} for chunk_id, data in self._chunks]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._chunks.clear()
+            self._bytes = 0
+
+    async def wait_for_data(self, timeout: Optional[int] = None) -> bool:
+        """
+        Wait until the pool has data, or for `timeout` milliseconds.
+        """
+        return await self.data_signal.wait(timeout, lambda: len(self._chunks) > 0)
+
+    def get_metrics(self) -> ReceivePoolMetrics:
+        with self._lock:
+            return {
+                **self._metrics,
+                'chunks': len(self._chunks),
+                'bytes': self._bytes,
+            }
+
+
+__all__ = ['ReceivePool', 'ReceivePoolMetrics', 'OverflowPolicy']
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Compare the table driven crc16 against the original bit-by-bit algorithm.
+
+Usage: python -m scripts.benchmarks.crc16 [--size BYTES] [--repeat N]
+"""
+import argparse
+import os
+import timeit
+
+from packages.util.utils.crypto import Crc16, crc16, update_crc16
+
+
+def bitwise_crc16(data: bytes) -> int:
+    crc = 0
+    for byte in data:
+        crc = update_crc16(crc, byte)
+    crc = update_crc16(crc, 0)
+    crc = update_crc16(crc, 0)
+    return crc
+
+
+def verify(samples: int = 2000) -> None:
+    for i in range(samples):
+        data = os.urandom(i % 300)
+        expected = bitwise_crc16(data)
+        assert crc16(data) == expected, data.hex()
+        split = len(data) // 3
+        assert Crc16(data[:split]).update(data[split:]).digest() == expected, data.hex()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=64 * 1024)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    verify()
+    print('crc16 output is identical to the bitwise implementation')
+
+    data = os.urandom(args.size)
+    bitwise = min(timeit.repeat(lambda: bitwise_crc16(data), number=1, repeat=args.repeat))
+    table = min(timeit.repeat(lambda: crc16(data), number=1, repeat=args.repeat))
+
+    print(f'bitwise: {bitwise * 1000:.3f} ms ({args.size / bitwise / 1e6:.2f} MB/s)')
+    print(f'table:   {table * 1000:.3f} ms ({args.size / table / 1e6:.2f} MB/s)')
+    print(f'speedup: {bitwise / table:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
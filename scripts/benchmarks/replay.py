@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Record a session with a device, then replay it to measure the sdk without
+the device.
+
+`record` runs a ManagerApp operation on the first connected device and
+records its traffic to PATH. `replay` runs the same operation against the
+recording RUNS times and reports wall-clock and CPU time of this process
+per run. By default the recording is replayed as fast as possible, so the
+time is spent in the sdk (and in the waits of the sdk itself, e.g. the
+status poll interval).
+
+Usage:
+LOG_LEVEL=error python -m scripts.benchmarks.replay record OPERATION PATH
+LOG_LEVEL=error python -m scripts.benchmarks.replay replay OPERATION PATH
+    [--runs N] [--speed SPEED] [--profile]
+
+OPERATION is one of get_device_info, get_wallets, get_logs.
+"""
+import argparse
+import asyncio
+import cProfile
+import pstats
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from packages.app_manager.src import ManagerApp
+from packages.hw_serialport.device_connection import DeviceConnection
+from packages.core.src.recorder import (
+    Recording,
+    RecordingDeviceConnection,
+    ReplayDeviceConnection,
+    read_recording,
+)
+
+OPERATIONS: Dict[str, Callable[[ManagerApp], Awaitable[Any]]] = {
+    'get_device_info': lambda app: app.get_device_info(),
+    'get_wallets': lambda app: app.get_wallets(),
+    'get_logs': lambda app: app.get_logs(),
+}
+
+
+async def record(operation: str, path: str) -> None:
+    connection = await RecordingDeviceConnection.create(
+        await DeviceConnection.create(), path, {'operation': operation}
+    )
+    app = await ManagerApp.create(connection)
+    try:
+        await OPERATIONS[operation](app)
+    finally:
+        await app.destroy()
+
+
+async def replay_once(recording: Recording, operation: str, speed: float) -> None:
+    connection = ReplayDeviceConnection(recording, {'speed': speed, 'strict': True})
+    app = await ManagerApp.create(connection)
+    try:
+        await OPERATIONS[operation](app)
+    finally:
+        await app.destroy()
+
+
+async def replay(recording: Recording, operation: str, runs: int, speed: float) -> List[Dict]:
+    results = []
+    for _ in range(runs):
+        start_cpu = time.process_time()
+        start = time.perf_counter()
+        await replay_once(recording, operation, speed)
+        results.append({
+            'wall_ms': (time.perf_counter() - start) * 1000,
+            'cpu_ms': (time.process_time() - start_cpu) * 1000,
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('mode', choices=['record', 'replay'])
+    parser.add_argument('operation', choices=sorted(OPERATIONS))
+    parser.add_argument('path')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--speed', type=float, default=0, help='0 replays as fast as possible')
+    parser.add_argument('--profile', action='store_true', help='print a profile of the replays')
+    args = parser.parse_args()
+
+    if args.mode == 'record':
+        asyncio.run(record(args.operation, args.path))
+        print(f'recorded {args.operation} to {args.path}')
+        return
+
+    recording = read_recording(args.path)
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    results = asyncio.run(replay(recording, args.operation, args.runs, args.speed))
+    if profiler:
+        profiler.disable()
+
+    print(f'replay of {args.operation}, {len(recording["records"])} records, {args.runs} runs')
+    for key in ('wall_ms', 'cpu_ms'):
+        values = [result[key] for result in results]
+        print(
+            f'{key:<8} min {min(values):>9.3f}  median {statistics.median(values):>9.3f}'
+            f'  max {max(values):>9.3f}'
+        )
+
+    if profiler:
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+
+
+if __name__ == '__main__':
+    main()
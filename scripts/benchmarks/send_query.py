@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Measure a full `SDK.send_query` call against a mock device which acks every
+packet, with the memoized version parser and with plain
+`packaging.version.parse` (what every call did before).
+
+Usage: LOG_LEVEL=error python -m scripts.benchmarks.send_query [--size BYTES] [--calls N]
+"""
+import argparse
+import asyncio
+import time
+from unittest.mock import patch
+
+from packaging import version
+
+from packages.interfaces.__mocks__.connection import MockDeviceConnection
+from packages.core.src.config import v3 as config_v3
+from packages.core.src.encoders.packet.packet import decode_packet_bytes, encode_packet_bytes
+from packages.core.src.sdk import SDK
+from packages.core.src.utils import feature_map
+from packages.core.src.utils.packetversion import PacketVersionMap
+from packages.core.src.utils.version_compare import parse_version
+
+
+def uncached_is_feature_enabled(feature_name, sdk_version):
+    config = feature_map.FeatureMap[feature_name]
+    enabled = version.parse(sdk_version) >= version.parse(config['from_version'])
+    if config.get('to_version'):
+        enabled = enabled and version.parse(sdk_version) < version.parse(config['to_version'])
+    return enabled
+
+
+async def create_sdk() -> SDK:
+    connection = await MockDeviceConnection.create()
+
+    async def on_data(data: bytes):
+        for packet in decode_packet_bytes(data, PacketVersionMap.v3):
+            await connection.mock_device_send(encode_packet_bytes(
+                b'',
+                b'',
+                PacketVersionMap.v3,
+                packet['sequence_number'],
+                config_v3.commands.PACKET_TYPE.CMD_ACK,
+            )[0])
+
+    connection.configure_listeners(on_data)
+    sdk = SDK(connection, 1, '3.0.1', PacketVersionMap.v3)
+    await sdk.before_operation()
+    return sdk
+
+
+async def time_send_query(sdk: SDK, data: bytes, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        await sdk.send_query(data, {'max_tries': 1})
+    return (time.perf_counter() - start) / calls
+
+
+async def run(size: int, calls: int) -> None:
+    sdk = await create_sdk()
+    data = bytes(range(256)) * (size // 256 + 1)
+    data = data[:size]
+
+    # Warm up
+    await time_send_query(sdk, data, 10)
+
+    with patch.object(feature_map, 'is_feature_enabled', uncached_is_feature_enabled), \
+            patch('packages.core.src.sdk.is_feature_enabled', uncached_is_feature_enabled):
+        uncached = await time_send_query(sdk, data, calls)
+
+    cached = await time_send_query(sdk, data, calls)
+
+    print(f'send_query of {size} bytes, {calls} calls')
+    print(f'uncached version checks: {uncached * 1e6:.1f} us/call')
+    print(f'cached version checks:   {cached * 1e6:.1f} us/call')
+    print(f'speedup: {uncached / cached:.2f}x')
+
+    feature_map.is_feature_enabled(feature_map.FeatureName.ProtoCommand, '3.0.1')
+    print(f'version parser cache: {parse_version.cache_info()}')
+
+    await sdk.connection.destroy()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=32)
+    parser.add_argument('--calls', type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.size, args.calls))
+
+
+if __name__ == '__main__':
+    main()
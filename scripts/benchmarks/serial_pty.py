@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Measure `hw_serialport.DeviceConnection` end to end without hardware: the
+device simulator runs in a child process on the master side of a
+pseudo-terminal and the connection opens the slave path, unchanged.
+
+Reports wall-clock time, CPU time of this process (the sdk and its reader)
+and listener wakeups per operation. Wakeups are reader loop iterations for
+the thread listener and readable callbacks for the asyncio listener.
+
+POSIX only. Usage:
+LOG_LEVEL=error python -m scripts.benchmarks.serial_pty [--listener async|thread]
+    [--calls N] [--size BYTES] [--latency MS]
+"""
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import time
+import tty
+from typing import Awaitable, Callable, Dict, Iterator, List
+
+from unittest.mock import patch
+
+from packages.interfaces import DeviceState
+from packages.hw_serialport.device_connection import DeviceConnection
+from packages.hw_serialport.helpers import AsyncDataListener, DataListener
+from packages.core.src.sdk import SDK
+from packages.core.src.simulator import SimulatedDevice, SimulatorOptions
+from packages.core.src.utils.packetversion import PacketVersionMap
+
+READ_SIZE = 4096
+
+
+def run_device(master_fd: int, slave_fd: int, options: SimulatorOptions) -> None:
+    """
+    Child process: feed everything written to the pty to a simulated device
+    and write its responses back, until the pty is closed.
+    """
+    os.close(slave_fd)
+
+    async def serve() -> None:
+        loop = asyncio.get_running_loop()
+        closed = loop.create_future()
+        device = SimulatedDevice(lambda data: os.write(master_fd, data), options)
+
+        def on_readable() -> None:
+            try:
+                data = os.read(master_fd, READ_SIZE)
+            except OSError:
+                data = b''
+            if not data:
+                loop.remove_reader(master_fd)
+                closed.set_result(None)
+                return
+            device.receive(data)
+
+        loop.add_reader(master_fd, on_readable)
+        await closed
+        device.destroy()
+
+    asyncio.run(serve())
+
+
+class WakeupCounter:
+    """
+    Counts the wakeups of the serial data listeners.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    @contextlib.contextmanager
+    def patch(self) -> Iterator[None]:
+        counter = self
+        on_readable = AsyncDataListener._on_readable
+        data_listener_init = DataListener.__init__
+
+        def counted_on_readable(listener: AsyncDataListener) -> None:
+            counter.count += 1
+            on_readable(listener)
+
+        def counted_init(listener: DataListener, params: Dict) -> None:
+            data_listener_init(listener, params)
+            wait = listener._stop_event.wait
+
+            def counted_wait(timeout=None):
+                counter.count += 1
+                return wait(timeout)
+
+            listener._stop_event.wait = counted_wait
+
+        with patch.object(AsyncDataListener, '_on_readable', counted_on_readable), \
+                patch.object(DataListener, '__init__', counted_init):
+            yield
+
+
+async def measure(
+    name: str,
+    operation: Callable[[], Awaitable[None]],
+    calls: int,
+    wakeups: WakeupCounter,
+    results: List[Dict],
+) -> None:
+    # Warm up
+    await operation()
+
+    start_wakeups = wakeups.count
+    start_cpu = time.process_time()
+    start = time.perf_counter()
+    for _ in range(calls):
+        await operation()
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - start_cpu
+
+    results.append({
+        'name': name,
+        'wall_ms': wall * 1000 / calls,
+        'cpu_ms': cpu * 1000 / calls,
+        'wakeups': (wakeups.count - start_wakeups) / calls,
+    })
+
+
+async def run(listener: str, calls: int, size: int, latency: float) -> List[Dict]:
+    master_fd, slave_fd = os.openpty()
+    tty.setraw(slave_fd)
+    slave_path = os.ttyname(slave_fd)
+
+    device = multiprocessing.get_context('fork').Process(
+        target=run_device,
+        args=(master_fd, slave_fd, {'latency': latency}),
+        daemon=True,
+    )
+    device.start()
+    # The slave stays open here until the end, so the device does not see
+    # the pty as closed while the connection is closed between operations
+    os.close(master_fd)
+
+    wakeups = WakeupCounter()
+    results: List[Dict] = []
+    data = (bytes(range(256)) * (size // 256 + 1))[:size]
+
+    with wakeups.patch(), \
+            patch.object(AsyncDataListener, 'is_supported', return_value=listener == 'async'):
+        connection = await DeviceConnection.connect({
+            'path': slave_path,
+            'device_state': DeviceState.MAIN,
+            'serial': 'pty',
+        })
+
+        async def open_close() -> None:
+            await connection.before_operation()
+            await connection.after_operation()
+
+        async def sdk_version() -> None:
+            await SDK.get_sdk_version(connection)
+
+        sdk = SDK(connection, 1, '3.0.1', PacketVersionMap.v3)
+
+        async def get_status() -> None:
+            await sdk.get_status(dont_log=True, max_age=0)
+
+        async def query() -> None:
+            await sdk.send_query(data)
+            await sdk.wait_for_result()
+
+        try:
+            await measure('open/close', open_close, calls, wakeups, results)
+            await measure('sdk version (v1)', sdk_version, calls, wakeups, results)
+
+            await sdk.before_operation()
+            await measure('get_status', get_status, calls, wakeups, results)
+            await measure(f'query {size} bytes', query, calls, wakeups, results)
+            await sdk.after_operation()
+        finally:
+            await connection.destroy()
+            os.close(slave_fd)
+            device.join(5)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--listener', choices=['async', 'thread'], default='async')
+    parser.add_argument('--calls', type=int, default=100)
+    parser.add_argument('--size', type=int, default=32)
+    parser.add_argument('--latency', type=float, default=0, help='device latency in ms')
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.listener, args.calls, args.size, args.latency))
+
+    print(f'serial over pty, {args.listener} listener, {args.calls} calls')
+    print(f'{"operation":<20} {"wall ms/op":>11} {"cpu ms/op":>10} {"wakeups/op":>11}')
+    for result in results:
+        print(
+            f'{result["name"]:<20} {result["wall_ms"]:>11.3f} '
+            f'{result["cpu_ms"]:>10.3f} {result["wakeups"]:>11.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
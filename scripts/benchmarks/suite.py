@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the codecs, operations and app flows of the sdk.
+
+Micro benchmarks time the packet codecs, crc16, byte stuffing and the
+status and manager proto codecs. Macro benchmarks run full operations
+against the in-process device simulator. Inputs and the simulator are
+seeded, so runs are reproducible.
+
+Results can be written as JSON with `--output` and a run can be compared
+against such a file with `--compare`, the exit status is 1 if any benchmark
+got slower than `--threshold`.
+
+Usage:
+LOG_LEVEL=error python -m scripts.benchmarks.suite [--filter REGEX] [--repeat N]
+    [--output results.json] [--compare baseline.json [--input results.json]]
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import inspect
+import json
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    TypedDict,
+)
+
+from packages.interfaces import DeviceState
+from packages.util.utils import crc16
+from packages.core.src.encoders.packet.Bootloader import stm_xmodem_encode
+from packages.core.src.encoders.packet.legacy import xmodem_decode, xmodem_encode
+from packages.core.src.encoders.packet.packet import decode_packet, encode_packet
+from packages.core.src.encoders.raw import decode_status
+from packages.core.src.sdk import SDK
+from packages.core.src.simulator import SimulatedDeviceConnection
+from packages.core.src.utils.crypto import byte_stuffing
+from packages.core.src.utils.packetversion import PacketVersionMap
+from packages.app_manager.src import ManagerApp
+from packages.app_manager.src.utils.operations_helper import decode_result, encode_query
+from packages.app_manager.tests.test_04_getLogs.__fixtures__ import fixtures as get_logs_fixtures
+
+FORMAT_VERSION = 1
+SEED = 1
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.1
+
+# Raw data of a v3 status packet (`CmdSeq: 50` of the raw get status tests)
+STATUS_RAW_DATA = '23000032040084'
+# `With multiple log data` of the get logs tests: 3 queries and results
+GET_LOGS_CASE = get_logs_fixtures['valid'][1]
+
+
+class BenchmarkResult(TypedDict):
+    group: str
+    number: int
+    repeat: int
+    # Seconds per call
+    min: float
+    median: float
+    mean: float
+    stdev: float
+
+
+class Benchmark:
+    def __init__(
+        self,
+        name: str,
+        group: str,
+        number: int,
+        factory: Callable[[], AsyncContextManager[Callable[[], Any]]],
+    ):
+        self.name = name
+        self.group = group
+        self.number = number
+        self.factory = factory
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, group: str, number: int):
+    """
+    Register an async generator yielding the operation to time, code before
+    the yield is the setup and after it the teardown.
+    """
+    def decorator(generator):
+        BENCHMARKS.append(Benchmark(name, group, number, contextlib.asynccontextmanager(generator)))
+        return generator
+    return decorator
+
+
+def random_bytes(size: int) -> bytes:
+    return random.Random(SEED).randbytes(size)
+
+
+# ************** Micro benchmarks ****************
+@benchmark('crc16 4KiB', 'micro', 200)
+async def bench_crc16() -> AsyncIterator[Callable]:
+    data = random_bytes(4096)
+    yield lambda: crc16(data)
+
+
+@benchmark('byte_stuffing 4KiB', 'micro', 100)
+async def bench_byte_stuffing() -> AsyncIterator[Callable]:
+    data = random_bytes(4096)
+    yield lambda: byte_stuffing(data, PacketVersionMap.v3)
+
+
+@benchmark('encode_packet 4KiB', 'micro', 50)
+async def bench_encode_packet() -> AsyncIterator[Callable]:
+    raw_data = random_bytes(4096).hex()
+    proto_data = random_bytes(64).hex()
+    yield lambda: encode_packet(raw_data, proto_data, PacketVersionMap.v3, 1, 2)
+
+
+@benchmark('decode_packet 4KiB', 'micro', 50)
+async def bench_decode_packet() -> AsyncIterator[Callable]:
+    data = b''.join(encode_packet(random_bytes(4096).hex(), '', PacketVersionMap.v3, 1, 6))
+    yield lambda: decode_packet(data, PacketVersionMap.v3)
+
+
+@benchmark('xmodem_encode 1KiB', 'micro', 50)
+async def bench_xmodem_encode() -> AsyncIterator[Callable]:
+    data = random_bytes(1024).hex()
+    yield lambda: xmodem_encode(data, 42, PacketVersionMap.v1)
+
+
+@benchmark('xmodem_decode 1KiB', 'micro', 50)
+async def bench_xmodem_decode() -> AsyncIterator[Callable]:
+    data = b''.join(xmodem_encode(random_bytes(1024).hex(), 42, PacketVersionMap.v1))
+    yield lambda: xmodem_decode(data, PacketVersionMap.v1)
+
+
+@benchmark('stm_xmodem_encode 64KiB', 'micro', 5)
+async def bench_stm_xmodem_encode() -> AsyncIterator[Callable]:
+    data = random_bytes(64 * 1024).hex()
+    yield lambda: stm_xmodem_encode(data)
+
+
+@benchmark('decode_status', 'micro', 2000)
+async def bench_decode_status() -> AsyncIterator[Callable]:
+    yield lambda: decode_status(STATUS_RAW_DATA, PacketVersionMap.v3)
+
+
+@benchmark('encode_query', 'micro', 2000)
+async def bench_encode_query() -> AsyncIterator[Callable]:
+    yield lambda: encode_query({'getLogs': {'initiate': {}}})
+
+
+@benchmark('decode_result', 'micro', 2000)
+async def bench_decode_result() -> AsyncIterator[Callable]:
+    data = GET_LOGS_CASE['results'][0]['data']
+    yield lambda: decode_result(data)
+
+
+# ************** Macro benchmarks ****************
+@benchmark('send_query+wait_for_result 1KiB', 'macro', 20)
+async def bench_query() -> AsyncIterator[Callable]:
+    connection = await SimulatedDeviceConnection.create({'seed': SEED})
+    sdk = await SDK.create(connection, 1, {'probe_cache': None})
+    await sdk.before_operation()
+    data = random_bytes(1024)
+
+    async def query() -> None:
+        await sdk.send_query(data)
+        await sdk.wait_for_result()
+
+    yield query
+    await connection.destroy()
+
+
+def create_get_logs_handler():
+    queries = GET_LOGS_CASE['queries']
+    results = [result['data'] for result in GET_LOGS_CASE['results']]
+    position = 0
+
+    def handler(proto_data: bytes, raw_data: bytes):
+        nonlocal position
+        if raw_data == queries[0]['data']:
+            position = 0
+        result = results[position]
+        position += 1
+        return proto_data, result
+
+    return handler
+
+
+@benchmark('ManagerApp.get_logs', 'macro', 10)
+async def bench_get_logs() -> AsyncIterator[Callable]:
+    connection = await SimulatedDeviceConnection.create({
+        'seed': SEED,
+        'app_versions': {ManagerApp.APPLET_ID: '1.0.0'},
+        'command_handlers': {ManagerApp.APPLET_ID: create_get_logs_handler()},
+    })
+    app = await ManagerApp.create(connection)
+    yield app.get_logs
+    await app.destroy()
+
+
+@benchmark('send_bootloader_data 64KiB', 'macro', 2)
+async def bench_send_bootloader_data() -> AsyncIterator[Callable]:
+    connection = await SimulatedDeviceConnection.create({
+        'seed': SEED,
+        'device_state': DeviceState.BOOTLOADER,
+    })
+    sdk = await SDK.create(connection, 0, {'probe_cache': None})
+    firmware = random_bytes(64 * 1024)
+
+    async def send_bootloader_data() -> None:
+        # Opening the connection puts the bootloader in receiving mode
+        await sdk.before_operation()
+        await sdk.send_bootloader_data(firmware, options={'timeout': 2000})
+        await sdk.after_operation()
+
+    yield send_bootloader_data
+    await connection.destroy()
+
+
+# ************** Runner ****************
+async def run_benchmark(bench: Benchmark, repeat: int) -> BenchmarkResult:
+    async with bench.factory() as operation:
+        is_async = inspect.iscoroutinefunction(operation)
+
+        async def run_round() -> float:
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                for _ in range(bench.number):
+                    if is_async:
+                        await operation()
+                    else:
+                        operation()
+                return (time.perf_counter() - start) / bench.number
+            finally:
+                gc.enable()
+
+        # Warm up
+        await run_round()
+        times = [await run_round() for _ in range(repeat)]
+
+    return {
+        'group': bench.group,
+        'number': bench.number,
+        'repeat': repeat,
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.mean(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+def get_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_suite(pattern: Optional[str], repeat: int) -> Dict[str, Any]:
+    results: Dict[str, BenchmarkResult] = {}
+    for bench in BENCHMARKS:
+        if pattern and not re.search(pattern, bench.name):
+            continue
+        results[bench.name] = await run_benchmark(bench, repeat)
+        print(f'{bench.name:<34} {format_time(results[bench.name]["median"]):>10}', file=sys.stderr)
+
+    return {
+        'version': FORMAT_VERSION,
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def print_results(run: Dict[str, Any]) -> None:
+    print(f'{"benchmark":<34} {"group":<6} {"median":>10} {"min":>10} {"stdev":>10}')
+    for name, result in run['results'].items():
+        print(
+            f'{name:<34} {result["group"]:<6} {format_time(result["median"]):>10} '
+            f'{format_time(result["min"]):>10} {format_time(result["stdev"]):>10}'
+        )
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> bool:
+    """
+    Print the change of the median of every benchmark in both runs.
+
+    Returns:
+        bool: True if a benchmark got slower by more than `threshold`
+    """
+    has_regression = False
+    print(f'baseline {baseline.get("commit")}, current {current.get("commit")}')
+    print(f'{"benchmark":<34} {"baseline":>10} {"current":>10} {"change":>8}')
+
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f'{name:<34} {"-":>10} {format_time(result["median"]):>10} {"new":>8}')
+            continue
+
+        change = result['median'] / base['median'] - 1
+        flag = ''
+        if change > threshold:
+            flag = ' slower'
+            has_regression = True
+        elif change < -threshold:
+            flag = ' faster'
+        print(
+            f'{name:<34} {format_time(base["median"]):>10} '
+            f'{format_time(result["median"]):>10} {change:>+8.1%}{flag}'
+        )
+
+    return has_regression
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', help='only run benchmarks whose name matches this regex')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON results to compare against')
+    parser.add_argument('--input', help='JSON results to use instead of running the suite')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--list', action='store_true', help='list the benchmarks')
+    args = parser.parse_args()
+
+    if args.list:
+        for bench in BENCHMARKS:
+            print(f'{bench.name:<34} {bench.group}')
+        return
+
+    if args.input:
+        with open(args.input) as file:
+            current = json.load(file)
+    else:
+        current = asyncio.run(run_suite(args.filter, args.repeat))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(current, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if compare(baseline, current, args.threshold):
+            sys.exit(1)
+    else:
+        print_results(current)
+
+
+if __name__ == '__main__':
+    main()